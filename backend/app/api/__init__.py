@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from .admin import router as admin_router
 from .auth import router as auth_router
 from .cv import router as cv_router
 from .users import router as users_router
@@ -8,3 +9,4 @@ api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(cv_router, prefix="/cv", tags=["cv"])
 api_router.include_router(users_router, prefix="/users", tags=["users"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from backend.app.core.database import get_db
+from backend.app.core.schemas import APIResponse
+from backend.app.models.cv import CV as CVModel
+from backend.app.models.user import User as UserModel
+from backend.app.api.auth import get_current_admin_user
+from backend.app.api.cv import duplicate_index, load_signatures, rescorer
+from backend.app.core.executors import run_io
+from backend.app.utils.logger import get_logger
+from config.settings import settings
+
+router = APIRouter()
+logger = get_logger()
+
+@router.get("/duplicates", response_model=APIResponse)
+async def get_duplicate_clusters(
+    threshold: Optional[float] = None,
+    limit: int = 50,
+    current_user: UserModel = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """List clusters of near-duplicate CVs across all users, largest first."""
+    threshold = settings.duplicate_threshold if threshold is None else threshold
+    if not 0 < threshold <= 1 or limit < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="threshold must be in (0, 1] and limit at least 1"
+        )
+    
+    try:
+        await run_io(duplicate_index.ensure_loaded, lambda: load_signatures(db))
+        clusters = duplicate_index.clusters(threshold)
+        
+        shown = clusters[:limit]
+        cv_ids = [cv_id for cluster in shown for cv_id in cluster['cv_ids']]
+        rows = db.query(CVModel.id, CVModel.user_id, CVModel.title).filter(CVModel.id.in_(cv_ids)).all()
+        cvs = {cv_id: {"cv_id": cv_id, "user_id": user_id, "title": title} for cv_id, user_id, title in rows}
+        
+        return APIResponse(
+            success=True,
+            message="Duplicate clusters retrieved successfully",
+            data={
+                "threshold": threshold,
+                "cluster_count": len(clusters),
+                "duplicate_cv_count": sum(len(cluster['cv_ids']) - 1 for cluster in clusters),
+                "clusters": [
+                    {
+                        "cvs": [cvs[cv_id] for cv_id in cluster['cv_ids'] if cv_id in cvs],
+                        "min_similarity": cluster['min_similarity']
+                    }
+                    for cluster in shown
+                ]
+            }
+        )
+        
+    except Exception as e:
+        logger.log_error(
+            error_message=f"Duplicate report failed: {str(e)}",
+            user_id=current_user.id
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build duplicate report"
+        )
+
+@router.post("/rescoring", response_model=APIResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_rescoring(
+    current_user: UserModel = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Re-analyze, in the background, every CV analyzed with older rules."""
+    try:
+        run_id = await run_io(rescorer.start)
+        progress = await run_io(rescorer.status, db) if run_id is not None else None
+        
+        return APIResponse(
+            success=True,
+            message="CV re-scoring started" if run_id is not None else "All CVs are up to date",
+            data=progress
+        )
+        
+    except Exception as e:
+        logger.log_error(
+            error_message=f"Starting CV re-scoring failed: {str(e)}",
+            user_id=current_user.id
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start CV re-scoring"
+        )
+
+@router.get("/rescoring", response_model=APIResponse)
+async def get_rescoring_status(
+    current_user: UserModel = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Progress of the latest CV re-scoring run."""
+    progress = await run_io(rescorer.status, db)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No re-scoring run found"
+        )
+    
+    return APIResponse(
+        success=True,
+        message="Re-scoring status retrieved successfully",
+        data=progress
+    )
@@ -52,6 +52,15 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         raise credentials_exception
     return user
 
+async def get_current_admin_user(current_user: UserModel = Depends(get_current_user)):
+    """Get current authenticated user, who must be an admin."""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
 @router.post("/register", response_model=APIResponse)
 async def register_user(user_data: UserCreate, request: Request, db: Session = Depends(get_db)):
     """Register a new user."""
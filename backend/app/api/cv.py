@@ -1,25 +1,185 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, File, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from backend.app.core.database import get_db
-from backend.app.core.schemas import CVCreate, CV, CVUpdate, CVAnalysisResponse, APIResponse
+from backend.app.core.database import get_db, SessionLocal
+from backend.app.core.schemas import CVCreate, CV, CVUpdate, CVAnalysisResponse, CVBatchAnalysisRequest, CVMatchRequest, CVMatchResponse, AnalysisJob, APIResponse
 from backend.app.models.cv import CV as CVModel
 from backend.app.models.user import User as UserModel
+from backend.app.models.job import AnalysisJob as AnalysisJobModel
 from backend.app.api.auth import get_current_user
-from backend.app.services.cv_analyzer import CVAnalyzer
-from backend.app.services.pdf_generator import PDFGenerator
+from backend.app.core.executors import run_io, run_cpu, ExecutorBusyError
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.cv_analyzer import ANALYSIS_MODES
+from backend.app.services.cv_index import CVMatchIndexes, stop_words
+from backend.app.services.cv_sections import changed_sections
+from backend.app.services.job_queue import AnalysisJobQueue
+from backend.app.services.near_duplicates import MinHasher, NearDuplicateIndex, from_bytes
+from backend.app.services.pdf_cache import PDFCache
+from backend.app.services.rescoring import CVRescorer
+from backend.app.services.score_histograms import score_percentile
+from backend.app.services.tasks import get_analyzer, get_pdf_generator, get_doc_store, infer_missing_sectors, analyze_cv_task, analyze_many_task, analyze_rules_task, analyze_nlp_task, render_cv_pdf_task
 from backend.app.utils.logger import get_logger
+from backend.app.utils.metrics import analysis_metrics
 from config.settings import settings
+import asyncio
+import json
 import time
 import os
 
 router = APIRouter()
 logger = get_logger()
 
-# Initialize services
-cv_analyzer = CVAnalyzer()
-pdf_generator = PDFGenerator(settings.pdf_storage_path)
+# Initialize services; the analyzer is fetched per request (get_analyzer) since it follows rules reloads
+analysis_cache = AnalysisCache(
+    max_entries=settings.analysis_cache_size,
+    db_path=settings.analysis_cache_path,
+    max_db_bytes=settings.analysis_cache_max_mb * 1024 * 1024
+)
+pdf_generator = get_pdf_generator()
+pdf_cache = PDFCache(
+    pdf_generator,
+    idle_ttl=settings.pdf_cache_idle_ttl,
+    max_unreferenced_bytes=settings.pdf_cache_max_unreferenced_mb * 1024 * 1024
+)
+match_indexes = CVMatchIndexes(
+    max_users=settings.match_index_max_users,
+    max_age=settings.match_index_max_age,
+    stop_words=stop_words(['pt', 'en', *settings.spacy_models])
+)
+minhasher = MinHasher()
+duplicate_index = NearDuplicateIndex()
+job_queue = AnalysisJobQueue(
+    SessionLocal,
+    analysis_cache,
+    workers=settings.analysis_job_workers,
+    poll_interval=settings.analysis_job_poll_interval,
+    stale_after=settings.analysis_job_stale_after,
+    match_indexes=match_indexes
+)
+rescorer = CVRescorer(
+    SessionLocal,
+    analysis_cache,
+    match_indexes,
+    batch_size=settings.rescore_batch_size,
+    cpu_fraction=settings.rescore_cpu_fraction,
+    stale_after=settings.rescore_stale_after,
+    nlp_batch_size=settings.nlp_batch_size
+)
+
+def load_user_cvs(db: Session, cv_ids: List[int], user_id: int) -> List[CVModel]:
+    """Load the user's CVs detached from the session.
+
+    The transaction is ended so no DB connection is held while the CVs are
+    analyzed or rendered; save_cvs re-attaches them.
+    """
+    cvs = db.query(CVModel).filter(
+        CVModel.id.in_(cv_ids),
+        CVModel.user_id == user_id
+    ).order_by(CVModel.id).all()
+    for cv in cvs:
+        db.expunge(cv)
+    db.rollback()
+    return cvs
+
+def save_cvs(db: Session, cvs: List[CVModel]):
+    """Re-attach CVs loaded with load_user_cvs and commit their changes."""
+    db.add_all(cvs)
+    db.commit()
+
+def pdf_cv_data(cv: CVModel) -> dict:
+    """The CV fields the PDF generator renders."""
+    return {
+        'original_text': cv.original_text,
+        'analyzed_text': cv.analyzed_text,
+        'title': cv.title
+    }
+
+async def cached_cv_pdf(db: Session, cv: CVModel, user_data: dict, load: bool = True):
+    """The CV's content-addressed PDF file name and bytes, rendering it only if it is not stored yet.
+
+    With load=False a stored PDF is not read back and None is returned for its bytes.
+    """
+    cv_data = pdf_cv_data(cv)
+    pdf_filename = pdf_generator.cv_pdf_filename(cv_data, user_data)
+    if load:
+        pdf = await run_io(pdf_cache.get, db, pdf_filename)
+        if pdf is not None:
+            return pdf_filename, pdf
+    elif await run_io(pdf_cache.touch, db, pdf_filename):
+        return pdf_filename, None
+    pdf = await run_cpu(render_cv_pdf_task, cv_data, user_data)
+    await run_io(pdf_cache.put, db, pdf_filename, pdf)
+    return pdf_filename, pdf
+
+def load_match_documents(db: Session, user_id: int):
+    """(cv_id, text, keywords) of all the user's CVs, for building their match index."""
+    rows = db.query(CVModel.id, CVModel.original_text, CVModel.keywords).filter(
+        CVModel.user_id == user_id
+    ).all()
+    db.rollback()
+    return rows
+
+def load_cv_titles(db: Session, cv_ids: List[int], user_id: int):
+    """Map of CV id to title for the given ids of the user's CVs."""
+    rows = db.query(CVModel.id, CVModel.title).filter(
+        CVModel.id.in_(cv_ids),
+        CVModel.user_id == user_id
+    ).all()
+    db.rollback()
+    return dict(rows)
+
+def load_signatures(db: Session):
+    """(cv_id, user_id, signature) of all CVs, for filling the near-duplicate index.
+
+    CVs saved before signatures existed get theirs computed and stored.
+    """
+    rows = db.query(CVModel.id, CVModel.user_id, CVModel.minhash).filter(
+        CVModel.minhash.isnot(None)
+    ).all()
+    signatures = [(cv_id, user_id, from_bytes(minhash)) for cv_id, user_id, minhash in rows]
+
+    missing = db.query(CVModel).filter(CVModel.minhash.is_(None)).all()
+    for cv in missing:
+        signature = minhasher.signature(cv.original_text)
+        cv.minhash = signature.tobytes()
+        signatures.append((cv.id, cv.user_id, signature))
+    if missing:
+        db.commit()
+    db.rollback()
+    return signatures
+
+def reuse_duplicate_analysis(db: Session, db_cv: CVModel, duplicate_id: int):
+    """Copy the analysis of an earlier CV of the same user when it still applies.
+
+    Returns (reused, changed_sections): the analysis is copied only when text
+    and sector are unchanged; otherwise the sections that differ are listed
+    so the client knows which parts a new analysis will re-parse.
+    """
+    previous = db.query(CVModel).filter(
+        CVModel.id == duplicate_id,
+        CVModel.user_id == db_cv.user_id
+    ).first()
+    if previous is None:
+        return False, None
+
+    if previous.original_text != db_cv.original_text or previous.analysis_sector != db_cv.analysis_sector:
+        return False, changed_sections(previous.original_text, db_cv.original_text)
+    if previous.analysis_mode is None:
+        return False, []
+
+    db_cv.apply_analysis({
+        'analyzed_text': previous.analyzed_text,
+        'suggestions': previous.suggestions,
+        'analysis_score': previous.analysis_score,
+        'keywords': previous.keywords,
+        'rules_version': previous.rules_version
+    }, previous.analysis_mode)
+    return True, []
+
+def sse_event(event: str, data) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 @router.post("/upload", response_model=APIResponse)
 async def upload_cv(
@@ -28,21 +188,39 @@ async def upload_cv(
     current_user: UserModel = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Upload and create a new CV."""
+    """Upload and create a new CV.
+
+    An upload nearly identical to one of the user's CVs records it in
+    duplicate_of and, when the text is the same, reuses its analysis.
+    """
     start_time = time.time()
     
     try:
         # Create CV record
+        signature = minhasher.signature(cv_data.original_text)
         db_cv = CVModel(
             user_id=current_user.id,
             title=cv_data.title,
             original_text=cv_data.original_text,
-            sector=cv_data.sector
+            sector=cv_data.sector,
+            minhash=signature.tobytes()
         )
+        await run_io(infer_missing_sectors, [db_cv])
+        
+        # Look for a near-duplicate among the user's CVs; the first upload loads every
+        # stored signature (computing missing ones), so it runs off the event loop
+        await run_io(duplicate_index.ensure_loaded, lambda: load_signatures(db))
+        duplicates = duplicate_index.query(signature, settings.duplicate_threshold, owner=current_user.id)
+        similarity, analysis_reused, sections_changed = None, False, None
+        if duplicates:
+            db_cv.duplicate_of, similarity = duplicates[0]
+            analysis_reused, sections_changed = reuse_duplicate_analysis(db, db_cv, db_cv.duplicate_of)
         
         db.add(db_cv)
         db.commit()
         db.refresh(db_cv)
+        duplicate_index.add(db_cv.id, current_user.id, signature)
+        match_indexes.update(current_user.id, db_cv.id, db_cv.original_text, db_cv.keywords)
         
         # Log CV upload
         execution_time = int((time.time() - start_time) * 1000)
@@ -57,7 +235,16 @@ async def upload_cv(
         return APIResponse(
             success=True,
             message="CV uploaded successfully",
-            data={"cv_id": db_cv.id, "title": db_cv.title}
+            data={
+                "cv_id": db_cv.id,
+                "title": db_cv.title,
+                "inferred_sector": db_cv.inferred_sector,
+                "sector_confidence": db_cv.sector_confidence,
+                "duplicate_of": db_cv.duplicate_of,
+                "similarity": similarity,
+                "analysis_reused": analysis_reused,
+                "changed_sections": sections_changed
+            }
         )
         
     except Exception as e:
@@ -76,42 +263,83 @@ async def upload_cv(
 async def analyze_cv(
     cv_id: int,
     request: Request,
+    mode: str = "full",
     current_user: UserModel = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Analyze CV and provide suggestions."""
+    """Analyze CV and provide suggestions.
+
+    mode=fast only computes score and suggestions (no spaCy), mode=standard
+    adds the rewritten text and sector keywords, mode=full (default) adds
+    NER and noun keywords.
+    """
     start_time = time.time()
+    user_id = current_user.id
+    
+    if mode not in ANALYSIS_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid analysis mode. Choose one of: {', '.join(ANALYSIS_MODES)}"
+        )
     
     try:
         # Get CV
-        cv = db.query(CVModel).filter(
-            CVModel.id == cv_id,
-            CVModel.user_id == current_user.id
-        ).first()
+        cvs = await run_io(load_user_cvs, db, [cv_id], user_id)
         
-        if not cv:
+        if not cvs:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="CV not found"
             )
+        cv = cvs[0]
+        await run_io(infer_missing_sectors, cvs)
+        sector = cv.analysis_sector
         
-        # Analyze CV
-        analysis_result = cv_analyzer.analyze_cv(cv.original_text, cv.sector)
+        # Analyze CV, reusing a cached result if text, sector, rules and mode are unchanged
+        cv_analyzer = get_analyzer()
+        rules_version = cv_analyzer.rules_version
+        # With a persistent tier, cache reads and writes are SQLite I/O, so they run off the event loop
+        analysis_result = await run_io(
+            analysis_cache.get, analysis_cache.make_key(cv.original_text, sector, rules_version, mode)
+        )
+        cache_hit = analysis_result is not None
+        profile = None
+        if not cache_hit:
+            if mode == "fast":
+                # Regex-only analysis takes microseconds; a pool round trip would cost more
+                analysis_result = cv_analyzer.analyze_cv(
+                    cv.original_text, sector, profile=settings.analysis_profiling, mode=mode
+                )
+                used_nlp = True
+            else:
+                analysis_result, used_nlp = await run_cpu(analyze_cv_task, cv.original_text, sector, cv.id, mode)
+            profile = analysis_result.pop('profile', None)
+            analysis_metrics.record(profile)
+            if used_nlp:
+                # Keyed on the version the result was computed with: a worker may still be on the previous rules
+                await run_io(analysis_cache.set, analysis_cache.make_key(
+                    cv.original_text, sector, analysis_result.get('rules_version', rules_version), mode
+                ), analysis_result)
+        # Results cached before versions were stamped carry the version of their key
+        analysis_result.setdefault('rules_version', rules_version)
         
         # Update CV with analysis results
-        cv.analyzed_text = analysis_result['analyzed_text']
-        cv.suggestions = analysis_result['suggestions']
-        cv.analysis_score = analysis_result['analysis_score']
-        cv.keywords = analysis_result['keywords']
+        cv.apply_analysis(analysis_result, mode)
         
-        db.commit()
+        await run_io(save_cvs, db, [cv])
+        match_indexes.update(user_id, cv.id, cv.original_text, cv.keywords)
+        percentile = await run_io(
+            score_percentile, db, sector, analysis_result['analysis_score'], settings.score_percentile_min_cvs
+        )
         
         # Log analysis
         execution_time = int((time.time() - start_time) * 1000)
         logger.log_cv_analysis(
-            user_id=current_user.id,
-            cv_id=cv.id,
+            user_id=user_id,
+            cv_id=cv_id,
             score=analysis_result['analysis_score'],
+            cache_hit=cache_hit,
+            profile=profile,
             ip_address=request.client.host,
             user_agent=request.headers.get("user-agent"),
             execution_time=execution_time
@@ -120,18 +348,27 @@ async def analyze_cv(
         return CVAnalysisResponse(
             success=True,
             message="CV analyzed successfully",
-            cv_id=cv.id,
+            cv_id=cv_id,
             analysis_score=analysis_result['analysis_score'],
             suggestions=analysis_result['suggestions'],
-            keywords=analysis_result['keywords']
+            keywords=analysis_result.get('keywords'),
+            mode=mode,
+            sector=sector,
+            rules_version=analysis_result['rules_version'],
+            percentile=percentile
         )
         
     except HTTPException:
         raise
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis queue is full, please retry later"
+        )
     except Exception as e:
         logger.log_error(
             error_message=f"CV analysis failed: {str(e)}",
-            user_id=current_user.id,
+            user_id=user_id,
             ip_address=request.client.host,
             user_agent=request.headers.get("user-agent")
         )
@@ -140,6 +377,349 @@ async def analyze_cv(
             detail="Failed to analyze CV"
         )
 
+@router.get("/{cv_id}/analyze/stream")
+async def analyze_cv_stream(
+    cv_id: int,
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Analyze CV and stream each stage as a Server-Sent Event.
+
+    Events are sent in order: score, suggestions, keywords and finally done
+    with the full result. The regex-based stages come first; keywords wait
+    for the spaCy pipeline. Both stages run on the CPU pool.
+    """
+    start_time = time.time()
+    user_id = current_user.id
+    
+    cvs = await run_io(load_user_cvs, db, [cv_id], user_id)
+    if not cvs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV not found"
+        )
+    cv = cvs[0]
+    await run_io(infer_missing_sectors, cvs)
+    cv_text, cv_sector = cv.original_text, cv.analysis_sector
+    
+    async def event_stream():
+        try:
+            cv_analyzer = get_analyzer()
+            analysis_result = await run_io(
+                analysis_cache.get, analysis_cache.make_key(cv_text, cv_sector, cv_analyzer.rules_version)
+            )
+            cache_hit = analysis_result is not None
+            
+            if cache_hit:
+                analysis_result.setdefault('rules_version', cv_analyzer.rules_version)
+                rules_result = nlp_result = analysis_result
+            else:
+                # Fast stage: tokenizer plus regexes only, on the CPU pool like the NLP stage
+                rules_result = await run_cpu(analyze_rules_task, cv_text, cv_sector)
+            
+            yield sse_event("score", {"cv_id": cv_id, "analysis_score": rules_result['analysis_score']})
+            yield sse_event("suggestions", {
+                "suggestions": rules_result['suggestions'],
+                "analyzed_text": rules_result['analyzed_text']
+            })
+            
+            if not cache_hit:
+                # Slow stage: full spaCy pipeline on the CPU pool
+                nlp_result, used_nlp = await run_cpu(analyze_nlp_task, cv_text, cv_sector)
+                analysis_result = {**rules_result, **nlp_result}
+                # Stages that straddled a rules reload are not cached as either version
+                if used_nlp and rules_result['rules_version'] == nlp_result['rules_version']:
+                    await run_io(analysis_cache.set, analysis_cache.make_key(
+                        cv_text, cv_sector, analysis_result['rules_version']
+                    ), analysis_result)
+            
+            yield sse_event("keywords", {"keywords": nlp_result['keywords']})
+            
+            # Update CV with analysis results
+            cv.apply_analysis(analysis_result)
+            await run_io(save_cvs, db, [cv])
+            match_indexes.update(user_id, cv.id, cv_text, cv.keywords)
+            
+            # Log analysis
+            execution_time = int((time.time() - start_time) * 1000)
+            logger.log_cv_analysis(
+                user_id=user_id,
+                cv_id=cv_id,
+                score=analysis_result['analysis_score'],
+                cache_hit=cache_hit,
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent"),
+                execution_time=execution_time
+            )
+            
+            yield sse_event("done", {"cv_id": cv_id, **analysis_result})
+            
+        except ExecutorBusyError:
+            yield sse_event("error", {"detail": "Analysis queue is full, please retry later"})
+        except Exception as e:
+            logger.log_error(
+                error_message=f"CV stream analysis failed: {str(e)}",
+                user_id=user_id,
+                ip_address=request.client.host,
+                user_agent=request.headers.get("user-agent")
+            )
+            yield sse_event("error", {"detail": "Failed to analyze CV"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/{cv_id}/analyze-async", response_model=APIResponse, status_code=status.HTTP_202_ACCEPTED)
+async def analyze_cv_async(
+    cv_id: int,
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue a CV analysis and return the job id immediately."""
+    start_time = time.time()
+    user_id = current_user.id
+    
+    try:
+        cvs = await run_io(load_user_cvs, db, [cv_id], user_id)
+        
+        if not cvs:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="CV not found"
+            )
+        
+        # Classify now so the queued analysis and the stored CV agree on the sector
+        if await run_io(infer_missing_sectors, cvs):
+            await run_io(save_cvs, db, cvs)
+        
+        job = await run_io(job_queue.submit, db, user_id, cv_id)
+        
+        # Log job submission
+        execution_time = int((time.time() - start_time) * 1000)
+        logger.log_analysis_job(
+            user_id=user_id,
+            cv_id=cv_id,
+            job_id=job.id,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent"),
+            execution_time=execution_time
+        )
+        
+        return APIResponse(
+            success=True,
+            message="CV analysis queued",
+            data={"job_id": job.id, "cv_id": cv_id, "status": job.status}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.log_error(
+            error_message=f"CV analysis job submission failed: {str(e)}",
+            user_id=user_id,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent")
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue CV analysis"
+        )
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJob)
+async def get_analysis_job(
+    job_id: int,
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the status of an analysis job, with its result once done."""
+    user_id = current_user.id
+    job = await run_io(
+        db.query(AnalysisJobModel).filter(
+            AnalysisJobModel.id == job_id,
+            AnalysisJobModel.user_id == user_id
+        ).first
+    )
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return job
+
+@router.post("/analyze-batch", response_model=APIResponse)
+async def analyze_cv_batch(
+    batch: CVBatchAnalysisRequest,
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Analyze several CVs in one pass through the NLP pipeline."""
+    start_time = time.time()
+    user_id = current_user.id
+    
+    if len(batch.cv_ids) > settings.max_batch_cvs:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.max_batch_cvs} CVs can be analyzed per request"
+        )
+    
+    try:
+        cvs = await run_io(load_user_cvs, db, batch.cv_ids, user_id)
+        
+        found_ids = {cv.id for cv in cvs}
+        not_found = [cv_id for cv_id in batch.cv_ids if cv_id not in found_ids]
+        
+        # One vectorized classifier call for all CVs without a sector
+        await run_io(infer_missing_sectors, cvs)
+        
+        # Serve what we can from the cache and stream the rest through the analyzer
+        cv_analyzer = get_analyzer()
+        analysis_results = {}
+        cached_results = await run_io(analysis_cache.get_many, [
+            analysis_cache.make_key(cv.original_text, cv.analysis_sector, cv_analyzer.rules_version)
+            for cv in cvs
+        ])
+        for cv, cached in zip(cvs, cached_results):
+            if cached is not None:
+                cached.setdefault('rules_version', cv_analyzer.rules_version)
+                analysis_results[cv.id] = cached
+        cache_hits = len(analysis_results)
+        
+        to_analyze = [cv for cv in cvs if cv.id not in analysis_results]
+        # Split across the CPU workers, at most one chunk each, so spaCy never runs in the API process
+        chunk_size = max(settings.nlp_batch_size, -(-len(to_analyze) // settings.cpu_pool_size))
+        chunks = [to_analyze[i:i + chunk_size] for i in range(0, len(to_analyze), chunk_size)]
+        chunk_results = await asyncio.gather(*[
+            run_cpu(
+                analyze_many_task,
+                [cv.original_text for cv in chunk],
+                [cv.analysis_sector for cv in chunk],
+                [cv.id for cv in chunk]
+            )
+            for chunk in chunks
+        ])
+        fresh_entries = []
+        for chunk, (fresh_results, nlp_loaded) in zip(chunks, chunk_results):
+            for cv, analysis_result in zip(chunk, fresh_results):
+                analysis_results[cv.id] = analysis_result
+                if nlp_loaded:
+                    fresh_entries.append((analysis_cache.make_key(
+                        cv.original_text, cv.analysis_sector, analysis_result['rules_version']
+                    ), analysis_result))
+        await run_io(analysis_cache.set_many, fresh_entries)
+        
+        results = []
+        for cv in cvs:
+            analysis_result = analysis_results[cv.id]
+            cv.apply_analysis(analysis_result)
+            results.append({
+                "cv_id": cv.id,
+                "analysis_score": analysis_result['analysis_score']
+            })
+        
+        await run_io(save_cvs, db, cvs)
+        for cv in cvs:
+            match_indexes.update(user_id, cv.id, cv.original_text, cv.keywords)
+        
+        # Log batch analysis
+        execution_time = int((time.time() - start_time) * 1000)
+        logger.log_cv_batch_analysis(
+            user_id=user_id,
+            cv_ids=sorted(found_ids),
+            cache_hits=cache_hits,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent"),
+            execution_time=execution_time
+        )
+        
+        return APIResponse(
+            success=True,
+            message=f"{len(results)} CVs analyzed successfully",
+            data={"results": results, "not_found": not_found}
+        )
+        
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis queue is full, please retry later"
+        )
+    except Exception as e:
+        logger.log_error(
+            error_message=f"CV batch analysis failed: {str(e)}",
+            user_id=user_id,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent")
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to analyze CVs"
+        )
+
+@router.post("/match", response_model=CVMatchResponse)
+async def match_cvs(
+    match_request: CVMatchRequest,
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rank the user's CVs against a job description.
+
+    Uses a TF-IDF index over each CV's text and keywords, built on the first
+    request and then kept up to date as CVs change, so no CV is re-analyzed.
+    Changes made through other API processes show up once the index is
+    rebuilt, after match_index_max_age seconds.
+    """
+    start_time = time.time()
+    user_id = current_user.id
+    
+    if not 1 <= match_request.top_k <= settings.max_match_results:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"top_k must be between 1 and {settings.max_match_results}"
+        )
+    
+    try:
+        index = await run_io(match_indexes.get, user_id, lambda: load_match_documents(db, user_id))
+        matches = await run_io(index.match, match_request.job_description, match_request.top_k)
+        titles = await run_io(load_cv_titles, db, [match['cv_id'] for match in matches], user_id)
+        # A CV deleted meanwhile may still be in the index
+        matches = [{**match, 'title': titles[match['cv_id']]} for match in matches if match['cv_id'] in titles]
+        
+        # Log match
+        execution_time = int((time.time() - start_time) * 1000)
+        logger.log_cv_match(
+            user_id=user_id,
+            cv_count=len(index),
+            top_k=match_request.top_k,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent"),
+            execution_time=execution_time
+        )
+        
+        return CVMatchResponse(
+            success=True,
+            message=f"{len(matches)} matching CVs found",
+            matches=matches
+        )
+        
+    except Exception as e:
+        logger.log_error(
+            error_message=f"CV match failed: {str(e)}",
+            user_id=user_id,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent")
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to match CVs"
+        )
+
 @router.post("/{cv_id}/generate-pdf", response_model=APIResponse)
 async def generate_cv_pdf(
     cv_id: int,
@@ -149,45 +729,43 @@ async def generate_cv_pdf(
 ):
     """Generate PDF from CV."""
     start_time = time.time()
+    user_id = current_user.id
+    
+    user_data = {
+        'username': current_user.username,
+        'email': current_user.email,
+        'full_name': current_user.full_name
+    }
     
     try:
+        if not pdf_generator.storage_path:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="PDF storage is disabled; use GET /cv/{cv_id}/pdf"
+            )
+        
         # Get CV
-        cv = db.query(CVModel).filter(
-            CVModel.id == cv_id,
-            CVModel.user_id == current_user.id
-        ).first()
+        cvs = await run_io(load_user_cvs, db, [cv_id], user_id)
         
-        if not cv:
+        if not cvs:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="CV not found"
             )
+        cv = cvs[0]
         
-        # Prepare CV data
-        cv_data = {
-            'original_text': cv.original_text,
-            'analyzed_text': cv.analyzed_text,
-            'title': cv.title
-        }
-        
-        user_data = {
-            'username': current_user.username,
-            'email': current_user.email,
-            'full_name': current_user.full_name
-        }
-        
-        # Generate PDF
-        pdf_filename = pdf_generator.generate_cv_pdf(cv_data, user_data)
+        # Generate PDF, unless this content was already rendered
+        pdf_filename, _ = await cached_cv_pdf(db, cv, user_data, load=False)
         
         # Update CV with PDF path
         cv.pdf_path = pdf_filename
-        db.commit()
+        await run_io(save_cvs, db, [cv])
         
         # Log PDF generation
         execution_time = int((time.time() - start_time) * 1000)
         logger.log_pdf_generation(
-            user_id=current_user.id,
-            cv_id=cv.id,
+            user_id=user_id,
+            cv_id=cv_id,
             pdf_filename=pdf_filename,
             ip_address=request.client.host,
             user_agent=request.headers.get("user-agent"),
@@ -197,15 +775,20 @@ async def generate_cv_pdf(
         return APIResponse(
             success=True,
             message="PDF generated successfully",
-            data={"pdf_filename": pdf_filename, "cv_id": cv.id}
+            data={"pdf_filename": pdf_filename, "cv_id": cv_id}
         )
         
     except HTTPException:
         raise
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF queue is full, please retry later"
+        )
     except Exception as e:
         logger.log_error(
             error_message=f"PDF generation failed: {str(e)}",
-            user_id=current_user.id,
+            user_id=user_id,
             ip_address=request.client.host,
             user_agent=request.headers.get("user-agent")
         )
@@ -214,6 +797,87 @@ async def generate_cv_pdf(
             detail="Failed to generate PDF"
         )
 
+@router.get("/{cv_id}/pdf")
+async def render_cv_pdf(
+    cv_id: int,
+    request: Request,
+    save: bool = False,
+    current_user: UserModel = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Return the CV's PDF in one request, rendering it only if this content is not stored yet.
+
+    save=true also records it as the CV's PDF (pdf_path), so it stays
+    referenced and is not evicted.
+    """
+    start_time = time.time()
+    user_id = current_user.id
+    
+    user_data = {
+        'username': current_user.username,
+        'email': current_user.email,
+        'full_name': current_user.full_name
+    }
+    
+    try:
+        if save and not pdf_generator.storage_path:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="PDF storage is disabled"
+            )
+        
+        cvs = await run_io(load_user_cvs, db, [cv_id], user_id)
+        
+        if not cvs:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="CV not found"
+            )
+        cv = cvs[0]
+        
+        if pdf_cache.enabled:
+            pdf_filename, pdf = await cached_cv_pdf(db, cv, user_data)
+        else:
+            pdf_filename, pdf = f"cv_{cv_id}.pdf", await run_cpu(render_cv_pdf_task, pdf_cv_data(cv), user_data)
+        if save and cv.pdf_path != pdf_filename:
+            cv.pdf_path = pdf_filename
+            await run_io(save_cvs, db, [cv])
+        
+        execution_time = int((time.time() - start_time) * 1000)
+        logger.log_pdf_generation(
+            user_id=user_id,
+            cv_id=cv_id,
+            pdf_filename=pdf_filename,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent"),
+            execution_time=execution_time
+        )
+        
+        return Response(
+            content=pdf,
+            media_type='application/pdf',
+            headers={'Content-Disposition': f'attachment; filename="cv_{cv_id}.pdf"'}
+        )
+        
+    except HTTPException:
+        raise
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF queue is full, please retry later"
+        )
+    except Exception as e:
+        logger.log_error(
+            error_message=f"PDF rendering failed: {str(e)}",
+            user_id=user_id,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent")
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to render PDF"
+        )
+
 @router.get("/{cv_id}/download-pdf")
 async def download_cv_pdf(
     cv_id: int,
@@ -250,7 +914,7 @@ async def download_cv_pdf(
         
         return FileResponse(
             path=pdf_path,
-            filename=cv.pdf_path,
+            filename=f"cv_{cv_id}.pdf",
             media_type='application/pdf'
         )
         
@@ -325,7 +989,19 @@ async def update_cv(
         for field, value in update_data.items():
             setattr(cv, field, value)
         
+        # A new text or sector makes the previous guess stale
+        if 'original_text' in update_data or 'sector' in update_data:
+            cv.inferred_sector = None
+            cv.sector_confidence = None
+            infer_missing_sectors([cv])
+        if 'original_text' in update_data:
+            signature = minhasher.signature(cv.original_text)
+            cv.minhash = signature.tobytes()
+        
         db.commit()
+        if 'original_text' in update_data:
+            duplicate_index.add(cv.id, current_user.id, signature)
+            match_indexes.update(current_user.id, cv.id, cv.original_text, cv.keywords)
         
         return APIResponse(
             success=True,
@@ -364,13 +1040,20 @@ async def delete_cv(
                 detail="CV not found"
             )
         
-        # Delete PDF file if exists
-        if cv.pdf_path:
-            pdf_generator.delete_pdf(cv.pdf_path)
+        # Delete parsed Doc if stored
+        doc_store = get_doc_store()
+        if doc_store:
+            doc_store.delete_cv(cv_id)
         
-        # Delete CV record
+        # Delete CV record; CVs flagged as its duplicates no longer point to it
+        db.query(CVModel).filter(
+            CVModel.duplicate_of == cv_id,
+            CVModel.user_id == current_user.id
+        ).update({CVModel.duplicate_of: None}, synchronize_session=False)
         db.delete(cv)
         db.commit()
+        duplicate_index.remove(cv_id)
+        match_indexes.remove(current_user.id, cv_id)
         
         return APIResponse(
             success=True,
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from config.settings import settings
 import os
@@ -25,6 +25,24 @@ def get_db():
 
 # Function to create all tables
 def create_tables():
-    from backend.app.models import Base, User, CV, Log
+    from backend.app.models import Base, User, CV, Log, AnalysisJob, ScoreHistogram, RescoringRun, PDFBlob
     
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(Base)
+
+def add_missing_columns(Base):
+    """Add nullable columns introduced after a table was first created.
+
+    create_all only creates missing tables, so existing databases would
+    otherwise lack new columns such as cvs.analysis_mode.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class ExecutorBusyError(Exception):
+    """Raised when cpu_queue_limit CPU tasks are already queued or running."""
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_cpu_pool: Optional[Executor] = None
+_cpu_initializer: Optional[Callable] = None
+_cpu_pending = 0
+_lock = threading.Lock()
+
+def init_executors(cpu_initializer: Optional[Callable] = None):
+    """Create the IO thread pool and the CPU pool.
+
+    cpu_initializer runs once in every CPU worker process (or thread).
+    """
+    global _io_pool, _cpu_pool, _cpu_initializer
+    with _lock:
+        _cpu_initializer = cpu_initializer
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(
+                max_workers=settings.io_pool_size,
+                thread_name_prefix="cvmaker-io"
+            )
+        if _cpu_pool is None:
+            if settings.cpu_executor == "thread":
+                _cpu_pool = ThreadPoolExecutor(
+                    max_workers=settings.cpu_pool_size,
+                    thread_name_prefix="cvmaker-cpu",
+                    initializer=cpu_initializer
+                )
+            else:
+                _cpu_pool = ProcessPoolExecutor(
+                    max_workers=settings.cpu_pool_size,
+                    initializer=cpu_initializer
+                )
+    logger.info(
+        f"Executors ready: {settings.io_pool_size} IO threads, "
+        f"{settings.cpu_pool_size} CPU workers ({settings.cpu_executor})"
+    )
+
+def shutdown_executors():
+    """Shut down both pools, waiting for running tasks to finish."""
+    global _io_pool, _cpu_pool
+    with _lock:
+        io_pool, cpu_pool = _io_pool, _cpu_pool
+        _io_pool = _cpu_pool = None
+    if io_pool:
+        io_pool.shutdown(wait=True)
+    if cpu_pool:
+        cpu_pool.shutdown(wait=True)
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking DB or file work on the IO thread pool."""
+    if _io_pool is None:
+        init_executors(_cpu_initializer)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_pool, partial(func, *args, **kwargs))
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """Run CPU-bound work (spaCy, ReportLab) on the CPU pool.
+
+    With the process executor, func and its arguments must be picklable.
+    Raises ExecutorBusyError instead of queueing beyond cpu_queue_limit.
+    """
+    global _cpu_pending
+    with _lock:
+        if _cpu_pending >= settings.cpu_queue_limit:
+            raise ExecutorBusyError(f"CPU queue is full ({settings.cpu_queue_limit} tasks)")
+        _cpu_pending += 1
+
+    try:
+        if _cpu_pool is None:
+            init_executors(_cpu_initializer)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_cpu_pool, partial(func, *args, **kwargs))
+    finally:
+        with _lock:
+            _cpu_pending -= 1
+
+def run_cpu_sync(func: Callable, *args, **kwargs) -> Any:
+    """Run CPU-bound work on the CPU pool from a plain (non-async) thread and wait for it.
+
+    Meant for background workers; it does not count towards cpu_queue_limit.
+    """
+    if _cpu_pool is None:
+        init_executors(_cpu_initializer)
+    return _cpu_pool.submit(func, *args, **kwargs).result()
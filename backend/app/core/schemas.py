@@ -30,6 +30,7 @@ class UserLogin(BaseModel):
 class User(UserBase):
     id: int
     is_active: bool
+    is_admin: Optional[bool] = False
     created_at: datetime
     updated_at: datetime
     
@@ -64,6 +65,24 @@ class CVAnalysis(BaseModel):
     analysis_score: Optional[int] = None
     keywords: Optional[List[str]] = None
 
+class CVBatchAnalysisRequest(BaseModel):
+    cv_ids: List[int]
+
+class CVMatchRequest(BaseModel):
+    job_description: str
+    top_k: int = 10
+
+class CVMatch(BaseModel):
+    cv_id: int
+    title: str
+    score: float  # Cosine similarity of TF-IDF vectors, 0-1
+    matched_terms: List[str]  # Shared terms, most influential first
+
+class CVMatchResponse(BaseModel):
+    success: bool
+    message: str
+    matches: List[CVMatch]
+
 class CV(CVBase):
     id: int
     user_id: int
@@ -72,6 +91,11 @@ class CV(CVBase):
     pdf_path: Optional[str] = None
     analysis_score: Optional[int] = None
     keywords: Optional[List[str]] = None
+    analysis_mode: Optional[str] = None
+    rules_version: Optional[str] = None
+    inferred_sector: Optional[str] = None
+    sector_confidence: Optional[float] = None
+    duplicate_of: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     
@@ -105,10 +129,27 @@ class APIResponse(BaseModel):
     message: str
     data: Optional[Any] = None
 
+class AnalysisJob(BaseModel):
+    id: int
+    cv_id: int
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 class CVAnalysisResponse(BaseModel):
     success: bool
     message: str
     cv_id: int
     analysis_score: int
     suggestions: List[Dict[str, Any]]
-    keywords: List[str]
+    keywords: Optional[List[str]] = None  # Not produced in fast mode
+    mode: str = "full"
+    sector: Optional[str] = None  # Given or inferred sector the analysis used
+    rules_version: Optional[str] = None  # Version of the CV rules the analysis used
+    percentile: Optional[float] = None  # Share of the sector's CVs scoring lower (ties count half)
@@ -3,10 +3,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from backend.app.api import api_router
-from backend.app.core.database import create_tables
+from backend.app.core.executors import init_executors, shutdown_executors
+from backend.app.services.tasks import get_analyzer, warm_up_worker
+from backend.app.api.cv import job_queue, rescorer, pdf_cache
+from backend.app.core.database import create_tables, SessionLocal
+from backend.app.services.score_histograms import backfill_score_histograms
 from backend.app.utils.logger import setup_logging, get_logger
+from backend.app.utils.metrics import analysis_metrics
 from config.settings import settings
 import uvicorn
+import threading
 import time
 
 # Create FastAPI app
@@ -38,12 +44,45 @@ async def startup_event():
     create_tables()
     logger.logger.info("Database tables created/verified")
     
+    # CVs analyzed before score histograms existed are counted once
+    db = SessionLocal()
+    try:
+        backfilled = backfill_score_histograms(db)
+    finally:
+        db.close()
+    if backfilled:
+        logger.logger.info(f"Counted {backfilled} existing scores in the sector score histograms")
+    
+    # Recount PDF references (and adopt PDFs saved before the store), then drop unused ones
+    db = SessionLocal()
+    try:
+        synced = pdf_cache.sync(db)
+        evicted = pdf_cache.evict(db)
+    finally:
+        db.close()
+    if synced or evicted:
+        logger.logger.info(f"PDF store: {synced} reference counts fixed, {evicted} unused PDFs evicted")
+    
+    # CPU workers load the NLP model as they start; the API process loads its own
+    # copy (used for background re-scoring) off the startup path
+    init_executors(cpu_initializer=warm_up_worker if settings.nlp_warm_up else None)
+    if settings.nlp_warm_up:
+        threading.Thread(target=get_analyzer().warm_up, name="nlp-warm-up", daemon=True).start()
+    
+    # Start draining queued analysis jobs, including any left over from a restart
+    job_queue.start()
+    # Finish a re-scoring run interrupted by the last shutdown or crash
+    rescorer.start(resume_only=True)
+    
     logger.logger.info("CV Maker API started successfully")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.logger.info("Shutting down CV Maker API...")
+    job_queue.stop()
+    rescorer.stop()
+    shutdown_executors()
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -121,6 +160,14 @@ async def health_check():
         "version": settings.app_version
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Running histograms of CV analysis stage durations (ms) and sizes (tokens) in this process."""
+    return {
+        "profiling": settings.analysis_profiling,
+        "analysis": analysis_metrics.snapshot()
+    }
+
 if __name__ == "__main__":
     import time
     
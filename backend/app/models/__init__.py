@@ -2,5 +2,9 @@ from .base import Base
 from .user import User
 from .cv import CV
 from .log import Log
+from .job import AnalysisJob
+from .score_histogram import ScoreHistogram
+from .rescoring_run import RescoringRun
+from .pdf_blob import PDFBlob
 
-__all__ = ["Base", "User", "CV", "Log"]
+__all__ = ["Base", "User", "CV", "Log", "AnalysisJob", "ScoreHistogram", "RescoringRun", "PDFBlob"]
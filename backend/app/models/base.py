@@ -2,3 +2,29 @@ from sqlalchemy.ext.declarative import declarative_base
 
 # Base comum para todos os modelos
 Base = declarative_base()
+
+def increment(session, table, key_columns, column: str, rows):
+    """Add each row's value of column to the stored one, inserting rows whose key is new."""
+    if not rows:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        # Upsert, so two processes adding the first value for a key do not collide
+        statement = insert(table)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c[key] for key in key_columns],
+            set_={column: table.c[column] + statement.excluded[column]}
+        ), rows)
+        return
+
+    for row in rows:
+        updated = session.execute(table.update().where(
+            *[table.c[key] == row[key] for key in key_columns]
+        ).values({column: table.c[column] + row[column]}))
+        if not updated.rowcount:
+            session.execute(table.insert().values(**row))
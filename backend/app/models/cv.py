@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float, LargeBinary
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from .base import Base
 
@@ -12,15 +12,42 @@ class CV(Base):
     original_text = Column(Text, nullable=False)
     analyzed_text = Column(Text, nullable=True)
     suggestions = Column(JSON, nullable=True)  # Store suggestions as JSON
-    pdf_path = Column(String(500), nullable=True)
+    # active_history loads the previous file on change, so pdf_blobs can drop its reference
+    pdf_path = column_property(Column(String(500), nullable=True), active_history=True)
     analysis_score = Column(Integer, nullable=True)  # Score from 0-100
     keywords = Column(JSON, nullable=True)  # Store keywords as JSON array
     sector = Column(String(100), nullable=True)  # Professional sector
+    analysis_mode = Column(String(20), nullable=True)  # Analysis tier (fast/standard/full) behind the stored results
+    rules_version = Column(String(50), nullable=True)  # Version of the CV rules behind the stored results
+    inferred_sector = Column(String(100), nullable=True)  # Classifier's guess when no sector was given
+    sector_confidence = Column(Float, nullable=True)  # Classifier confidence; NULL if never classified
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature of original_text (128 uint32)
+    duplicate_of = Column(Integer, nullable=True)  # Most similar earlier CV of the same user at upload
+    histogram_sector = Column(String(100), nullable=True)  # Score histogram bucket counting this CV ('' = no sector); NULL if not counted
+    histogram_score = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="cvs")
     
+    @property
+    def analysis_sector(self):
+        """Sector used for analysis: the user's choice, else the inferred one."""
+        return self.sector or self.inferred_sector
+    
+    def apply_analysis(self, analysis_result, mode: str = "full"):
+        """Store the fields of an analysis result on this CV.
+
+        Fields the analysis mode does not produce are cleared, so the row
+        never mixes results from different texts or tiers.
+        """
+        self.analyzed_text = analysis_result.get('analyzed_text')
+        self.suggestions = analysis_result.get('suggestions')
+        self.analysis_score = analysis_result.get('analysis_score')
+        self.keywords = analysis_result.get('keywords')
+        self.analysis_mode = mode
+        self.rules_version = analysis_result.get('rules_version')
+    
     def __repr__(self):
         return f"<CV(id={self.id}, user_id={self.user_id}, title='{self.title}')>"
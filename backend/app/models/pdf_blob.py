@@ -0,0 +1,49 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, event, inspect
+from sqlalchemy.orm import Session
+from .base import Base, increment
+from .cv import CV
+
+class PDFBlob(Base):
+    """A PDF file in the content-addressed PDF store and how many CVs point to it."""
+    __tablename__ = "pdf_blobs"
+
+    filename = Column(String(500), primary_key=True)  # <sha256 of what it renders>.pdf; older files keep their name
+    size = Column(Integer, nullable=True)
+    refcount = Column(Integer, nullable=False, default=0)  # CVs whose pdf_path is this file
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)  # Unreferenced files are evicted by idle time
+
+    def __repr__(self):
+        return f"<PDFBlob(filename='{self.filename}', refcount={self.refcount})>"
+
+def add_references(session: Session, deltas: Counter):
+    """Add deltas {filename: n} to the files' reference counts in the session's transaction."""
+    rows = [{'filename': filename, 'refcount': delta} for filename, delta in deltas.items() if delta]
+    increment(session, PDFBlob.__table__, ('filename',), 'refcount', rows)
+
+@event.listens_for(Session, "before_flush")
+def track_pdf_references(session, flush_context, instances):
+    """Move a reference from a CV's previous PDF file to its current one as it is saved."""
+    deltas = Counter()
+    for cv in session.deleted:
+        if isinstance(cv, CV):
+            history = inspect(cv).attrs.pdf_path.history
+            # Reading pdf_path loads the stored file if the CV was expired
+            for filename in history.deleted if history.has_changes() else [cv.pdf_path]:
+                if filename:
+                    deltas[filename] -= 1
+
+    for cv in list(session.new) + list(session.dirty):
+        if not isinstance(cv, CV) or cv in session.deleted:
+            continue
+        history = inspect(cv).attrs.pdf_path.history
+        for filename in history.deleted:
+            if filename:
+                deltas[filename] -= 1
+        for filename in history.added:
+            if filename:
+                deltas[filename] += 1
+
+    add_references(session, deltas)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from .base import Base
+
+class RescoringRun(Base):
+    """Progress of a re-analysis of the stored CVs after the rules changed."""
+    __tablename__ = "rescoring_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    rules_version = Column(String(50), nullable=False)  # Version the CVs are being brought up to
+    status = Column(String(20), nullable=False, default="running", index=True)  # running, done, failed
+    last_cv_id = Column(Integer, nullable=False, default=0)  # Checkpoint: every CV up to this id is done
+    rescored = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)  # Last checkpoint; a stale running run was interrupted
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<RescoringRun(id={self.id}, rules_version='{self.rules_version}', status='{self.status}')>"
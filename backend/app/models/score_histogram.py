@@ -0,0 +1,50 @@
+from collections import Counter
+from sqlalchemy import Column, Integer, String, event
+from sqlalchemy.orm import Session
+from .base import Base, increment
+from .cv import CV
+
+class ScoreHistogram(Base):
+    """Number of CVs with each analysis score, per sector ('' for CVs without one)."""
+    __tablename__ = "score_histograms"
+
+    sector = Column(String(100), primary_key=True)
+    score = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ScoreHistogram(sector='{self.sector}', score={self.score}, count={self.count})>"
+
+def add_counts(session: Session, deltas: Counter):
+    """Add deltas {(sector, score): n} to the histogram in the session's transaction."""
+    rows = [{'sector': sector, 'score': score, 'count': delta}
+            for (sector, score), delta in deltas.items() if delta]
+    increment(session, ScoreHistogram.__table__, ('sector', 'score'), 'count', rows)
+
+@event.listens_for(Session, "before_flush")
+def track_scores(session, flush_context, instances):
+    """Move each CV's count to the bucket of its current score and sector as it is saved.
+
+    histogram_sector and histogram_score record the bucket a CV is counted
+    in, so re-analyses, sector changes and deletions move or drop exactly
+    that count, whichever code path saves the CV.
+    """
+    deltas = Counter()
+    for cv in session.deleted:
+        if isinstance(cv, CV) and cv.histogram_sector is not None:
+            deltas[(cv.histogram_sector, cv.histogram_score)] -= 1
+
+    for cv in list(session.new) + list(session.dirty):
+        if not isinstance(cv, CV) or cv in session.deleted:
+            continue
+        counted = (cv.histogram_sector, cv.histogram_score) if cv.histogram_sector is not None else None
+        current = (cv.analysis_sector or '', cv.analysis_score) if cv.analysis_score is not None else None
+        if counted == current:
+            continue
+        if counted:
+            deltas[counted] -= 1
+        if current:
+            deltas[current] += 1
+        cv.histogram_sector, cv.histogram_score = current or (None, None)
+
+    add_counts(session, deltas)
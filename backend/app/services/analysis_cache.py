@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class AnalysisCache:
+    """Content-addressed cache of CV analysis results.
+
+    Entries are keyed on a hash of (normalized text, sector, rule version, mode) and
+    kept in a bounded in-process LRU. When a db_path is given, entries are also
+    persisted in SQLite so they survive restarts. The SQLite tier holds at
+    most max_db_bytes of results; past that, the least recently used go
+    until it is back under 90% of the cap.
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None,
+                 max_db_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_db_bytes = max_db_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self._init_db()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different copies share a cache key."""
+        text = unicodedata.normalize('NFC', text)
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text.strip()
+
+    @classmethod
+    def make_key(cls, text: str, sector: Optional[str], rules_version: str, mode: str = 'full') -> str:
+        """Build the cache key for an analysis request."""
+        payload = '\x1f'.join([rules_version, mode, sector or '', cls.normalize_text(text)])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis result, or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return deepcopy(self._entries[key])
+
+        result = self._db_get(key) if self.db_path else None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, result)
+        return deepcopy(result)
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """Store an analysis result in every cache tier."""
+        result = deepcopy(result)
+        with self._lock:
+            self._store(key, result)
+
+        if self.db_path:
+            self._db_set(key, result)
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Results for several keys (None for misses), e.g. in a single executor call."""
+        return [self.get(key) for key in keys]
+
+    def set_many(self, items: List[Tuple[str, Dict[str, Any]]]):
+        """Store several (key, result) pairs."""
+        for key, result in items:
+            self.set(key, result)
+
+    def clear(self):
+        """Drop all in-process entries (the persistent tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, result: Dict[str, Any]):
+        """Insert into the LRU tier, evicting the oldest entries. Caller holds the lock."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _init_db(self):
+        """Create the persistent cache table."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    used_at REAL NOT NULL DEFAULT 0
+                )
+            ''')
+            # Caches created before eviction lack the size and last use
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(analysis_cache)')}
+            if 'size' not in columns:
+                conn.execute('ALTER TABLE analysis_cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+                conn.execute('UPDATE analysis_cache SET size = length(result)')
+            if 'used_at' not in columns:
+                conn.execute('ALTER TABLE analysis_cache ADD COLUMN used_at REAL NOT NULL DEFAULT 0')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_analysis_cache_used_at ON analysis_cache (used_at)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _db_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from the persistent tier."""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute('SELECT result FROM analysis_cache WHERE key = ?', (key,)).fetchone()
+                if row:
+                    conn.execute('UPDATE analysis_cache SET used_at = ? WHERE key = ?', (time.time(), key))
+                    conn.commit()
+            finally:
+                conn.close()
+            return json.loads(row[0]) if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache read failed: {str(e)}")
+            return None
+
+    def _db_set(self, key: str, result: Dict[str, Any]):
+        """Write an entry to the persistent tier, evicting the least recently used past max_db_bytes."""
+        data = json.dumps(result)
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO analysis_cache (key, result, size, used_at) VALUES (?, ?, ?, ?)',
+                    (key, data, len(data), time.time())
+                )
+                total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM analysis_cache').fetchone()[0]
+                if total > self.max_db_bytes:
+                    # Keep the most recently used entries that fit in 90% of the cap
+                    deleted = conn.execute('''
+                        DELETE FROM analysis_cache WHERE key IN (
+                            SELECT key FROM (
+                                SELECT key, SUM(size) OVER (ORDER BY used_at DESC, key) AS kept
+                                FROM analysis_cache
+                            ) WHERE kept > ?
+                        )
+                    ''', (int(self.max_db_bytes * 0.9),)).rowcount
+                    logger.info(f"Evicted {deleted} persistent analysis cache entries")
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache write failed: {str(e)}")
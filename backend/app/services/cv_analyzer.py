@@ -1,243 +1,557 @@
-import spacy
-import re
-from typing import List, Dict, Any, Tuple
+import copy
+import hashlib
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Optional
 from collections import Counter
+from itertools import groupby, repeat
 import logging
+from backend.app.services.cv_sections import split_chunks, split_sections
+from backend.app.services.language_detector import LanguageDetector, MIN_CONFIDENCE, get_language_detector
+from backend.app.services.model_registry import ModelRegistry, UNUSED_COMPONENTS
+from backend.app.services.rule_engine import RuleEngine, get_rule_engine
+from backend.app.utils.metrics import StageTimer
 
 logger = logging.getLogger(__name__)
 
+# Result fields produced by the fast (rules) and slow (NLP) analysis stages
+RULE_FIELDS = ('analyzed_text', 'suggestions', 'analysis_score')
+NLP_FIELDS = ('keywords', 'word_count', 'sentence_count')
+
+# Every result also has 'rules_version', the version of the rules it was computed with.
+# Result fields each analysis mode fills in:
+#   fast: regex and lexicon rules only, spaCy is never touched
+#   standard: adds the rewritten text and sector keywords, using only the spaCy tokenizer
+#   full: adds NER and noun keywords and sentence counts from the whole pipeline
+MODE_FIELDS = {
+    'fast': ('analysis_score', 'suggestions', 'word_count'),
+    'standard': ('analysis_score', 'suggestions', 'word_count', 'analyzed_text', 'keywords'),
+    'full': RULE_FIELDS + NLP_FIELDS,
+}
+ANALYSIS_MODES = tuple(MODE_FIELDS)
+
+# CVs longer than this many characters are parsed in chunks of at most this size
+CHUNK_CHARS = 20000
+# Sentence-final punctuation; a chunk or section whose last sentence has none continues it in the next one
+SENTENCE_END = frozenset('.!?…')
+
+# Format of the per-section features kept by analyze_incremental; bump when fields change
+SECTION_FEATURES_VERSION = "2"
+
 class CVAnalyzer:
-    def __init__(self):
-        try:
-            # Load Portuguese spaCy model (fallback to English if not available)
-            try:
-                self.nlp = spacy.load("pt_core_news_sm")
-            except OSError:
-                logger.warning("Portuguese model not found, using English model")
-                self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.error("No spaCy model found. Please install: python -m spacy download pt_core_news_sm")
-            self.nlp = None
+    def __init__(self, model_name: str = "pt_core_news_sm", fallback_model: str = "en_core_web_sm",
+                 rule_engine: Optional[RuleEngine] = None, models: Optional[Dict[str, str]] = None,
+                 default_language: str = "pt", language_detector: Optional[LanguageDetector] = None,
+                 min_language_confidence: float = MIN_CONFIDENCE, chunk_chars: int = CHUNK_CHARS):
+        # Each CV's language is detected from character n-grams and picks the
+        # lexicons and the spaCy model used for it. Models are loaded lazily on
+        # first use (or via warm_up for the default language). CVs whose
+        # language is unsure use every lexicon and the default model.
+        self.model_name = model_name
+        self.fallback_model = fallback_model
+        self.model_registry = ModelRegistry({'pt': model_name, 'en': fallback_model, **(models or {})},
+                                            default_language)
+        self.language_detector = language_detector or get_language_detector()
+        self.min_language_confidence = min_language_confidence
+        self.chunk_chars = chunk_chars
         
-        # Define action verbs for CV improvement
-        self.action_verbs = {
-            'pt': [
-                'desenvolvi', 'criei', 'implementei', 'geri', 'liderei', 'coordenei',
-                'otimizei', 'melhorei', 'aumentei', 'reduzi', 'alcancei', 'realizei',
-                'estabeleci', 'construí', 'projetei', 'executei', 'supervisionei',
-                'colaborei', 'inovei', 'transformei', 'automatizei', 'analisei'
-            ],
-            'en': [
-                'developed', 'created', 'implemented', 'managed', 'led', 'coordinated',
-                'optimized', 'improved', 'increased', 'reduced', 'achieved', 'accomplished',
-                'established', 'built', 'designed', 'executed', 'supervised',
-                'collaborated', 'innovated', 'transformed', 'automated', 'analyzed'
-            ]
-        }
+        # Lexicons, score weights and suggestion texts come from the rules file
+        # (config/cv_rules.json), shared with the Streamlit app. Its version is
+        # stamped on every result and is part of every cache key, so bump it
+        # whenever the rules change. An analyzer never changes rules; see with_rules.
+        self.rules = rule_engine or get_rule_engine()
+
+    @property
+    def rules_version(self) -> str:
+        return self.rules.version
+
+    @property
+    def action_verbs(self) -> Dict[str, List[str]]:
+        return self.rules.action_verbs
+
+    @property
+    def weak_words(self) -> Dict[str, List[str]]:
+        return self.rules.weak_words
+
+    @property
+    def sector_keywords(self) -> Dict[str, List[str]]:
+        return self.rules.sector_keywords
+
+    def with_rules(self, rule_engine: RuleEngine) -> 'CVAnalyzer':
+        """Copy of this analyzer using other rules; loaded models and the language detector are shared."""
+        analyzer = copy.copy(self)
+        analyzer.rules = rule_engine
+        return analyzer
+
+    @property
+    def nlp(self):
+        """spaCy pipeline of the default language, loaded on first access. None if no model is installed."""
+        return self.model_registry.get()
+
+    @nlp.setter
+    def nlp(self, value):
+        # One pipeline for every language, e.g. a blank one in tests
+        self.model_registry.use(value)
+
+    def detect_language(self, cv_text: str) -> Optional[str]:
+        """Language of the CV, or None when the detector is unsure (e.g. a mixed-language CV)."""
+        return self.language_detector.language(cv_text, self.min_language_confidence)
+
+    def nlp_for(self, language: Optional[str]):
+        """spaCy pipeline for a detected language (see ModelRegistry.get)."""
+        return self.model_registry.get(language)
+
+    def warm_up(self):
+        """Load the spaCy model and run it once so the first request is not slowed down."""
+        if self.nlp:
+            self.nlp("Desenvolvi aplicações web.")
+
+    def analyze_cv(self, cv_text: str, sector: str = None, doc=None, profile: bool = False,
+                   mode: str = 'full') -> Dict[str, Any]:
+        """Analyze CV and provide suggestions for improvement.
+
+        mode is one of ANALYSIS_MODES; the result holds MODE_FIELDS[mode].
+        doc may be an already parsed Doc of cv_text (e.g. from a DocStore).
+        With profile=True the result also has a 'profile' entry with the
+        duration of each stage in ms and the token count.
+        """
+        if mode not in MODE_FIELDS:
+            raise ValueError(f"Unknown analysis mode '{mode}', expected one of {', '.join(ANALYSIS_MODES)}")
         
-        # Weak words to avoid
-        self.weak_words = {
-            'pt': ['responsável por', 'ajudei', 'participei', 'trabalhei em', 'fiz parte'],
-            'en': ['responsible for', 'helped', 'participated', 'worked on', 'was part of']
-        }
+        timer = StageTimer()
+        with timer.stage('language'):
+            language = self.detect_language(cv_text)
+        if mode == 'fast':
+            result = self._fast_analysis(cv_text, sector, timer, language)
+            return self._with_profile(result, timer, result['word_count'], profile)
         
-        # Professional sectors keywords
-        self.sector_keywords = {
-            'tecnologia': ['python', 'java', 'javascript', 'react', 'angular', 'node.js', 'sql', 'mongodb', 'aws', 'docker', 'kubernetes'],
-            'marketing': ['seo', 'sem', 'google analytics', 'facebook ads', 'content marketing', 'social media', 'branding'],
-            'vendas': ['crm', 'salesforce', 'pipeline', 'leads', 'conversão', 'negociação', 'b2b', 'b2c'],
-            'recursos_humanos': ['recrutamento', 'seleção', 'treinamento', 'desenvolvimento', 'performance', 'cultura organizacional'],
-            'financas': ['excel', 'power bi', 'análise financeira', 'orçamento', 'fluxo de caixa', 'investimentos', 'contabilidade']
-        }
-
-    def analyze_cv(self, cv_text: str, sector: str = None) -> Dict[str, Any]:
-        """Analyze CV and provide suggestions for improvement."""
-        if not self.nlp:
-            return self._basic_analysis(cv_text, sector)
+        nlp = self.nlp_for(language)
+        if not nlp:
+            with timer.stage('basic'):
+                result = self._basic_analysis(cv_text, sector)
+            result = {field: result[field] for field in MODE_FIELDS[mode]}
+            return self._with_profile(result, timer, result['word_count'], profile)
         
-        doc = self.nlp(cv_text)
+        if doc is None and len(cv_text) > self.chunk_chars:
+            result = self._analyze_chunked(cv_text, sector, nlp, mode, timer, language)
+            return self._with_profile(result, timer, result['word_count'], profile)
         
-        # Perform various analyses
-        score = self._calculate_score(cv_text, doc)
-        suggestions = self._generate_suggestions(cv_text, doc, sector)
-        keywords = self._extract_keywords(doc, sector)
-        improved_text = self._suggest_improvements(cv_text)
+        if mode == 'standard':
+            with timer.stage('parse'):
+                doc = nlp.make_doc(cv_text)
+            result = self._rules_stage(cv_text, len(doc), sector, timer, language)
+            with timer.stage('keywords'):
+                result['keywords'] = self._rank_keywords([], [], cv_text, sector)
+            result['word_count'] = len(doc)
+            return self._with_profile(result, timer, len(doc), profile)
         
-        return {
-            'analyzed_text': improved_text,
-            'suggestions': suggestions,
-            'analysis_score': score,
-            'keywords': keywords,
-            'word_count': len(doc),
-            'sentence_count': len(list(doc.sents))
-        }
+        if doc is None:
+            with timer.stage('parse'):
+                doc = nlp(cv_text)
+        result = self._analyze_doc(cv_text, doc, sector, timer, language)
+        return self._with_profile(result, timer, len(doc), profile)
 
-    def _calculate_score(self, text: str, doc) -> int:
-        """Calculate CV quality score (0-100)."""
-        score = 50  # Base score
-        
-        # Check for action verbs
-        action_verb_count = self._count_action_verbs(text)
-        score += min(action_verb_count * 5, 20)
+    def analyze_many(self, texts: Iterable[str], sectors: Optional[Iterable[Optional[str]]] = None,
+                     batch_size: int = 32, n_process: int = 1,
+                     cv_ids: Optional[List[int]] = None, doc_store=None) -> Iterator[Dict[str, Any]]:
+        """Analyze many CVs by streaming them through nlp.pipe.
+
+        Consecutive CVs routed to the same pipeline go through it together;
+        CVs longer than chunk_chars are analyzed one at a time in chunks. With
+        cv_ids and a doc_store, stored Docs are reused and newly parsed ones
+        are saved (see parse_many). Results are yielded in the same order as
+        the input texts.
+        """
+        if sectors is None:
+            sectors = repeat(None)
+        use_store = cv_ids is not None and doc_store is not None
         
-        # Check for weak words (penalty)
-        weak_word_count = self._count_weak_words(text)
-        score -= min(weak_word_count * 3, 15)
+        routed = (
+            (cv_text, sector, cv_id, self.detect_language(cv_text))
+            for cv_text, sector, cv_id in zip(texts, sectors, cv_ids if use_store else repeat(None))
+        )
+        runs = groupby(routed, key=lambda item: (self.nlp_for(item[3]), len(item[0]) > self.chunk_chars))
+        for (nlp, chunked), run in runs:
+            run = list(run)
+            if not nlp:
+                for cv_text, sector, _, _ in run:
+                    yield self._stamp(self._basic_analysis(cv_text, sector))
+                continue
+            if chunked:
+                for cv_text, sector, _, language in run:
+                    yield self._stamp(self._analyze_chunked(cv_text, sector, nlp, 'full', StageTimer(), language))
+                continue
+            
+            run_texts = [cv_text for cv_text, _, _, _ in run]
+            if use_store:
+                docs = self.parse_many(run_texts, [cv_id for _, _, cv_id, _ in run], doc_store,
+                                       batch_size=batch_size, n_process=n_process, nlp=nlp)
+            else:
+                docs = nlp.pipe(run_texts, batch_size=batch_size, n_process=n_process)
+            for (cv_text, sector, _, language), doc in zip(run, docs):
+                yield self._stamp(self._analyze_doc(cv_text, doc, sector, language=language))
+
+    def parse_many(self, texts: List[str], cv_ids: List[int], doc_store,
+                   batch_size: int = 32, n_process: int = 1, nlp=None) -> List:
+        """Return a parsed Doc per CV, loading stored Docs in bulk.
+
+        Only CVs without a stored Doc for their current text go through the
+        pipeline (nlp, by default the one of the first CV's language); their
+        Docs are then added to doc_store.
+        """
+        if nlp is None:
+            nlp = self.nlp_for(self.detect_language(texts[0]) if texts else None)
+        docs = doc_store.get_many(zip(cv_ids, texts), nlp)
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        if missing:
+            parsed = nlp.pipe((texts[i] for i in missing), batch_size=batch_size, n_process=n_process)
+            for i, doc in zip(missing, parsed):
+                doc_store.put(cv_ids[i], texts[i], doc, nlp)
+                docs[i] = doc
+        logger.debug(f"Parsed {len(missing)} of {len(docs)} CVs, the rest came from the Doc store")
+        return docs
+
+    def analyze_rules(self, cv_text: str, sector: str = None) -> Dict[str, Any]:
+        """Fast analysis stage: score, suggestions and improved text.
+
+        Only the tokenizer runs, so this is much cheaper than analyze_cv.
+        Together with analyze_nlp it gives the same result as analyze_cv.
+        """
+        language = self.detect_language(cv_text)
+        nlp = self.nlp_for(language)
+        if not nlp:
+            result = self._basic_analysis(cv_text, sector)
+            return self._stamp({field: result[field] for field in RULE_FIELDS})
         
-        # Check for quantifiable results
-        numbers = re.findall(r'\d+%|\d+\+|€\d+|\$\d+|\d+k|\d+ anos?|\d+ meses?', text.lower())
-        score += min(len(numbers) * 3, 15)
+        if len(cv_text) > self.chunk_chars:
+            word_count = self._parse_chunks(cv_text, nlp, StageTimer(), tokenize_only=True)['word_count']
+        else:
+            word_count = len(nlp.make_doc(cv_text))
+        return self._stamp(self._rules_stage(cv_text, word_count, sector, language=language))
+
+    def analyze_nlp(self, cv_text: str, sector: str = None) -> Dict[str, Any]:
+        """Slow analysis stage: keywords and counts from the full spaCy pipeline."""
+        nlp = self.nlp_for(self.detect_language(cv_text))
+        if not nlp:
+            result = self._basic_analysis(cv_text, sector)
+            return self._stamp({field: result[field] for field in NLP_FIELDS})
         
-        # Check length (optimal range)
-        word_count = len(doc)
-        if 200 <= word_count <= 800:
-            score += 10
-        elif word_count < 200:
-            score -= 10
-        elif word_count > 1000:
-            score -= 5
+        if len(cv_text) > self.chunk_chars:
+            totals = self._parse_chunks(cv_text, nlp, StageTimer())
+            return self._stamp({
+                'keywords': self._rank_keywords(totals['entities'], totals['nouns'], cv_text, sector),
+                'word_count': totals['word_count'],
+                'sentence_count': totals['sentence_count']
+            })
+        return self._stamp(self._nlp_stage(nlp(cv_text), sector))
+
+    def analyze_incremental(self, cv_text: str, sector: str = None, section_cache=None,
+                            profile: bool = False) -> Dict[str, Any]:
+        """Analyze a CV, only running spaCy on sections not seen before.
+
+        The text is split into sections and each section's features are stored
+        in section_cache (anything with get/set, e.g. AnalysisCache) under a
+        hash of its text. Score and keywords are rebuilt from those partials,
+        so editing one section only re-parses that section. Counts that cross
+        section boundaries are stitched as in the chunked path, so the result
+        equals analyze_cv's, apart from tags a statistical model would assign
+        differently right at a section boundary. CVs longer than chunk_chars
+        take analyze_cv's chunked path.
+        """
+        if section_cache is None or len(cv_text) > self.chunk_chars:
+            return self.analyze_cv(cv_text, sector, profile=profile)
         
-        # Check for contact information
-        if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
-            score += 5
-        if re.search(r'\+?[\d\s\-\(\)]{9,}', text):
-            score += 5
+        timer = StageTimer()
+        with timer.stage('language'):
+            language = self.detect_language(cv_text)
+            nlp = self.nlp_for(language)
+        if not nlp:
+            return self.analyze_cv(cv_text, sector, profile=profile)
+        with timer.stage('sections'):
+            sections = [section_text for _, section_text in split_sections(cv_text)]
+            keys = [self._section_key(section_text, language, nlp) for section_text in sections]
+            features = [section_cache.get(key) for key in keys]
         
-        return max(0, min(100, score))
-
-    def _generate_suggestions(self, text: str, doc, sector: str = None) -> List[Dict[str, Any]]:
-        """Generate specific suggestions for CV improvement."""
-        suggestions = []
+        missing = [i for i, section_features in enumerate(features) if section_features is None]
+        if missing:
+            with timer.stage('parse'):
+                docs = list(nlp.pipe(sections[i] for i in missing))
+            for i, doc in zip(missing, docs):
+                features[i] = self._section_features(sections[i], doc, timer, language)
+                section_cache.set(keys[i], features[i])
+        logger.debug(f"Incremental analysis: parsed {len(missing)} of {len(sections)} sections")
         
-        # Check for action verbs
-        action_verb_count = self._count_action_verbs(text)
-        if action_verb_count < 3:
-            suggestions.append({
-                'type': 'action_verbs',
-                'priority': 'high',
-                'title': 'Use mais verbos de ação',
-                'description': 'Substitua frases passivas por verbos de ação como "desenvolvi", "implementei", "geri".',
-                'examples': ['Em vez de "responsável por vendas" → "Geri equipa de vendas"']
-            })
+        totals = self._merge_section_features(features)
+        with timer.stage('rewrite'):
+            analyzed_text = self._suggest_improvements(cv_text)
+        with timer.stage('suggestions'):
+            suggestions = self._generate_suggestions(cv_text, None, sector, features=totals)
+        with timer.stage('score'):
+            score = self._calculate_score(cv_text, None, features=totals)
+        with timer.stage('keywords'):
+            keywords = self._rank_keywords(totals['entities'], totals['nouns'], cv_text, sector)
         
-        # Check for quantifiable results
-        numbers = re.findall(r'\d+%|\d+\+|€\d+|\$\d+|\d+k|\d+ anos?|\d+ meses?', text.lower())
-        if len(numbers) < 2:
-            suggestions.append({
-                'type': 'quantifiable_results',
-                'priority': 'high',
-                'title': 'Adicione resultados quantificáveis',
-                'description': 'Inclua números, percentagens e métricas para demonstrar o seu impacto.',
-                'examples': ['Em vez de "melhorei as vendas" → "Aumentei as vendas em 25%"']
-            })
+        result = {
+            'analyzed_text': analyzed_text,
+            'suggestions': suggestions,
+            'analysis_score': score,
+            'keywords': keywords,
+            'word_count': totals['word_count'],
+            'sentence_count': totals['sentence_count']
+        }
+        result = self._with_profile(result, timer, totals['word_count'], profile)
+        if profile:
+            result['profile']['sections_parsed'] = len(missing)
+            result['profile']['sections'] = len(sections)
+        return result
+
+    def _fast_analysis(self, cv_text: str, sector: str, timer: StageTimer,
+                       language: Optional[str] = None) -> Dict[str, Any]:
+        """Score and suggestions from regexes and lexicons only.
+
+        Words are counted by whitespace instead of spaCy tokens, so the score can
+        differ by a few points from the other modes around the length thresholds.
+        """
+        with timer.stage('features'):
+            features = self.rules.features(cv_text, language=language)
+        with timer.stage('suggestions'):
+            suggestions = self.rules.suggestions(features, cv_text, sector)
+        with timer.stage('score'):
+            score = self.rules.score(features)
         
-        # Check for weak words
-        weak_word_count = self._count_weak_words(text)
-        if weak_word_count > 2:
-            suggestions.append({
-                'type': 'weak_words',
-                'priority': 'medium',
-                'title': 'Evite palavras fracas',
-                'description': 'Substitua expressões vagas por verbos de ação específicos.',
-                'examples': ['Em vez de "ajudei com" → "Coordenei" ou "Implementei"']
-            })
+        return {
+            'analysis_score': score,
+            'suggestions': suggestions,
+            'word_count': features['word_count']
+        }
+
+    def _section_key(self, section_text: str, language: Optional[str], nlp) -> str:
+        """Cache key for one section's features, which depend on the CV's language and pipeline."""
+        model = f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+        payload = '\x1f'.join([SECTION_FEATURES_VERSION, self.rules_version, language or '', model, section_text])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _section_features(self, section_text: str, doc, timer: StageTimer,
+                          language: Optional[str] = None) -> Dict[str, Any]:
+        """Additive features of one parsed section."""
+        with timer.stage('features'):
+            features = self._text_features(section_text, len(doc), language=language)
+        with timer.stage('keywords'):
+            sentences = list(doc.sents)
+            features['sentence_count'] = len(sentences)
+            # An unfinished last sentence continues in the next section
+            features['open_sentence'] = bool(sentences) and not self._ends_sentence(sentences[-1])
+            features['entities'] = self._entity_keywords(doc)
+            features['nouns'] = self._noun_keywords(doc)
+        return features
+
+    def _merge_section_features(self, section_features: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-section features into whole-CV features."""
+        totals = {
+            'action_verbs': 0, 'weak_words': 0, 'numbers': 0, 'word_count': 0, 'sentence_count': 0,
+            'has_email': False, 'has_phone': False, 'entities': [], 'nouns': []
+        }
+        open_sentence = False
+        for features in section_features:
+            for field in ('action_verbs', 'weak_words', 'numbers', 'word_count'):
+                totals[field] += features[field]
+            sentences = features['sentence_count']
+            totals['sentence_count'] += sentences - (1 if open_sentence and sentences else 0)
+            if sentences:
+                open_sentence = features['open_sentence']
+            totals['has_email'] = totals['has_email'] or features['has_email']
+            totals['has_phone'] = totals['has_phone'] or features['has_phone']
+            totals['entities'].extend(features['entities'])
+            totals['nouns'].extend(features['nouns'])
+        return totals
+
+    def _analyze_doc(self, cv_text: str, doc, sector: str = None, timer: StageTimer = None,
+                     language: Optional[str] = None) -> Dict[str, Any]:
+        """Build the analysis result for an already parsed Doc."""
+        timer = timer or StageTimer()
+        result = self._rules_stage(cv_text, len(doc), sector, timer, language)
+        result.update(self._nlp_stage(doc, sector, timer))
+        return result
+
+    def _rules_stage(self, cv_text: str, word_count: int, sector: str = None, timer: StageTimer = None,
+                     language: Optional[str] = None) -> Dict[str, Any]:
+        """Regex and lexicon based results; word_count is the text's spaCy token count."""
+        timer = timer or StageTimer()
+        with timer.stage('features'):
+            features = self._text_features(cv_text, word_count, language=language)
+        with timer.stage('rewrite'):
+            analyzed_text = self._suggest_improvements(cv_text)
+        with timer.stage('suggestions'):
+            suggestions = self._generate_suggestions(cv_text, None, sector, features=features)
+        with timer.stage('score'):
+            score = self._calculate_score(cv_text, None, features=features)
         
-        # Check word count
-        word_count = len(doc)
-        if word_count < 200:
-            suggestions.append({
-                'type': 'length',
-                'priority': 'medium',
-                'title': 'CV muito curto',
-                'description': 'Adicione mais detalhes sobre as suas experiências e competências.',
-                'examples': ['Inclua projetos específicos, tecnologias utilizadas, resultados alcançados']
-            })
-        elif word_count > 1000:
-            suggestions.append({
-                'type': 'length',
-                'priority': 'low',
-                'title': 'CV muito longo',
-                'description': 'Considere resumir informações menos relevantes.',
-                'examples': ['Foque nas experiências mais recentes e relevantes']
-            })
+        return {
+            'analyzed_text': analyzed_text,
+            'suggestions': suggestions,
+            'analysis_score': score
+        }
+
+    def _nlp_stage(self, doc, sector: str = None, timer: StageTimer = None) -> Dict[str, Any]:
+        """Results that need the tagger, NER and sentence boundaries."""
+        timer = timer or StageTimer()
+        with timer.stage('keywords'):
+            keywords = self._extract_keywords(doc, sector)
+            sentence_count = len(list(doc.sents))
         
-        # Sector-specific suggestions
-        if sector and sector in self.sector_keywords:
-            sector_words = self.sector_keywords[sector]
-            found_keywords = [word for word in sector_words if word.lower() in text.lower()]
-            if len(found_keywords) < 3:
-                suggestions.append({
-                    'type': 'sector_keywords',
-                    'priority': 'medium',
-                    'title': f'Adicione palavras-chave de {sector}',
-                    'description': f'Inclua mais termos técnicos relevantes para a área de {sector}.',
-                    'examples': [f'Considere incluir: {", ".join(sector_words[:5])}']
-                })
+        return {
+            'keywords': keywords,
+            'word_count': len(doc),
+            'sentence_count': sentence_count
+        }
+
+    def _analyze_chunked(self, cv_text: str, sector: Optional[str], nlp, mode: str, timer: StageTimer,
+                         language: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze a long CV by streaming chunks of it through spaCy.
+
+        Only one chunk's Doc exists at a time and no Doc exceeds the model's
+        max_length. The regex rules still run on the whole string. Chunks
+        never cut a word, so the result equals the unchunked one, apart from
+        tags a statistical model would assign differently right at a chunk
+        boundary.
+        """
+        totals = self._parse_chunks(cv_text, nlp, timer, tokenize_only=mode == 'standard')
+        result = self._rules_stage(cv_text, totals['word_count'], sector, timer, language)
+        with timer.stage('keywords'):
+            result['keywords'] = self._rank_keywords(totals['entities'], totals['nouns'], cv_text, sector)
+        result['word_count'] = totals['word_count']
+        if mode == 'full':
+            result['sentence_count'] = totals['sentence_count']
+        return result
+
+    def _parse_chunks(self, cv_text: str, nlp, timer: StageTimer, tokenize_only: bool = False) -> Dict[str, Any]:
+        """Token and sentence counts and entity and noun Counters of a text parsed in chunks.
+
+        Counters are updated in document order, so ties rank as in an
+        unchunked analysis. A chunk whose last sentence has no final
+        punctuation continues it in the next chunk, so sentence counts match
+        the sentencizer's on the whole text.
+        """
+        totals = {'word_count': 0, 'sentence_count': 0, 'entities': Counter(), 'nouns': Counter()}
+        chunks = split_chunks(cv_text, self.chunk_chars)
+        if tokenize_only:
+            with timer.stage('parse'):
+                totals['word_count'] = sum(len(nlp.make_doc(chunk)) for chunk in chunks)
+            return totals
         
-        return suggestions
+        docs = iter(nlp.pipe(chunks, batch_size=1))
+        open_sentence = False
+        while True:
+            with timer.stage('parse'):
+                doc = next(docs, None)
+            if doc is None:
+                break
+            with timer.stage('keywords'):
+                totals['word_count'] += len(doc)
+                totals['entities'].update(self._entity_keywords(doc))
+                totals['nouns'].update(self._noun_keywords(doc))
+                sentences = list(doc.sents)
+                totals['sentence_count'] += len(sentences) - (1 if open_sentence and sentences else 0)
+                if sentences:
+                    open_sentence = not self._ends_sentence(sentences[-1])
+        return totals
+
+    def _ends_sentence(self, sentence) -> bool:
+        """Whether the trailing punctuation of a sentence includes a sentence-final mark."""
+        for token in reversed(sentence):
+            if token.is_space:
+                continue
+            if not token.is_punct:
+                return False
+            if token.text[-1] in SENTENCE_END:
+                return True
+        return False
+
+    def _stamp(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the version of the rules a result was computed with."""
+        result['rules_version'] = self.rules.version
+        return result
+
+    def _with_profile(self, result: Dict[str, Any], timer: StageTimer, tokens: int, profile: bool) -> Dict[str, Any]:
+        """Stamp the rules version and, when profiling, attach stage durations and token count."""
+        self._stamp(result)
+        if profile:
+            result['profile'] = {
+                'stages_ms': timer.as_dict(),
+                'total_ms': round(sum(timer.durations.values()), 3),
+                'tokens': tokens
+            }
+        return result
+
+    def _text_features(self, text: str, word_count: int, term_counts: Counter = None,
+                       language: Optional[str] = None) -> Dict[str, Any]:
+        """Regex and lexicon features shared by scoring and suggestions."""
+        return self.rules.features(text, word_count, term_counts, language)
+
+    def _calculate_score(self, text: str, doc, term_counts: Counter = None,
+                         features: Dict[str, Any] = None) -> int:
+        """Calculate CV quality score (0-100)."""
+        if features is None:
+            features = self._text_features(text, len(doc), term_counts)
+        return self.rules.score(features)
+
+    def _generate_suggestions(self, text: str, doc, sector: str = None,
+                              term_counts: Counter = None,
+                              features: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Generate specific suggestions for CV improvement."""
+        if features is None:
+            features = self._text_features(text, len(doc), term_counts)
+        return self.rules.suggestions(features, text, sector)
 
     def _extract_keywords(self, doc, sector: str = None) -> List[str]:
         """Extract relevant keywords from CV."""
-        keywords = []
-        
-        # Extract named entities
-        for ent in doc.ents:
-            if ent.label_ in ['ORG', 'PRODUCT', 'LANGUAGE']:
-                keywords.append(ent.text.lower())
-        
-        # Extract technical terms (nouns that might be technologies)
-        for token in doc:
-            if (token.pos_ == 'NOUN' and 
-                len(token.text) > 3 and 
-                not token.is_stop and 
-                not token.is_punct):
-                keywords.append(token.text.lower())
+        return self._rank_keywords(self._entity_keywords(doc), self._noun_keywords(doc), doc.text, sector)
+
+    def _entity_keywords(self, doc) -> List[str]:
+        """Named entities that look like organizations, products or languages."""
+        return [ent.text.lower() for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'LANGUAGE']]
+
+    def _noun_keywords(self, doc) -> List[str]:
+        """Technical terms (nouns that might be technologies)."""
+        return [
+            token.text.lower() for token in doc
+            if (token.pos_ == 'NOUN' and
+                len(token.text) > 3 and
+                not token.is_stop and
+                not token.is_punct)
+        ]
+
+    def _rank_keywords(self, entities: Iterable[str], nouns: Iterable[str], text: str, sector: str = None) -> List[str]:
+        """Combine entity, noun and sector keywords into the 20 most common.
+
+        entities and nouns are lists or Counters; ties keep first-seen order.
+        """
+        keyword_counts = Counter(entities)
+        keyword_counts.update(nouns)
         
         # Add sector-specific keywords if found
-        if sector and sector in self.sector_keywords:
-            sector_words = self.sector_keywords[sector]
-            found_sector_keywords = [word for word in sector_words if word.lower() in doc.text.lower()]
-            keywords.extend(found_sector_keywords)
+        keyword_counts.update(self.rules.sector_keywords_found(text, sector))
         
-        # Remove duplicates and return most common
-        keyword_counts = Counter(keywords)
+        # Return most common
         return [word for word, count in keyword_counts.most_common(20)]
 
     def _suggest_improvements(self, text: str) -> str:
         """Suggest improved version of CV text."""
-        improved_text = text
-        
-        # Replace weak phrases with stronger alternatives
-        replacements = {
-            'responsável por': 'geri',
-            'ajudei com': 'colaborei em',
-            'trabalhei em': 'desenvolvi',
-            'participei em': 'contribuí para',
-            'fiz parte de': 'integrei'
-        }
-        
-        for weak, strong in replacements.items():
-            improved_text = re.sub(weak, strong, improved_text, flags=re.IGNORECASE)
-        
-        return improved_text
+        return self.rules.rewrite(text)
 
-    def _count_action_verbs(self, text: str) -> int:
+    def _match_terms(self, text: str, language: Optional[str] = None) -> Counter:
+        """Count every action verb and weak phrase (of one language, if given) in one pass over the text."""
+        return self.rules.match_terms(text, language)
+
+    def _count_action_verbs(self, text: str, term_counts: Counter = None, language: Optional[str] = None) -> int:
         """Count action verbs in text."""
-        text_lower = text.lower()
-        count = 0
-        for verb_list in self.action_verbs.values():
-            for verb in verb_list:
-                count += len(re.findall(r'\b' + verb + r'\b', text_lower))
-        return count
-
-    def _count_weak_words(self, text: str) -> int:
+        if term_counts is None:
+            term_counts = self._match_terms(text, language)
+        return self.rules.count_action_verbs(term_counts, language)
+
+    def _count_weak_words(self, text: str, term_counts: Counter = None, language: Optional[str] = None) -> int:
         """Count weak words/phrases in text."""
-        text_lower = text.lower()
-        count = 0
-        for weak_list in self.weak_words.values():
-            for weak in weak_list:
-                count += len(re.findall(r'\b' + weak + r'\b', text_lower))
-        return count
+        if term_counts is None:
+            term_counts = self._match_terms(text, language)
+        return self.rules.count_weak_words(term_counts, language)
 
     def _basic_analysis(self, text: str, sector: str = None) -> Dict[str, Any]:
         """Basic analysis when spaCy is not available."""
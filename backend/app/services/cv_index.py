@@ -0,0 +1,384 @@
+"""
+TF-IDF index of a user's CVs for ranking them against a job description.
+
+Each CV is a sparse vector of sublinear term frequencies (its text plus its
+stored keywords). Vectors live in a column-compressed matrix (one posting list
+per term) plus a small unsorted delta of recently added CVs, which is merged
+in once it grows past a fraction of the matrix. Adding, replacing or removing
+a CV therefore never rebuilds the whole index. A query only reads the posting
+lists of its own terms. Stop words (the lists behind the analyzer's
+token.is_stop) are not indexed.
+
+Indexes live in the memory of one API process, which applies its own CV
+changes to them. Changes made by other API processes only show up once the
+index is rebuilt, max_age seconds after it was built.
+"""
+
+import string
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Stripped from both ends of a word; inner punctuation stays ("node.js", "b2b")
+_PUNCTUATION = string.punctuation + '«»“”‘’…–—•·'
+
+class _TermIds(dict):
+    """raw lowercase word -> term id cache; -1 for words that are not terms."""
+
+    def __init__(self, index: 'CVMatchIndex'):
+        super().__init__()
+        self.index = index
+
+    def __missing__(self, word: str) -> int:
+        term = word.strip(_PUNCTUATION)
+        is_term = len(term) > 1 and not term.isdigit() and term not in self.index.stop_words
+        term_id = self.index._add_term(term) if is_term else -1
+        self[word] = term_id
+        return term_id
+
+def stop_words(languages: Iterable[str]) -> FrozenSet[str]:
+    """spaCy's stop words for the given languages, the lists token.is_stop checks."""
+    from spacy.util import get_lang_class
+
+    words = set()
+    for language in languages:
+        words |= get_lang_class(language).Defaults.stop_words
+    return frozenset(words)
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Return array with room for at least size items, doubling its capacity."""
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array), 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+class CVMatchIndex:
+    """Incrementally maintained TF-IDF vectors of one user's CVs."""
+
+    def __init__(self, max_query_terms: int = 64, max_df_ratio: float = 0.5, min_delta_entries: int = 50_000,
+                 stop_words: Iterable[str] = ()):
+        self.max_query_terms = max_query_terms
+        self.max_df_ratio = max_df_ratio
+        self.min_delta_entries = min_delta_entries
+        self.stop_words = frozenset(stop_words)
+        self.built_at = time.monotonic()
+
+        self.terms: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self._term_ids = _TermIds(self)
+        self._df = np.zeros(0, dtype=np.int32)
+
+        # Every added CV gets a new slot (row); replaced and removed CVs leave dead
+        # slots until the next merge renumbers the live ones
+        self._slots: Dict[int, int] = {}
+        self._slot_cv_ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._slot_terms: Dict[int, np.ndarray] = {}
+        self._n_slots = 0
+
+        # Sorted part: posting list of term t is rows/values[indptr[t]:indptr[t + 1]]
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int32)
+        self._values = np.zeros(0, dtype=np.float32)
+        # Unsorted (rows, cols, values) chunks of CVs added since the last merge
+        self._delta: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._delta_cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._delta_entries = 0
+        self._dead_entries = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, cv_id: int, text: str, keywords: Optional[Sequence[str]] = None):
+        """Add a CV, replacing any previous version of it."""
+        self.add_many([(cv_id, text, keywords)])
+
+    def add_many(self, documents: Iterable[Tuple[int, str, Optional[Sequence[str]]]]):
+        """Add or replace several CVs given as (cv_id, text, keywords).
+
+        The CVs are vectorized together, so bulk loads cost a few NumPy calls
+        rather than a few per CV.
+        """
+        # The last version of a CV listed twice wins
+        latest = {cv_id: (text, keywords) for cv_id, text, keywords in documents}
+        with self._lock:
+            term_ids = self._term_ids
+            slots, lengths, ids = [], [], []
+            for cv_id, (text, keywords) in latest.items():
+                self._remove(cv_id)
+                words = self._words(text, keywords)
+                ids.extend(map(term_ids.__getitem__, words))
+                lengths.append(len(words))
+                slots.append(self._new_slot(cv_id))
+            if not slots:
+                return
+
+            rows = np.repeat(np.array(slots, dtype=np.int64), lengths)
+            ids = np.array(ids, dtype=np.int64)
+            rows, cols, values = self._term_frequencies(rows[ids >= 0], ids[ids >= 0])
+            n_terms = len(self.terms)
+            self._df[:n_terms] += np.bincount(cols, minlength=n_terms).astype(np.int32)
+
+            bounds = np.searchsorted(rows, slots[1:])
+            for slot, slot_terms in zip(slots, np.split(cols, bounds)):
+                self._slot_terms[slot] = slot_terms
+            weighted = values * self._idf(self._df[:n_terms])[cols]
+            norms = np.sqrt(np.bincount(rows - slots[0], weights=weighted ** 2, minlength=len(slots)))
+            self._norms[slots[0]:slots[-1] + 1] = norms
+
+            self._delta.append((rows.astype(np.int32), cols, values))
+            self._delta_cache = None
+            self._delta_entries += len(rows)
+            if self._delta_entries > max(self.min_delta_entries, len(self._rows) // 10):
+                self._merge()
+
+    def compact(self):
+        """Merge pending changes into the sorted matrix now."""
+        with self._lock:
+            self._merge()
+
+    def remove(self, cv_id: int):
+        with self._lock:
+            self._remove(cv_id)
+            if self._dead_entries > len(self._rows) // 4 + self.min_delta_entries:
+                self._merge()
+
+    def match(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k CVs by cosine similarity to the query, best first.
+
+        Each match has cv_id, score and the shared terms that contributed most.
+        """
+        with self._lock:
+            term_ids, tf = self._query_vector(query)
+            n_docs = len(self._slots)
+            if not len(term_ids) or not n_docs:
+                return []
+
+            # Terms found in most CVs barely change the ranking but have the
+            # longest posting lists, so they are dropped; so are all but the
+            # heaviest query terms
+            df = self._df[term_ids]
+            keep = df <= max(1, self.max_df_ratio * n_docs)
+            idf = self._idf(df)
+            query_weights = tf * idf
+            query_norm = float(np.sqrt(np.sum(query_weights ** 2)))
+            term_ids, idf, query_weights = term_ids[keep], idf[keep], query_weights[keep]
+            if len(term_ids) > self.max_query_terms:
+                heaviest = np.sort(np.argpartition(-query_weights, self.max_query_terms)[:self.max_query_terms])
+                term_ids, idf, query_weights = term_ids[heaviest], idf[heaviest], query_weights[heaviest]
+            if not len(term_ids):
+                return []
+
+            rows, positions, values = self._postings(term_ids)
+            contributions = values * (query_weights * idf)[positions]
+            scores = np.bincount(rows, weights=contributions, minlength=self._n_slots)
+            scores[~self._alive[:self._n_slots]] = 0
+            scores /= np.maximum(self._norms[:self._n_slots], 1e-9) * query_norm
+
+            k = min(k, n_docs)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            top = top[scores[top] > 0]
+
+            in_top = np.isin(rows, top)
+            rows, positions, contributions = rows[in_top], positions[in_top], contributions[in_top]
+            results = []
+            for slot in top:
+                mask = rows == slot
+                order = np.argsort(-contributions[mask], kind='stable')
+                results.append({
+                    'cv_id': int(self._slot_cv_ids[slot]),
+                    'score': round(float(scores[slot]), 4),
+                    'matched_terms': [self.terms[term_ids[i]] for i in positions[mask][order]]
+                })
+            return results
+
+    def _add_term(self, term: str) -> int:
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            term_id = self.vocabulary[term] = len(self.terms)
+            self.terms.append(term)
+            self._df = _grow(self._df, len(self.terms))
+        return term_id
+
+    def _words(self, text: str, keywords: Optional[Sequence[str]]) -> List[str]:
+        words = text.lower().split()
+        if keywords:
+            # Stored keywords (entities, nouns, sector terms) count as extra mentions
+            words += ' '.join(keywords).lower().split()
+        return words
+
+    def _term_frequencies(self, rows: np.ndarray, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Collapse (row, term id) occurrences into unique entries sorted by row then term.
+
+        Values are sublinear term frequencies, 1 + log(count).
+        """
+        n_terms = max(len(self.terms), 1)
+        keys = np.sort(rows * n_terms + ids)
+        if not len(keys):
+            return keys, keys, np.zeros(0, dtype=np.float32)
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        counts = np.diff(np.append(starts, len(keys)))
+        keys = keys[starts]
+        return keys // n_terms, keys % n_terms, (1 + np.log(counts)).astype(np.float32)
+
+    def _query_vector(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted ids of the query's indexed terms and their sublinear frequencies."""
+        vocabulary = self.vocabulary
+        words = query.lower().split()
+        ids = np.fromiter((vocabulary.get(word.strip(_PUNCTUATION), -1) for word in words),
+                          dtype=np.int64, count=len(words))
+        ids = ids[ids >= 0]
+        _, term_ids, tf = self._term_frequencies(np.zeros(len(ids), dtype=np.int64), ids)
+        return term_ids, tf
+
+    def _idf(self, df: np.ndarray) -> np.ndarray:
+        """Smoothed inverse document frequency."""
+        n_docs = len(self._slots)
+        return (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+    def _new_slot(self, cv_id: int) -> int:
+        slot = self._n_slots
+        self._n_slots += 1
+        self._slot_cv_ids = _grow(self._slot_cv_ids, self._n_slots)
+        self._alive = _grow(self._alive, self._n_slots)
+        self._norms = _grow(self._norms, self._n_slots)
+        self._slot_cv_ids[slot] = cv_id
+        self._alive[slot] = True
+        self._slots[cv_id] = slot
+        return slot
+
+    def _remove(self, cv_id: int):
+        slot = self._slots.pop(cv_id, None)
+        if slot is None:
+            return
+        term_ids = self._slot_terms.pop(slot)
+        self._df[term_ids] -= 1
+        self._alive[slot] = False
+        self._dead_entries += len(term_ids)
+
+    def _postings(self, term_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rows, positions in term_ids, tf values) of the entries of the given sorted term ids."""
+        n_sorted = len(self._indptr) - 1
+        starts = np.array([self._indptr[t] if t < n_sorted else 0 for t in term_ids], dtype=np.int64)
+        ends = np.array([self._indptr[t + 1] if t < n_sorted else 0 for t in term_ids], dtype=np.int64)
+        lengths = ends - starts
+        # Gather every posting list with one fancy index instead of a concatenate per term
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        gather = np.arange(lengths.sum(), dtype=np.int64) + offsets
+        rows = self._rows[gather]
+        positions = np.repeat(np.arange(len(term_ids)), lengths)
+        values = self._values[gather]
+
+        if self._delta:
+            delta_rows, delta_cols, delta_values = self._delta_arrays()
+            lookup = np.searchsorted(term_ids, delta_cols)
+            lookup[lookup == len(term_ids)] = 0
+            hit = term_ids[lookup] == delta_cols
+            rows = np.concatenate((rows, delta_rows[hit]))
+            positions = np.concatenate((positions, lookup[hit]))
+            values = np.concatenate((values, delta_values[hit]))
+        return rows, positions, values
+
+    def _delta_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The delta as flat (rows, cols, values), cached until the next add."""
+        if self._delta_cache is None:
+            self._delta_cache = tuple(np.concatenate(parts) for parts in zip(*self._delta))
+        return self._delta_cache
+
+    def _merge(self):
+        """Fold the delta into the sorted matrix, drop dead CVs, compact the slots and refresh the norms."""
+        n_terms = len(self.terms)
+        cols = np.repeat(np.arange(len(self._indptr) - 1, dtype=np.int64), np.diff(self._indptr))
+        rows, values = self._rows, self._values
+        if self._delta:
+            delta_rows, delta_cols, delta_values = self._delta_arrays()
+            rows = np.concatenate((rows, delta_rows))
+            cols = np.concatenate((cols, delta_cols))
+            values = np.concatenate((values, delta_values))
+
+        live = self._alive[rows]
+        rows, cols, values = rows[live], cols[live], values[live]
+
+        # Renumber the live slots 0..n-1, so replaced and removed CVs free their slots
+        alive = self._alive[:self._n_slots]
+        live_slots = np.flatnonzero(alive)
+        renumbered = (np.cumsum(alive) - 1).astype(np.int32)
+        rows = renumbered[rows]
+        self._n_slots = len(live_slots)
+        self._slot_cv_ids[:self._n_slots] = self._slot_cv_ids[live_slots]
+        self._alive[:self._n_slots] = True
+        self._alive[self._n_slots:] = False
+        self._slots = {cv_id: int(renumbered[slot]) for cv_id, slot in self._slots.items()}
+        self._slot_terms = {int(renumbered[slot]): terms for slot, terms in self._slot_terms.items()}
+
+        order = np.argsort(cols, kind='stable')
+        self._rows, self._values = rows[order], values[order]
+        self._indptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=n_terms))))
+        self._delta, self._delta_cache = [], None
+        self._delta_entries = self._dead_entries = 0
+
+        # Document frequencies have moved since older CVs were added
+        weighted = values * self._idf(self._df[:n_terms])[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weighted ** 2, minlength=self._n_slots))
+        self._norms[:self._n_slots] = norms.astype(np.float32)
+
+class CVMatchIndexes:
+    """Per-user CVMatchIndex objects, built on first use and kept in an LRU.
+
+    An index older than max_age seconds is rebuilt, so CV changes made by
+    other processes are picked up within that time.
+    """
+
+    def __init__(self, max_users: int = 32, max_age: float = 300.0, **index_options):
+        self.max_users = max_users
+        self.max_age = max_age
+        self.index_options = index_options
+        self._indexes: 'OrderedDict[int, CVMatchIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, load: Callable[[], Iterable[Tuple[int, str, Optional[Sequence[str]]]]]) -> CVMatchIndex:
+        """Return the user's index, building it from load() if it is not in memory or too old."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None and not self._expired(index):
+                self._indexes.move_to_end(user_id)
+                return index
+
+        index = CVMatchIndex(**self.index_options)
+        index.add_many(load())
+        index.compact()
+        with self._lock:
+            # Another request may have built it meanwhile; keep the newest one
+            current = self._indexes.get(user_id)
+            if current is None or current.built_at < index.built_at:
+                self._indexes[user_id] = current = index
+            index = current
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def update(self, user_id: int, cv_id: int, text: str, keywords: Optional[Sequence[str]] = None):
+        """Add or replace a CV in the user's index, if that index is loaded."""
+        index = self._indexes.get(user_id)
+        if index is not None:
+            index.add(cv_id, text, keywords)
+
+    def remove(self, user_id: int, cv_id: int):
+        index = self._indexes.get(user_id)
+        if index is not None:
+            index.remove(cv_id)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def _expired(self, index: CVMatchIndex) -> bool:
+        return time.monotonic() - index.built_at > self.max_age
@@ -0,0 +1,133 @@
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# Contact fields, detected before section headers (checked in this order)
+FIELD_KEYWORDS = {
+    'name': ['nome:', 'name:'],
+    'email': ['email:', 'e-mail:'],
+    'telefone': ['telefone:', 'telemóvel:', 'phone:']
+}
+
+# Section headers (checked in this order)
+SECTION_KEYWORDS = {
+    'objetivo': ['objetivo', 'objectivo', 'summary', 'resumo'],
+    'experiencia': ['experiência', 'experiencia', 'experience', 'trabalho'],
+    'educacao': ['educação', 'educacao', 'education', 'formação', 'formacao'],
+    'competencias': ['competências', 'competencias', 'skills', 'habilidades'],
+    'projetos': ['projetos', 'projects', 'projectos'],
+    'idiomas': ['idiomas', 'languages', 'línguas', 'linguas']
+}
+
+# Chunk boundaries, best first. Each match ends right before a non-space
+# character that follows whitespace, so cutting there never splits a word or a
+# whitespace run.
+LINE_BOUNDARY = re.compile(r'\n\s*(?=\S)')
+CHUNK_BOUNDARIES = [
+    re.compile(r'\n[ \t]*\n\s*(?=\S)'),  # blank line between paragraphs
+    LINE_BOUNDARY,
+    re.compile(r'[.!?…]\s+(?=\S)'),  # sentence end
+    re.compile(r'\s+(?=\S)')
+]
+
+def detect_field(line_lower: str) -> Optional[str]:
+    """Return the contact field a lowercased line holds, if any."""
+    for field, keywords in FIELD_KEYWORDS.items():
+        if any(keyword in line_lower for keyword in keywords):
+            return field
+    return None
+
+def detect_section(line_lower: str) -> Optional[str]:
+    """Return the section a lowercased line is a header of, if any."""
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in line_lower for keyword in keywords):
+            return section
+    return None
+
+def split_sections(cv_text: str) -> List[Tuple[str, str]]:
+    """Split CV text into (section, text) chunks at section headers.
+
+    Uses the same header detection as PDFGenerator._parse_cv_text. Chunks keep
+    their line endings, so joining them gives back the original text.
+    """
+    sections = []
+    current_section = 'outros'
+    current_lines = []
+
+    for line in cv_text.splitlines(keepends=True):
+        line_lower = line.strip().lower()
+        section = None
+        if line_lower and not detect_field(line_lower):
+            section = detect_section(line_lower)
+
+        if section:
+            if current_lines:
+                sections.append((current_section, ''.join(current_lines)))
+            current_section = section
+            current_lines = []
+        current_lines.append(line)
+
+    if current_lines:
+        sections.append((current_section, ''.join(current_lines)))
+
+    return sections
+
+def changed_sections(old_text: str, new_text: str) -> List[str]:
+    """Names of the sections whose text differs between two versions of a CV.
+
+    Sections are listed in the order they appear in the new text, followed by
+    the ones only the old text had.
+    """
+    def grouped(cv_text: str):
+        sections = {}
+        for section, section_text in split_sections(cv_text):
+            sections.setdefault(section, []).append(section_text.strip())
+        return sections
+
+    old_sections, new_sections = grouped(old_text), grouped(new_text)
+    names = list(new_sections) + [name for name in old_sections if name not in new_sections]
+    return [name for name in names if old_sections.get(name) != new_sections.get(name)]
+
+def split_chunks(cv_text: str, max_chars: int) -> Iterator[str]:
+    """Split CV text into chunks of at most max_chars for parsing piece by piece.
+
+    Each chunk ends at the best boundary in the second half of its window: a
+    section header, a blank line, a line end, a sentence end, or any space.
+    Boundaries never cut a word or a whitespace run, so spaCy tokenizes the
+    chunks exactly as the whole text, and joining them gives back the text.
+    A run longer than max_chars without any space stays whole.
+    """
+    start = 0
+    while len(cv_text) - start > max_chars:
+        end = _chunk_end(cv_text, start, max_chars)
+        if end is None:
+            break
+        yield cv_text[start:end]
+        start = end
+    if start < len(cv_text):
+        yield cv_text[start:]
+
+def _chunk_end(cv_text: str, start: int, max_chars: int) -> Optional[int]:
+    """Where the chunk starting at start should end (see split_chunks)."""
+    limit = start + max_chars
+    for lower in (start + max_chars // 2, start + 1):
+        # Section headers first, then the other boundaries in order
+        headers = [
+            match.end() for match in LINE_BOUNDARY.finditer(cv_text, lower - 1, limit + 1)
+            if _is_header(cv_text, match.end())
+        ]
+        if headers:
+            return headers[-1]
+        for pattern in CHUNK_BOUNDARIES:
+            ends = [match.end() for match in pattern.finditer(cv_text, lower - 1, limit + 1) if match.end() >= lower]
+            if ends:
+                return ends[-1]
+
+    # No space within max_chars: end at the first boundary after it
+    match = CHUNK_BOUNDARIES[-1].search(cv_text, limit)
+    return match.end() if match else None
+
+def _is_header(cv_text: str, line_start: int) -> bool:
+    """Whether the line starting at line_start is a section header, as split_sections sees it."""
+    line_end = cv_text.find('\n', line_start)
+    line_lower = cv_text[line_start:line_end if line_end != -1 else len(cv_text)].strip().lower()
+    return bool(line_lower) and not detect_field(line_lower) and detect_section(line_lower) is not None
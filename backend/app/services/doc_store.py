@@ -0,0 +1,210 @@
+import glob
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class DocStore:
+    """On-disk store of parsed spaCy Docs, serialized with DocBin.
+
+    Each CV keeps at most one Doc, in a file named after the CV id and a hash
+    of its text and the pipeline that parsed it, so an edited CV or a new model
+    never gets a stale Doc. Files are evicted least recently used first once
+    max_entries or max_bytes is exceeded.
+
+    The directory may be shared by several processes (the CPU workers, the
+    re-scorer and the API). Reads touch the file mtime, and the index is
+    rebuilt from the directory at most every rescan_interval seconds, so the
+    caps and the LRU order apply to every process's files.
+    """
+
+    SUFFIX = '.spacy'
+
+    def __init__(self, root_dir: str, max_entries: int = 5000, max_bytes: int = 512 * 1024 * 1024,
+                 rescan_interval: float = 10.0):
+        self.root_dir = root_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self._scanned_at = 0.0
+        self._entries = OrderedDict()  # key -> file size, oldest first
+        self._cv_keys: Dict[int, str] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def pipeline_id(nlp) -> str:
+        """Identify the pipeline a Doc was parsed with."""
+        meta = nlp.meta
+        return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}:{','.join(nlp.pipe_names)}"
+
+    @classmethod
+    def make_key(cls, cv_id: int, text: str, nlp) -> str:
+        """Build the store key for a CV's text parsed by nlp."""
+        payload = '\x1f'.join([cls.pipeline_id(nlp), text])
+        return f"{cv_id}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]}"
+
+    def get(self, cv_id: int, text: str, nlp):
+        """Return the stored Doc for this CV text, or None."""
+        return self.get_many([(cv_id, text)], nlp)[0]
+
+    def get_many(self, items: Iterable[Tuple[int, str]], nlp) -> List:
+        """Load the Docs for several (cv_id, text) pairs. Missing entries are None."""
+        from spacy.tokens import DocBin
+
+        docs = []
+        for cv_id, text in items:
+            key = self.make_key(cv_id, text, nlp)
+            data = self._read(key)
+            if data is None:
+                docs.append(None)
+                continue
+            try:
+                docs.append(next(DocBin().from_bytes(data).get_docs(nlp.vocab)))
+            except Exception as e:
+                logger.warning(f"Discarding unreadable stored Doc {key}: {str(e)}")
+                self._remove(key)
+                docs.append(None)
+        return docs
+
+    def put(self, cv_id: int, text: str, doc, nlp):
+        """Store the Doc for a CV, replacing any older Doc of the same CV."""
+        from spacy.tokens import DocBin
+
+        key = self.make_key(cv_id, text, nlp)
+        data = DocBin(docs=[doc], store_user_data=False).to_bytes()
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store Doc for CV {cv_id}: {str(e)}")
+            return
+
+        with self._lock:
+            self._add(key, len(data))
+            self._evict()
+
+    def delete_cv(self, cv_id: int):
+        """Remove the stored Docs of a CV, whichever process wrote them."""
+        self._delete_files(f"{cv_id}-*")
+
+    def clear(self):
+        """Remove every stored Doc."""
+        self._delete_files("*")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, key + self.SUFFIX)
+
+    def _load_index(self):
+        """Build the LRU index from the files already on disk."""
+        with self._lock:
+            self._scan()
+            self._evict()
+
+    def _scan(self):
+        """Rebuild the index from the directory, oldest mtime first. Caller holds the lock."""
+        files = []
+        for entry in os.scandir(self.root_dir):
+            if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Removed by another process while scanning
+                    continue
+                files.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+        self._entries.clear()
+        self._cv_keys.clear()
+        self._total_bytes = 0
+        for _, key, size in sorted(files):
+            self._add(key, size)
+        self._scanned_at = time.monotonic()
+
+    def _delete_files(self, pattern: str):
+        """Delete the stored Docs whose key matches a glob pattern."""
+        paths = glob.glob(os.path.join(glob.escape(self.root_dir), pattern + self.SUFFIX))
+        with self._lock:
+            for path in paths:
+                self._forget(os.path.basename(path)[:-len(self.SUFFIX)])
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """Read an entry and mark it as recently used."""
+        path = self._path(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            elif os.path.exists(path):
+                # Written by another process sharing the directory
+                self._add(key, os.path.getsize(path))
+                self._evict()
+            else:
+                self.misses += 1
+                return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # The file mtime keeps the LRU order across restarts
+            os.utime(path)
+        except OSError:
+            # Removed (e.g. evicted) by another process sharing the directory
+            self._remove(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._forget(key, delete_file=True)
+
+    def _add(self, key: str, size: int):
+        """Track an entry as most recently used. Caller holds the lock."""
+        cv_id = int(key.split('-', 1)[0])
+        previous = self._cv_keys.get(cv_id)
+        if previous and previous != key:
+            # Only the Doc of the CV's latest text is kept
+            self._forget(previous, delete_file=True)
+        self._total_bytes += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+        self._cv_keys[cv_id] = key
+
+    def _forget(self, key: str, delete_file: bool = False):
+        """Drop an entry from the index. Caller holds the lock."""
+        if key not in self._entries:
+            return
+        self._total_bytes -= self._entries.pop(key)
+        cv_id = int(key.split('-', 1)[0])
+        if self._cv_keys.get(cv_id) == key:
+            del self._cv_keys[cv_id]
+        if delete_file:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Remove least recently used entries until under both caps. Caller holds the lock."""
+        if time.monotonic() - self._scanned_at > self.rescan_interval:
+            # Pick up the files other processes wrote, read or removed
+            self._scan()
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._forget(key, delete_file=True)
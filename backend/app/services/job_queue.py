@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from backend.app.core.executors import run_cpu_sync
+from backend.app.models.cv import CV as CVModel
+from backend.app.models.job import AnalysisJob
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.cv_index import CVMatchIndexes
+from backend.app.services.tasks import get_analyzer, analyze_cv_task
+from backend.app.utils.logger import get_logger
+from backend.app.utils.metrics import analysis_metrics
+
+logger = logging.getLogger(__name__)
+activity_logger = get_logger()
+
+class AnalysisJobQueue:
+    """Background CV analysis backed by the analysis_jobs table.
+
+    Jobs are rows in the database, so queued work survives restarts and can be
+    drained by workers in any API process. Each worker thread claims the oldest
+    queued job with a conditional UPDATE, runs the analysis on the CPU pool and
+    writes the result to both the job and the CV row.
+    """
+
+    def __init__(self, session_factory: Callable, analysis_cache: AnalysisCache,
+                 workers: int = 2, poll_interval: float = 1.0,
+                 stale_after: int = 600, max_attempts: int = 3,
+                 match_indexes: Optional[CVMatchIndexes] = None):
+        self.session_factory = session_factory
+        self.analysis_cache = analysis_cache
+        self.match_indexes = match_indexes
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def start(self):
+        """Requeue jobs interrupted by a crash and start the worker threads."""
+        if self._threads:
+            return
+        self._stop.clear()
+        self._requeue_stale()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"analysis-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Analysis job queue started with {self.workers} workers")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the worker threads after their current job."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, db, user_id: int, cv_id: int) -> AnalysisJob:
+        """Queue an analysis of a CV and return the job."""
+        job = AnalysisJob(user_id=user_id, cv_id=cv_id, status="queued")
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._wakeup.set()
+        return job
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim_next()
+            except Exception as e:
+                logger.error(f"Failed to claim analysis job: {str(e)}")
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                self._requeue_stale()
+                continue
+
+            self._run(job_id)
+
+    def _claim_next(self) -> Optional[int]:
+        """Atomically move the oldest queued job to running. Returns its id."""
+        db = self.session_factory()
+        try:
+            while True:
+                job = db.query(AnalysisJob.id).filter(
+                    AnalysisJob.status == "queued"
+                ).order_by(AnalysisJob.id).first()
+                if job is None:
+                    return None
+
+                # Another worker may have claimed it between the SELECT and the UPDATE
+                claimed = db.query(AnalysisJob).filter(
+                    AnalysisJob.id == job.id,
+                    AnalysisJob.status == "queued"
+                ).update({
+                    AnalysisJob.status: "running",
+                    AnalysisJob.started_at: datetime.utcnow(),
+                    AnalysisJob.attempts: AnalysisJob.attempts + 1
+                }, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    return job.id
+        finally:
+            db.close()
+
+    def _run(self, job_id: int):
+        """Analyze the job's CV and store the result."""
+        start_time = time.time()
+        db = self.session_factory()
+        try:
+            job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+            cv = db.query(CVModel).filter(
+                CVModel.id == job.cv_id,
+                CVModel.user_id == job.user_id
+            ).first()
+            if not cv:
+                raise ValueError("CV not found")
+
+            rules_version = get_analyzer().rules_version
+            analysis_result = self.analysis_cache.get(
+                self.analysis_cache.make_key(cv.original_text, cv.analysis_sector, rules_version)
+            )
+            cache_hit = analysis_result is not None
+            profile = None
+            if not cache_hit:
+                cv_text, cv_sector = cv.original_text, cv.analysis_sector
+                # Do not hold the DB connection while the analysis runs
+                db.rollback()
+                analysis_result, used_nlp = run_cpu_sync(analyze_cv_task, cv_text, cv_sector, job.cv_id)
+                profile = analysis_result.pop('profile', None)
+                analysis_metrics.record(profile)
+                if used_nlp:
+                    self.analysis_cache.set(
+                        self.analysis_cache.make_key(cv_text, cv_sector, analysis_result.get('rules_version', rules_version)),
+                        analysis_result
+                    )
+            # Results cached before versions were stamped carry the version of their key
+            analysis_result.setdefault('rules_version', rules_version)
+
+            cv.apply_analysis(analysis_result)
+            job.status = "done"
+            job.result = analysis_result
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            if self.match_indexes is not None:
+                self.match_indexes.update(job.user_id, cv.id, cv.original_text, cv.keywords)
+
+            activity_logger.log_cv_analysis(
+                user_id=job.user_id,
+                cv_id=job.cv_id,
+                score=analysis_result['analysis_score'],
+                cache_hit=cache_hit,
+                profile=profile,
+                execution_time=int((time.time() - start_time) * 1000)
+            )
+
+        except Exception as e:
+            db.rollback()
+            db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update({
+                AnalysisJob.status: "failed",
+                AnalysisJob.error_message: str(e),
+                AnalysisJob.finished_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            activity_logger.log_error(error_message=f"Analysis job {job_id} failed: {str(e)}")
+        finally:
+            db.close()
+
+    def _requeue_stale(self):
+        """Put back jobs left running by a crashed worker; give up after max_attempts."""
+        db = self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+            stale = db.query(AnalysisJob).filter(
+                AnalysisJob.status == "running",
+                AnalysisJob.started_at < cutoff
+            )
+            stale.filter(AnalysisJob.attempts >= self.max_attempts).update({
+                AnalysisJob.status: "failed",
+                AnalysisJob.error_message: "Analysis did not finish after several attempts",
+                AnalysisJob.finished_at: datetime.utcnow()
+            }, synchronize_session=False)
+            requeued = stale.filter(AnalysisJob.attempts < self.max_attempts).update({
+                AnalysisJob.status: "queued"
+            }, synchronize_session=False)
+            db.commit()
+            if requeued:
+                logger.warning(f"Requeued {requeued} interrupted analysis jobs")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to requeue stale analysis jobs: {str(e)}")
+        finally:
+            db.close()
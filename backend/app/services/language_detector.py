@@ -0,0 +1,111 @@
+"""
+Character n-gram language detection, used to route a CV to the lexicon and
+spaCy model of its language.
+
+Each language has a profile of character trigram log-probabilities built from
+sample text (config/language_samples.json). A CV is scored line by line with
+naive Bayes; its confidence is the share of the decided lines' characters that
+went to the winning language, so a CV written half in each language comes out
+unsure instead of being forced into one of them. Like the rule engine, the
+module only uses the standard library.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SAMPLES_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'config', 'language_samples.json'
+))
+
+NGRAM_SIZE = 3
+# Only the start of a CV is read; a thousand characters is plenty to tell languages apart
+MAX_CHARS = 1000
+# Lines with fewer trigrams (a lone word) or a smaller per-trigram log-likelihood
+# margin (names, skill lists) do not vote
+MIN_NGRAMS = 6
+MIN_MARGIN = 0.3
+# Below this share of decided lines a CV counts as mixed-language
+MIN_CONFIDENCE = 0.7
+
+WORD_PATTERN = re.compile(r'[^\W\d_]+')
+
+def ngrams(text: str, size: int = NGRAM_SIZE) -> List[str]:
+    """Character n-grams of the lowercased words of a text, joined by single spaces and padded."""
+    padded = ' ' + ' '.join(WORD_PATTERN.findall(text.lower())) + ' '
+    return [padded[i:i + size] for i in range(len(padded) - size + 1)] if len(padded) > 2 else []
+
+class LanguageDetector:
+    """Naive Bayes over character trigrams, one profile per language."""
+
+    def __init__(self, samples: Dict[str, str], max_chars: int = MAX_CHARS, min_margin: float = MIN_MARGIN):
+        self.languages = list(samples)
+        self.max_chars = max_chars
+        self.min_margin = min_margin
+
+        counts = {language: Counter(ngrams(text)) for language, text in samples.items()}
+        vocabulary = set().union(*counts.values())
+        # Add-one smoothing; each trigram maps to its log-probability in every language
+        totals = [sum(counts[language].values()) + len(vocabulary) + 1 for language in self.languages]
+        self._unseen = tuple(-math.log(total) for total in totals)
+        self._log_probs = {
+            gram: tuple(math.log(counts[language][gram] + 1) - math.log(total)
+                        for language, total in zip(self.languages, totals))
+            for gram in vocabulary
+        }
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> 'LanguageDetector':
+        """Build a detector from a JSON file of {language: sample text}."""
+        with open(path or DEFAULT_SAMPLES_PATH, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def detect(self, text: str) -> Tuple[Optional[str], float]:
+        """Most likely language of the text and the share of its decided lines in that language.
+
+        Returns (None, 0.0) when no line is decided, e.g. an empty text or a
+        bare list of technologies.
+        """
+        votes = [0] * len(self.languages)
+        for line in text[:self.max_chars].splitlines():
+            grams = ngrams(line)
+            if len(grams) < MIN_NGRAMS:
+                continue
+            scores = self._scores(grams)
+            ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+            if len(ranked) > 1 and (scores[ranked[0]] - scores[ranked[1]]) / len(grams) < self.min_margin:
+                continue
+            votes[ranked[0]] += len(grams)
+
+        decided = sum(votes)
+        if not decided:
+            return None, 0.0
+        best = max(range(len(votes)), key=votes.__getitem__)
+        return self.languages[best], round(votes[best] / decided, 4)
+
+    def language(self, text: str, min_confidence: float = MIN_CONFIDENCE) -> Optional[str]:
+        """Language of the text, or None when the detector is less confident than min_confidence."""
+        language, confidence = self.detect(text)
+        return language if confidence >= min_confidence else None
+
+    def _scores(self, grams: List[str]) -> List[float]:
+        """Log-likelihood of the trigrams under each language's profile."""
+        log_probs = map(self._log_probs.get, grams, repeat(self._unseen))
+        return [math.fsum(column) for column in zip(*log_probs)]
+
+_detectors: Dict[str, LanguageDetector] = {}
+_lock = threading.Lock()
+
+def get_language_detector(path: Optional[str] = None) -> LanguageDetector:
+    """Return the detector built from a samples file, building it on first use."""
+    path = path or DEFAULT_SAMPLES_PATH
+    if path not in _detectors:
+        with _lock:
+            if path not in _detectors:
+                _detectors[path] = LanguageDetector.from_file(path)
+    return _detectors[path]
@@ -0,0 +1,86 @@
+import threading
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pipeline components the analyzer never reads; excluding them skips loading their weights
+UNUSED_COMPONENTS = ['lemmatizer', 'textcat', 'textcat_multilabel', 'entity_linker', 'entity_ruler', 'trainable_lemmatizer']
+
+_NO_OVERRIDE = object()
+
+class ModelRegistry:
+    """spaCy model per CV language, each pipeline loaded the first time a CV in that language arrives.
+
+    A language whose model is not installed falls back to the default
+    language's pipeline, then to any other registered one.
+    """
+
+    def __init__(self, models: Dict[str, str], default_language: str):
+        self.models = dict(models)
+        self.default_language = default_language
+        self._pipelines: Dict[str, Any] = {}  # language -> pipeline, or None if its model is missing
+        self._override = _NO_OVERRIDE
+        self._lock = threading.Lock()
+
+    def get(self, language: Optional[str] = None):
+        """Pipeline for the language (the default one if None); None if no model is installed."""
+        if self._override is not _NO_OVERRIDE:
+            return self._override
+        nlp = self._pipelines.get(language)
+        if nlp is not None:
+            return nlp
+        for candidate in self._candidates(language):
+            nlp = self._pipeline(candidate)
+            if nlp is not None:
+                return nlp
+        return None
+
+    def set(self, language: str, nlp):
+        """Use an already loaded pipeline for a language."""
+        with self._lock:
+            self.models.setdefault(language, nlp.meta.get('name'))
+            self._pipelines[language] = nlp
+
+    def use(self, nlp):
+        """Serve one pipeline (or None, for no NLP) for every language, e.g. a blank one in tests."""
+        with self._lock:
+            self._override = nlp
+
+    def loaded(self) -> List[str]:
+        """Languages whose model has been loaded."""
+        return [language for language, nlp in self._pipelines.items() if nlp is not None]
+
+    def _candidates(self, language: Optional[str]) -> List[str]:
+        """Languages to try in order: the requested one, the default, then the rest."""
+        order = [language, self.default_language] + list(self.models)
+        return [candidate for candidate in dict.fromkeys(order) if candidate in self.models]
+
+    def _pipeline(self, language: str):
+        if language not in self._pipelines:
+            with self._lock:
+                if language not in self._pipelines:
+                    self._pipelines[language] = self._load(self.models[language])
+        return self._pipelines[language]
+
+    def _load(self, model_name: str):
+        """Load a spaCy model with only the components the analyzer uses."""
+        try:
+            import spacy
+        except ImportError:
+            logger.error("spaCy is not installed. Please install: pip install spacy")
+            return None
+
+        try:
+            nlp = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+        except OSError:
+            logger.warning(f"spaCy model {model_name} not found. Install it with: python -m spacy download {model_name}")
+            return None
+
+        # Sentence boundaries only need the senter, which is much cheaper than the parser
+        if 'senter' in nlp.disabled and 'parser' in nlp.pipe_names:
+            nlp.remove_pipe('parser')
+            nlp.enable_pipe('senter')
+
+        logger.info(f"Loaded spaCy pipeline {nlp.meta.get('name')}: {nlp.pipe_names}")
+        return nlp
@@ -0,0 +1,165 @@
+"""
+Near-duplicate CV detection with MinHash signatures and LSH banding.
+
+A CV's signature is the minimum of NUM_PERM random hash functions over its
+word 3-grams; the share of equal positions between two signatures estimates
+the Jaccard similarity of their 3-gram sets. Signatures are cut into bands and
+CVs sharing any whole band become candidates, so a lookup only compares
+against a handful of CVs instead of all of them.
+"""
+
+import threading
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+# 16 bands of 8 rows: pairs above ~0.7 similarity almost always share a band
+BANDS = 16
+
+class MinHasher:
+    """Computes MinHash signatures; the seed fixes the hash functions."""
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # Multiply-shift hash functions: h(x) = ((a * x + b) mod 2^64) >> 32 with a odd
+        self._a = (rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) << np.uint64(1) | np.uint64(1))[:, None]
+        self._b = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)[:, None] << np.uint64(1)
+
+    def signature(self, text: str) -> np.ndarray:
+        """uint32 signature of the text's word shingles (all 0xFFFFFFFF for an empty text)."""
+        words = text.lower().split()
+        size = min(self.shingle_size, len(words)) or 1
+        shingles = {' '.join(words[i:i + size]) for i in range(max(len(words) - size + 1, 0))}
+        if not shingles:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # Every hash function applied to every shingle in one (num_perm, n_shingles) array;
+        # uint64 arithmetic wraps, which is the mod 2^64
+        permuted = (self._a * hashes[None, :] + self._b) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(signature == other))
+
+def from_bytes(data: bytes) -> np.ndarray:
+    """Signature stored with ndarray.tobytes()."""
+    return np.frombuffer(data, dtype=np.uint32)
+
+class NearDuplicateIndex:
+    """LSH index of CV signatures, each tagged with its owner (user id)."""
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._owners: Dict[int, int] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def ensure_loaded(self, load: Callable[[], Iterable[Tuple[int, int, np.ndarray]]]):
+        """Fill the index from load() (cv_id, owner, signature) the first time it is needed."""
+        with self._lock:
+            if not self._loaded:
+                for cv_id, owner, signature in load():
+                    self.add(cv_id, owner, signature)
+                self._loaded = True
+
+    def add(self, cv_id: int, owner: int, signature: np.ndarray):
+        """Add a CV, replacing its previous signature."""
+        with self._lock:
+            self.remove(cv_id)
+            self._signatures[cv_id] = signature
+            self._owners[cv_id] = owner
+            for buckets, band in zip(self._buckets, self._bands(signature)):
+                buckets.setdefault(band, set()).add(cv_id)
+
+    def remove(self, cv_id: int):
+        with self._lock:
+            signature = self._signatures.pop(cv_id, None)
+            if signature is None:
+                return
+            del self._owners[cv_id]
+            for buckets, band in zip(self._buckets, self._bands(signature)):
+                bucket = buckets.get(band)
+                bucket.discard(cv_id)
+                if not bucket:
+                    del buckets[band]
+
+    def query(self, signature: np.ndarray, threshold: float, owner: Optional[int] = None,
+              exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """CVs at least threshold similar to the signature, most similar first.
+
+        With owner, only that user's CVs are returned.
+        """
+        with self._lock:
+            candidates = set()
+            for buckets, band in zip(self._buckets, self._bands(signature)):
+                candidates |= buckets.get(band, set())
+            candidates.discard(exclude)
+            if owner is not None:
+                candidates = {cv_id for cv_id in candidates if self._owners[cv_id] == owner}
+            if not candidates:
+                return []
+
+            ids = list(candidates)
+            scores = np.mean(np.stack([self._signatures[cv_id] for cv_id in ids]) == signature, axis=1)
+            matches = [(cv_id, round(float(score), 4)) for cv_id, score in zip(ids, scores) if score >= threshold]
+            return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def clusters(self, threshold: float) -> List[Dict[str, object]]:
+        """Groups of CVs linked by pairs at least threshold similar, largest first.
+
+        Only pairs sharing an LSH band are compared. Each cluster has its
+        cv_ids and the lowest similarity among the pairs linking it.
+        """
+        with self._lock:
+            edges: Dict[Tuple[int, int], float] = {}
+            for buckets in self._buckets:
+                for bucket in buckets.values():
+                    if len(bucket) < 2:
+                        continue
+                    ids = sorted(bucket)
+                    signatures = np.stack([self._signatures[cv_id] for cv_id in ids])
+                    scores = np.mean(signatures[:, None, :] == signatures[None, :, :], axis=2)
+                    for i, j in zip(*np.nonzero(np.triu(scores >= threshold, k=1))):
+                        edges[(ids[i], ids[j])] = float(scores[i, j])
+
+            parent: Dict[int, int] = {}
+
+            def find(cv_id: int) -> int:
+                while parent.setdefault(cv_id, cv_id) != cv_id:
+                    parent[cv_id] = parent[parent[cv_id]]
+                    cv_id = parent[cv_id]
+                return cv_id
+
+            for first, second in edges:
+                parent[find(second)] = find(first)
+
+            groups: Dict[int, List[int]] = {}
+            for cv_id in parent:
+                groups.setdefault(find(cv_id), []).append(cv_id)
+            lowest: Dict[int, float] = {}
+            for (first, _), score in edges.items():
+                root = find(first)
+                lowest[root] = min(lowest.get(root, 1.0), score)
+
+            clusters = [
+                {'cv_ids': sorted(ids), 'min_similarity': round(lowest[root], 4)}
+                for root, ids in groups.items()
+            ]
+            return sorted(clusters, key=lambda cluster: (-len(cluster['cv_ids']), cluster['cv_ids'][0]))
+
+    def _bands(self, signature: np.ndarray) -> List[bytes]:
+        rows = len(signature) // self.bands
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
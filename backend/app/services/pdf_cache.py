@@ -0,0 +1,130 @@
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import func
+from backend.app.models.base import increment
+from backend.app.models.cv import CV as CVModel
+from backend.app.models.pdf_blob import PDFBlob
+from backend.app.services.pdf_generator import PDFGenerator
+
+logger = logging.getLogger(__name__)
+
+class PDFCache:
+    """Content-addressed store of rendered PDFs in the generator's storage directory.
+
+    Files are named by PDFGenerator.cv_pdf_filename, so a PDF is rendered
+    once per distinct content and shared by every CV that renders the same.
+    pdf_blobs counts the CVs pointing to each file; files no CV points to
+    are kept for idle_ttl seconds after their last use, and the least
+    recently used of them go first once they take more than
+    max_unreferenced_bytes. With PDF storage disabled nothing is cached.
+    """
+
+    def __init__(self, generator: PDFGenerator, idle_ttl: int = 24 * 3600,
+                 max_unreferenced_bytes: int = 100 * 1024 * 1024):
+        self.generator = generator
+        self.idle_ttl = idle_ttl
+        self.max_unreferenced_bytes = max_unreferenced_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.generator.storage_path)
+
+    def touch(self, db, filename: str) -> bool:
+        """Whether filename is stored, marking it as used."""
+        if not self.enabled or not os.path.exists(self.generator.get_pdf_path(filename)):
+            return False
+        touched = db.query(PDFBlob).filter(PDFBlob.filename == filename).update(
+            {PDFBlob.last_used_at: datetime.utcnow()}, synchronize_session=False
+        )
+        db.commit()
+        return bool(touched)
+
+    def get(self, db, filename: str) -> Optional[bytes]:
+        """The stored PDF, or None if it has to be rendered."""
+        if not self.touch(db, filename):
+            return None
+        try:
+            with open(self.generator.get_pdf_path(filename), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            # Evicted since it was touched
+            return None
+
+    def put(self, db, filename: str, pdf: bytes):
+        """Store a rendered PDF, then evict what no longer fits."""
+        if not self.enabled:
+            return
+        self.generator.save_pdf(filename, pdf)
+        now = datetime.utcnow()
+        # Upsert, so concurrent first renders of the same content do not collide; a CV may
+        # already reference the file (it was evicted or lost), so any count is kept
+        increment(db, PDFBlob.__table__, ('filename',), 'refcount',
+                  [{'filename': filename, 'refcount': 0, 'size': len(pdf), 'last_used_at': now}])
+        db.query(PDFBlob).filter(PDFBlob.filename == filename).update(
+            {PDFBlob.size: len(pdf), PDFBlob.last_used_at: now}, synchronize_session=False
+        )
+        db.commit()
+        self.evict(db)
+
+    def evict(self, db) -> int:
+        """Delete unreferenced files idle for idle_ttl, or the oldest while they exceed the size cap."""
+        if not self.enabled:
+            return 0
+        unreferenced = db.query(PDFBlob.filename, PDFBlob.size, PDFBlob.last_used_at).filter(
+            PDFBlob.refcount <= 0
+        ).order_by(PDFBlob.last_used_at).all()
+        db.rollback()
+        cutoff = datetime.utcnow() - timedelta(seconds=self.idle_ttl)
+        total = sum(row.size or 0 for row in unreferenced)
+
+        evicted = 0
+        for row in unreferenced:
+            if row.last_used_at >= cutoff and total <= self.max_unreferenced_bytes:
+                break
+            # Skipped if a CV started pointing to it or it was used since it was read
+            deleted = db.query(PDFBlob).filter(
+                PDFBlob.filename == row.filename,
+                PDFBlob.refcount <= 0,
+                PDFBlob.last_used_at == row.last_used_at
+            ).delete(synchronize_session=False)
+            db.commit()
+            if deleted:
+                self.generator.delete_pdf(row.filename)
+                total -= row.size or 0
+                evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} unreferenced PDFs")
+        return evicted
+
+    def sync(self, db) -> int:
+        """Recount the references from the CVs and register untracked files; returns the rows fixed.
+
+        Covers PDFs saved before the store existed and any count left off by
+        writes that bypass the ORM.
+        """
+        if not self.enabled:
+            return 0
+        references = Counter(dict(db.query(CVModel.pdf_path, func.count(CVModel.id)).filter(
+            CVModel.pdf_path.isnot(None)
+        ).group_by(CVModel.pdf_path).all()))
+        blobs = {blob.filename: blob for blob in db.query(PDFBlob).all()}
+        files = {name for name in os.listdir(self.generator.storage_path) if name.endswith('.pdf')}
+
+        fixed = 0
+        for filename in files | set(references) | set(blobs):
+            blob = blobs.get(filename)
+            if blob is None:
+                path = self.generator.get_pdf_path(filename)
+                blob = PDFBlob(filename=filename, refcount=0,
+                               size=os.path.getsize(path) if filename in files else None)
+                db.add(blob)
+            if blob.refcount != references[filename]:
+                blob.refcount = references[filename]
+                fixed += 1
+            elif filename not in blobs:
+                fixed += 1
+        db.commit()
+        return fixed
@@ -4,17 +4,29 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+import hashlib
+import json
 import os
+import tempfile
 from datetime import datetime
-from typing import Dict, Any
+from io import BytesIO
+from typing import Dict, Any, Optional
 import logging
+from backend.app.services.cv_sections import detect_field, detect_section
 
 logger = logging.getLogger(__name__)
 
+# Template of the CV PDFs; bump the version when their layout changes so stored PDFs are rendered again
+CV_TEMPLATE_ID = "cv"
+CV_TEMPLATE_VERSION = "2"
+
 class PDFGenerator:
-    def __init__(self, storage_path: str = "./storage/pdfs"):
-        self.storage_path = storage_path
-        os.makedirs(storage_path, exist_ok=True)
+    def __init__(self, storage_path: Optional[str] = "./storage/pdfs"):
+        # PDFs are rendered in memory; storage_path (None or '' disables it) is
+        # only used by the methods that also save them to disk
+        self.storage_path = storage_path or None
+        if self.storage_path:
+            os.makedirs(self.storage_path, exist_ok=True)
         
         # Setup styles
         self.styles = getSampleStyleSheet()
@@ -65,23 +77,26 @@ class PDFGenerator:
         ))
 
     def generate_cv_pdf(self, cv_data: Dict[str, Any], user_data: Dict[str, Any]) -> str:
-        """Generate PDF from CV data."""
+        """Generate PDF from CV data and save it, unless already saved; returns the file name."""
+        filename = self.cv_pdf_filename(cv_data, user_data)
+        if not os.path.exists(self.get_pdf_path(filename)):
+            self.save_pdf(filename, self.render_cv_pdf(cv_data, user_data))
+        return filename
+
+    def cv_pdf_filename(self, cv_data: Dict[str, Any], user_data: Dict[str, Any]) -> str:
+        """File name a CV's PDF is saved under: a hash of everything it is rendered from."""
+        content = json.dumps([
+            CV_TEMPLATE_ID,
+            CV_TEMPLATE_VERSION,
+            cv_data.get('original_text', ''),
+            user_data.get('full_name'),
+            user_data.get('email')
+        ], ensure_ascii=False)
+        return f"{hashlib.sha256(content.encode('utf-8')).hexdigest()}.pdf"
+
+    def render_cv_pdf(self, cv_data: Dict[str, Any], user_data: Dict[str, Any]) -> bytes:
+        """Render the CV's PDF in memory."""
         try:
-            # Create filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"cv_{user_data.get('username', 'user')}_{timestamp}.pdf"
-            filepath = os.path.join(self.storage_path, filename)
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(
-                filepath,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18
-            )
-            
             # Build content
             story = []
             
@@ -124,21 +139,44 @@ class PDFGenerator:
                 story.append(Paragraph("Informações Adicionais", self.styles['SectionHeader']))
                 story.append(Paragraph(cv_sections['outros'], self.styles['ExperienceItem']))
             
-            # Add footer with generation info
+            # Add footer; no generation date, since a stored PDF is served again while its content is unchanged
             story.append(Spacer(1, 30))
-            footer_text = f"CV gerado em {datetime.now().strftime('%d/%m/%Y às %H:%M')} | CV Maker Inteligente"
+            footer_text = "CV gerado com CV Maker Inteligente"
             story.append(Paragraph(footer_text, self.styles['Normal']))
             
             # Build PDF
-            doc.build(story)
+            pdf = self._build(story, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
             
-            logger.info(f"PDF generated successfully: {filepath}")
-            return filename
+            logger.info(f"PDF rendered successfully ({len(pdf)} bytes)")
+            return pdf
             
         except Exception as e:
             logger.error(f"Error generating PDF: {str(e)}")
             raise
 
+    def save_pdf(self, filename: str, pdf: bytes) -> str:
+        """Write a rendered PDF to the storage directory; returns the file name."""
+        if not self.storage_path:
+            raise RuntimeError("PDF storage is disabled")
+        filepath = self.get_pdf_path(filename)
+        # Written aside and renamed, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.storage_path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.info(f"PDF saved: {filepath}")
+        return filename
+
+    def _build(self, story, **layout) -> bytes:
+        """Lay out a story on A4 pages into an in-memory PDF."""
+        buffer = BytesIO()
+        SimpleDocTemplate(buffer, pagesize=A4, **layout).build(story)
+        return buffer.getvalue()
+
     def _parse_cv_text(self, cv_text: str) -> Dict[str, Any]:
         """Parse CV text into structured sections."""
         sections = {}
@@ -153,29 +191,12 @@ class PDFGenerator:
             
             # Detect section headers
             line_lower = line.lower()
-            if any(keyword in line_lower for keyword in ['nome:', 'name:']):
-                sections['name'] = line.split(':', 1)[1].strip() if ':' in line else line
-            elif any(keyword in line_lower for keyword in ['email:', 'e-mail:']):
-                sections['email'] = line.split(':', 1)[1].strip() if ':' in line else line
-            elif any(keyword in line_lower for keyword in ['telefone:', 'telemóvel:', 'phone:']):
-                sections['telefone'] = line.split(':', 1)[1].strip() if ':' in line else line
-            elif any(keyword in line_lower for keyword in ['objetivo', 'objectivo', 'summary', 'resumo']):
-                current_section = 'objetivo'
-                sections[current_section] = []
-            elif any(keyword in line_lower for keyword in ['experiência', 'experiencia', 'experience', 'trabalho']):
-                current_section = 'experiencia'
-                sections[current_section] = []
-            elif any(keyword in line_lower for keyword in ['educação', 'educacao', 'education', 'formação', 'formacao']):
-                current_section = 'educacao'
-                sections[current_section] = []
-            elif any(keyword in line_lower for keyword in ['competências', 'competencias', 'skills', 'habilidades']):
-                current_section = 'competencias'
-                sections[current_section] = []
-            elif any(keyword in line_lower for keyword in ['projetos', 'projects', 'projectos']):
-                current_section = 'projetos'
-                sections[current_section] = []
-            elif any(keyword in line_lower for keyword in ['idiomas', 'languages', 'línguas', 'linguas']):
-                current_section = 'idiomas'
+            field = detect_field(line_lower)
+            section = detect_section(line_lower) if not field else None
+            if field:
+                sections[field] = line.split(':', 1)[1].strip() if ':' in line else line
+            elif section:
+                current_section = section
                 sections[current_section] = []
             else:
                 # Add content to current section
@@ -222,13 +243,13 @@ class PDFGenerator:
         return titles.get(section_key, section_key.title())
 
     def generate_analysis_report(self, cv_data: Dict[str, Any], analysis_result: Dict[str, Any]) -> str:
-        """Generate PDF report with CV analysis and suggestions."""
+        """Generate PDF report with CV analysis and suggestions and save it; returns the file name."""
+        filename = f"analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return self.save_pdf(filename, self.render_analysis_report(cv_data, analysis_result))
+
+    def render_analysis_report(self, cv_data: Dict[str, Any], analysis_result: Dict[str, Any]) -> bytes:
+        """Render the analysis report PDF in memory."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"analysis_report_{timestamp}.pdf"
-            filepath = os.path.join(self.storage_path, filename)
-            
-            doc = SimpleDocTemplate(filepath, pagesize=A4)
             story = []
             
             # Title
@@ -273,9 +294,9 @@ class PDFGenerator:
                 keywords_text = ', '.join(keywords[:15])  # Show first 15 keywords
                 story.append(Paragraph(keywords_text, self.styles['Normal']))
             
-            doc.build(story)
-            logger.info(f"Analysis report generated: {filepath}")
-            return filename
+            pdf = self._build(story)
+            logger.info(f"Analysis report rendered ({len(pdf)} bytes)")
+            return pdf
             
         except Exception as e:
             logger.error(f"Error generating analysis report: {str(e)}")
@@ -283,10 +304,12 @@ class PDFGenerator:
 
     def get_pdf_path(self, filename: str) -> str:
         """Get full path to PDF file."""
-        return os.path.join(self.storage_path, filename)
+        return os.path.join(self.storage_path or '', filename)
 
     def delete_pdf(self, filename: str) -> bool:
         """Delete PDF file."""
+        if not self.storage_path:
+            return False
         try:
             filepath = self.get_pdf_path(filename)
             if os.path.exists(filepath):
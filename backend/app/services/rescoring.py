@@ -0,0 +1,263 @@
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, func, or_
+from backend.app.models.cv import CV as CVModel
+from backend.app.models.rescoring_run import RescoringRun
+from backend.app.models.score_histogram import add_counts
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.cv_index import CVMatchIndexes
+from backend.app.services.tasks import get_analyzer, get_doc_store
+from backend.app.utils.logger import get_logger
+
+logger = logging.getLogger(__name__)
+activity_logger = get_logger()
+
+# Result fields written back to each CV; apply_analysis clears the ones a mode does not produce
+RESULT_FIELDS = ('analyzed_text', 'suggestions', 'analysis_score', 'keywords', 'rules_version')
+
+class CVRescorer:
+    """Background re-analysis of the CVs whose stored results come from older rules.
+
+    CVs are walked in id order, batch_size at a time. Each batch goes through
+    the analyzer's batch path and is written back with one bulk UPDATE, in
+    the same transaction as the run's checkpoint (rescoring_runs.last_cv_id),
+    so a run interrupted by a crash or a restart resumes after the last
+    saved batch. After each batch the thread sleeps until its CPU time is at
+    most cpu_fraction of the time elapsed, leaving the rest to live traffic.
+    """
+
+    def __init__(self, session_factory: Callable, analysis_cache: Optional[AnalysisCache] = None,
+                 match_indexes: Optional[CVMatchIndexes] = None, batch_size: int = 50,
+                 cpu_fraction: float = 0.25, stale_after: int = 600, nlp_batch_size: int = 32):
+        if not 0 < cpu_fraction <= 1:
+            raise ValueError("cpu_fraction must be in (0, 1]")
+        self.session_factory = session_factory
+        self.analysis_cache = analysis_cache
+        self.match_indexes = match_indexes
+        self.batch_size = batch_size
+        self.cpu_fraction = cpu_fraction
+        self.stale_after = stale_after
+        self.nlp_batch_size = nlp_batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._run_id: Optional[int] = None
+        self._stop = threading.Event()
+
+    def start(self, resume_only: bool = False) -> Optional[int]:
+        """Re-score the stale CVs in a background thread; returns the run's id.
+
+        An interrupted run is resumed first. Otherwise a new run is started
+        when some CV was analyzed with other rules (unless resume_only), and
+        None is returned when there is nothing to do. A run still active in
+        another process is left to it.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self._run_id
+        run_id, claimed = self.claim(resume_only)
+        if claimed:
+            self._stop.clear()
+            self._run_id = run_id
+            self._thread = threading.Thread(target=self.run, args=(run_id,), name="cv-rescoring", daemon=True)
+            self._thread.start()
+            logger.info(f"CV re-scoring run {run_id} started")
+        return run_id
+
+    def stop(self, timeout: float = 10.0):
+        """Stop after the current batch, releasing the run so the next start resumes it at once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._run_id is not None:
+            db = self.session_factory()
+            try:
+                db.query(RescoringRun).filter(
+                    RescoringRun.id == self._run_id,
+                    RescoringRun.status == "running"
+                ).update({RescoringRun.updated_at: None}, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+            self._run_id = None
+
+    def claim(self, resume_only: bool = False) -> Tuple[Optional[int], bool]:
+        """The run to work on and whether this caller now owns it.
+
+        A running run is owned by whoever last checkpointed it until it goes
+        stale_after seconds without a checkpoint (or was released by stop()).
+        """
+        db = self.session_factory()
+        try:
+            active = db.query(RescoringRun).filter(
+                RescoringRun.status == "running"
+            ).order_by(RescoringRun.id.desc()).first()
+            if active is not None:
+                cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+                claimed = db.query(RescoringRun).filter(
+                    RescoringRun.id == active.id,
+                    RescoringRun.status == "running",
+                    or_(RescoringRun.updated_at.is_(None), RescoringRun.updated_at < cutoff)
+                ).update({RescoringRun.updated_at: datetime.utcnow()}, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    logger.warning(f"Resuming CV re-scoring run {active.id} after CV {active.last_cv_id}")
+                return active.id, bool(claimed)
+
+            version = get_analyzer().rules_version
+            if resume_only or self._stale(db, version).first() is None:
+                return None, False
+            run = RescoringRun(rules_version=version)
+            db.add(run)
+            db.commit()
+            return run.id, True
+        finally:
+            db.close()
+
+    def run(self, run_id: int):
+        """Re-score batches of a claimed run until no stale CV is left or stop() is called."""
+        db = self.session_factory()
+        try:
+            while not self._stop.is_set():
+                cpu_start, wall_start = time.thread_time(), time.monotonic()
+                if not self._run_batch(db, run_id):
+                    break
+                cpu = time.thread_time() - cpu_start
+                wall = time.monotonic() - wall_start
+                self._stop.wait(max(0.0, cpu / self.cpu_fraction - wall))
+        except Exception as e:
+            db.rollback()
+            db.query(RescoringRun).filter(RescoringRun.id == run_id).update({
+                RescoringRun.status: "failed",
+                RescoringRun.error_message: str(e),
+                RescoringRun.finished_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            activity_logger.log_error(error_message=f"CV re-scoring run {run_id} failed: {str(e)}")
+        finally:
+            db.close()
+
+    def status(self, db) -> Optional[Dict[str, Any]]:
+        """Progress of the latest run and how many CVs are still stale, or None if no run exists."""
+        run = db.query(RescoringRun).order_by(RescoringRun.id.desc()).first()
+        if run is None:
+            return None
+        return {
+            "run_id": run.id,
+            "rules_version": run.rules_version,
+            "status": run.status,
+            "last_cv_id": run.last_cv_id,
+            "rescored": run.rescored,
+            "stale_cvs": self._stale(db, get_analyzer().rules_version).count(),
+            "error_message": run.error_message,
+            "started_at": run.started_at,
+            "updated_at": run.updated_at,
+            "finished_at": run.finished_at
+        }
+
+    def _stale(self, db, version: str):
+        """Analyzed CVs whose results come from other rules than version."""
+        return db.query(CVModel).filter(
+            CVModel.analysis_score.isnot(None),
+            or_(CVModel.rules_version.is_(None), CVModel.rules_version != version)
+        )
+
+    def _run_batch(self, db, run_id: int) -> bool:
+        """Re-score the next batch and checkpoint it. False once the run is done."""
+        run = db.get(RescoringRun, run_id)
+        analyzer = get_analyzer()
+        if run.rules_version != analyzer.rules_version:
+            # The rules changed again mid-run, so the CVs already done are stale too
+            logger.info(f"Rules moved to version {analyzer.rules_version}; re-scoring run {run_id} starts over")
+            run.rules_version, run.last_cv_id = analyzer.rules_version, 0
+            db.commit()
+
+        rows = self._stale(db, run.rules_version).filter(CVModel.id > run.last_cv_id).with_entities(
+            CVModel.id, CVModel.user_id, CVModel.original_text, CVModel.sector, CVModel.inferred_sector,
+            CVModel.analysis_mode, CVModel.histogram_sector, CVModel.histogram_score, CVModel.updated_at
+        ).order_by(CVModel.id).limit(self.batch_size).all()
+        if not rows:
+            run.status = "done"
+            run.updated_at = run.finished_at = datetime.utcnow()
+            db.commit()
+            logger.info(f"CV re-scoring run {run_id} done: {run.rescored} CVs on rules version {run.rules_version}")
+            return False
+        # Do not hold the DB connection while the batch is analyzed
+        db.rollback()
+
+        results = self._analyze(analyzer, rows)
+        written_at = datetime.utcnow()
+        updates, deltas = [], Counter()
+        for row, result in zip(rows, results):
+            bucket = (row.sector or row.inferred_sector or '', result['analysis_score'])
+            if row.histogram_sector is not None:
+                deltas[(row.histogram_sector, row.histogram_score)] -= 1
+            deltas[bucket] += 1
+            updates.append({
+                '_id': row.id,
+                '_updated_at': row.updated_at,
+                **{field: result.get(field) for field in RESULT_FIELDS},
+                'histogram_sector': bucket[0],
+                'histogram_score': bucket[1],
+                'updated_at': written_at
+            })
+
+        # A CV saved since it was read (edited or analyzed live) is skipped, and then the whole
+        # batch is retried, so its histogram counts are never moved twice
+        cvs = CVModel.__table__
+        db.execute(cvs.update().where(
+            cvs.c.id == bindparam('_id'),
+            cvs.c.updated_at.is_not_distinct_from(bindparam('_updated_at'))
+        ), updates)
+        written = db.query(func.count(CVModel.id)).filter(
+            CVModel.id.in_([row.id for row in rows]),
+            CVModel.updated_at == written_at
+        ).scalar()
+        if written != len(rows):
+            db.rollback()
+            logger.debug(f"Re-scoring batch after CV {run.last_cv_id} raced with live updates; retrying")
+            return True
+
+        add_counts(db, deltas)
+        run = db.get(RescoringRun, run_id)
+        run.last_cv_id = rows[-1].id
+        run.rescored += len(rows)
+        run.updated_at = written_at
+        db.commit()
+
+        for row, result in zip(rows, results):
+            self._publish(analyzer, row, result)
+        return True
+
+    def _analyze(self, analyzer, rows) -> List[Dict[str, Any]]:
+        """Results for a batch, each CV in the mode it was last analyzed with."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        full = [i for i, row in enumerate(rows) if row.analysis_mode in (None, 'full')]
+        doc_store = get_doc_store()
+        batch = analyzer.analyze_many(
+            [rows[i].original_text for i in full],
+            [rows[i].sector or rows[i].inferred_sector for i in full],
+            batch_size=self.nlp_batch_size,
+            cv_ids=[rows[i].id for i in full] if doc_store is not None else None,
+            doc_store=doc_store
+        )
+        for i, result in zip(full, batch):
+            results[i] = result
+        for i, row in enumerate(rows):
+            if results[i] is None:
+                results[i] = analyzer.analyze_cv(row.original_text, row.sector or row.inferred_sector,
+                                                 mode=row.analysis_mode)
+        return results
+
+    def _publish(self, analyzer, row, result: Dict[str, Any]):
+        """Share a new result with the analysis cache and the user's match index."""
+        mode = row.analysis_mode or 'full'
+        if self.analysis_cache is not None and (analyzer.nlp or mode == 'fast'):
+            sector = row.sector or row.inferred_sector
+            self.analysis_cache.set(
+                self.analysis_cache.make_key(row.original_text, sector, result['rules_version'], mode), result
+            )
+        if self.match_indexes is not None:
+            self.match_indexes.update(row.user_id, row.id, row.original_text, result.get('keywords'))
@@ -0,0 +1,345 @@
+"""
+Data-driven CV rules shared by the backend analyzer and the Streamlit app.
+
+Lexicons, regexes, score weights and suggestion texts are read from a rules
+file (config/cv_rules.json by default) and compiled once per RuleEngine. A
+RuleReloader picks up new versions of the file while the process runs. The
+module only uses the standard library so streamlit_app.py can import it
+without the backend's dependencies.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'config', 'cv_rules.json'
+))
+
+# Words, keeping inner dots and hyphens so "node.js" or "e-commerce" stay one token
+TOKEN_PATTERN = re.compile(r'\w+(?:[.\-]\w+)*')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens used for sector keyword matching."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+class RuleEngine:
+    """Compiled CV rules: term matching, features, score and suggestions."""
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.version = str(rules['version'])
+        self.action_verbs: Dict[str, List[str]] = rules['action_verbs']
+        self.weak_words: Dict[str, List[str]] = rules['weak_words']
+        self.sector_keywords: Dict[str, List[str]] = rules['sector_keywords']
+        self.replacements: Dict[str, str] = rules['replacements']
+        self.scoring: Dict[str, Any] = rules['scoring']
+        self.suggestion_rules: List[Dict[str, Any]] = rules['suggestions']
+
+        patterns = rules['patterns']
+        self.number_pattern = re.compile(patterns['number'])
+        self.email_pattern = re.compile(patterns['email'])
+        self.phone_pattern = re.compile(patterns['phone'])
+
+        # Every action verb and weak phrase goes into one trie-shaped regex so
+        # the text is scanned a single time per analysis. Each lexicon language
+        # also gets its own, smaller regex for CVs whose language is known.
+        self.languages = list(dict.fromkeys(list(self.action_verbs) + list(self.weak_words)))
+        self.term_pattern = self._build_term_pattern(self.languages)
+        self._term_patterns = {language: self._build_term_pattern([language]) for language in self.languages}
+        self._action_verb_weights = self._term_weights(self.action_verbs)
+        self._weak_word_weights = self._term_weights(self.weak_words)
+        self._keyword_index = self._build_keyword_index()
+        # All weak phrases of the rewrite in one case-insensitive regex, whole words only
+        self._replacement_lookup = {weak.lower(): strong for weak, strong in self.replacements.items()}
+        self._replacement_pattern = re.compile(
+            r'\b(?:' + self._trie_regex(self._replacement_lookup) + r')\b', re.IGNORECASE
+        ) if self.replacements else None
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> 'RuleEngine':
+        """Load and compile a rules file."""
+        with open(path or DEFAULT_RULES_PATH, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def match_terms(self, text: str, language: Optional[str] = None) -> Counter:
+        """Count every action verb and weak phrase in one pass over the text.
+
+        With a lexicon language only that language's terms are matched;
+        otherwise (None or a language without lexicons) all of them are.
+        """
+        return Counter(self._term_patterns.get(language, self.term_pattern).findall(text.lower()))
+
+    def count_action_verbs(self, term_counts: Counter, language: Optional[str] = None) -> int:
+        weights = self._action_verb_weights.get(language, self._action_verb_weights[None])
+        return sum(count * weights[term] for term, count in term_counts.items() if term in weights)
+
+    def count_weak_words(self, term_counts: Counter, language: Optional[str] = None) -> int:
+        weights = self._weak_word_weights.get(language, self._weak_word_weights[None])
+        return sum(count * weights[term] for term, count in term_counts.items() if term in weights)
+
+    def match_sector_keywords(self, text: str) -> Dict[str, List[str]]:
+        """Keywords of every sector that occur in the text, found in one pass over its tokens.
+
+        Keywords match whole tokens (a phrase matches a run of tokens), so
+        "sem" is not found inside "semana". Each sector's keywords are listed
+        in rules file order.
+        """
+        tokens = tokenize(text)
+        found = set()
+        for i, token in enumerate(tokens):
+            for rest, entries in self._keyword_index.get(token, ()):
+                if not rest or tuple(tokens[i + 1:i + 1 + len(rest)]) == rest:
+                    found.update(entries)
+        
+        matches: Dict[str, List[str]] = {}
+        for sector, position, word in sorted(found):
+            matches.setdefault(sector, []).append(word)
+        return matches
+
+    def sector_keywords_found(self, text: str, sector: Optional[str]) -> List[str]:
+        """Keywords of the sector that occur in the text."""
+        if not sector or sector not in self.sector_keywords:
+            return []
+        return self.match_sector_keywords(text).get(sector, [])
+
+    def features(self, text: str, word_count: Optional[int] = None,
+                 term_counts: Optional[Counter] = None, language: Optional[str] = None) -> Dict[str, Any]:
+        """Counts and flags the score and suggestions are computed from.
+
+        word_count defaults to a whitespace split; the backend passes spaCy's token count.
+        language restricts action verbs and weak words to that language's lexicons.
+        """
+        text_lower = text.lower()
+        if term_counts is None:
+            term_counts = Counter(self._term_patterns.get(language, self.term_pattern).findall(text_lower))
+
+        return {
+            'action_verbs': self.count_action_verbs(term_counts, language),
+            'weak_words': self.count_weak_words(term_counts, language),
+            'numbers': len(self.number_pattern.findall(text_lower)),
+            'has_email': self.email_pattern.search(text) is not None,
+            'has_phone': self.phone_pattern.search(text) is not None,
+            'word_count': len(text.split()) if word_count is None else word_count
+        }
+
+    def score(self, features: Dict[str, Any]) -> int:
+        """CV quality score (0-100)."""
+        scoring = self.scoring
+        score = scoring['base']
+
+        for rule in scoring['counts']:
+            points = features[rule['feature']] * rule['points']
+            cap = rule['cap']
+            score += max(points, cap) if cap < 0 else min(points, cap)
+
+        # First matching length band wins
+        word_count = features['word_count']
+        for band in scoring['length']:
+            if band.get('min', word_count) <= word_count <= band.get('max', word_count):
+                score += band['points']
+                break
+
+        for rule in scoring['flags']:
+            if features[rule['feature']]:
+                score += rule['points']
+
+        return max(scoring['min'], min(scoring['max'], score))
+
+    def suggestions(self, features: Dict[str, Any], text: str, sector: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Improvement suggestions whose conditions hold for these features."""
+        values = dict(features)
+        context = {'sector': sector}
+        if sector and sector in self.sector_keywords:
+            values['sector_keywords'] = len(self.sector_keywords_found(text, sector))
+            context['sector_examples'] = ', '.join(self.sector_keywords[sector][:5])
+
+        suggestions = []
+        for rule in self.suggestion_rules:
+            condition = rule['when']
+            value = values.get(condition['feature'])
+            if value is None:
+                continue
+            if 'below' in condition and not value < condition['below']:
+                continue
+            if 'above' in condition and not value > condition['above']:
+                continue
+            suggestions.append({
+                'type': rule['type'],
+                'priority': rule['priority'],
+                'title': rule['title'].format(**context),
+                'description': rule['description'].format(**context),
+                'examples': [example.format(**context) for example in rule['examples']]
+            })
+        return suggestions
+
+    def rewrite(self, text: str) -> str:
+        """Replace weak phrases with stronger alternatives in a single pass over the text.
+
+        Phrases only match whole words, so "trabalhei em" is not rewritten
+        inside "retrabalhei em". Where phrases overlap the longest one wins.
+        """
+        if self._replacement_pattern is None:
+            return text
+        lookup = self._replacement_lookup
+        return self._replacement_pattern.sub(lambda match: lookup[match.group().lower()], text)
+
+    def analyze(self, text: str, sector: Optional[str] = None, word_count: Optional[int] = None,
+                language: Optional[str] = None) -> Dict[str, Any]:
+        """Score, suggestions and word count from the rules alone."""
+        features = self.features(text, word_count, language=language)
+        return {
+            'analysis_score': self.score(features),
+            'suggestions': self.suggestions(features, text, sector),
+            'word_count': features['word_count']
+        }
+
+    def _build_keyword_index(self) -> Dict[str, List]:
+        """Map each keyword's first token to (remaining tokens, [(sector, position, keyword)]).
+
+        Lookups cost the same however many keywords a sector has, since only
+        the keywords starting with the current token are checked.
+        """
+        phrases: Dict[tuple, List] = {}
+        for sector, words in self.sector_keywords.items():
+            for position, word in enumerate(words):
+                tokens = tuple(tokenize(word))
+                if tokens:
+                    phrases.setdefault(tokens, []).append((sector, position, word))
+        
+        index: Dict[str, List] = {}
+        for tokens, entries in phrases.items():
+            index.setdefault(tokens[0], []).append((tokens[1:], entries))
+        return index
+
+    def _term_weights(self, lexicon: Dict[str, List[str]]) -> Dict[Optional[str], Counter]:
+        """Occurrences of each term in a lexicon's lists, per language and for all of them (None)."""
+        weights: Dict[Optional[str], Counter] = {language: Counter(terms) for language, terms in lexicon.items()}
+        weights[None] = sum(weights.values(), Counter())
+        return weights
+
+    def _build_term_pattern(self, languages: List[str]):
+        """Compile the action verbs and weak phrases of some languages into a single regex.
+
+        The terms are laid out as a prefix trie, so the regex engine picks a
+        branch by its first letters instead of trying every term at each word
+        boundary. Longer terms are tried before their prefixes, so multi-word
+        phrases win.
+        """
+        terms = [term for language in languages
+                 for term in self.action_verbs.get(language, []) + self.weak_words.get(language, [])]
+        return re.compile(r'\b(?:' + self._trie_regex(terms) + r')\b')
+
+    def _trie_regex(self, terms) -> str:
+        """Regex matching any of the terms, lowercased and laid out as a prefix trie."""
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term.lower():
+                node = node.setdefault(char, {})
+            node[''] = {}
+        return self._trie_pattern(trie)
+
+    def _trie_pattern(self, node: Dict[str, Dict]) -> str:
+        """Regex for a trie node; the end-of-term marker '' is tried last."""
+        branches = [re.escape(char) + self._trie_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+        if '' in node:
+            if not branches:
+                return ''
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+_engines: Dict[str, RuleEngine] = {}
+_lock = threading.Lock()
+
+def get_rule_engine(path: Optional[str] = None) -> RuleEngine:
+    """Return the compiled rules for a rules file, compiling them on first use.
+
+    Once a RuleReloader swaps in a new version of the file, that version is returned.
+    """
+    path = path or DEFAULT_RULES_PATH
+    if path not in _engines:
+        with _lock:
+            if path not in _engines:
+                _engines[path] = RuleEngine.from_file(path)
+    return _engines[path]
+
+class RuleReloader:
+    """Keeps the rules of a file current without restarting the process.
+
+    current() returns the active RuleEngine and, at most every check_interval
+    seconds (never when it is 0), looks at the file's modification time. A
+    changed file is compiled on a background thread and swapped in with a
+    single assignment once ready, so analyses already running finish on the
+    rules they started with. The version is part of every cache key, so a
+    file that keeps the active version, or fails to load, is logged and the
+    active rules stay in place.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 5.0):
+        self.path = path or DEFAULT_RULES_PATH
+        self.check_interval = check_interval
+        self._mtime = self._modified()
+        self._engine = get_rule_engine(self.path)
+        self._next_check = time.monotonic() + check_interval
+        self._compiling = False
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return self._engine.version
+
+    def current(self) -> RuleEngine:
+        """The active rules, starting a background reload if the file changed."""
+        if self.check_interval > 0 and time.monotonic() >= self._next_check:
+            self._check()
+        return self._engine
+
+    def reload(self) -> bool:
+        """Compile the file now and swap it in if it holds a new version; True if swapped."""
+        self._mtime = self._modified()
+        try:
+            engine = RuleEngine.from_file(self.path)
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            logger.error(f"Could not load rules from {self.path}, keeping version {self.version}: {e}")
+            return False
+        
+        if engine.version == self.version:
+            logger.warning(f"{self.path} changed but is still version {engine.version}; bump its version to apply it")
+            return False
+        
+        previous = self.version
+        _engines[self.path] = self._engine = engine
+        logger.info(f"Rules {self.path} reloaded: version {previous} -> {engine.version}")
+        return True
+
+    def _check(self):
+        with self._lock:
+            if self._compiling or time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + self.check_interval
+            if self._modified() == self._mtime:
+                return
+            self._compiling = True
+        threading.Thread(target=self._reload_in_background, name="rules-reload", daemon=True).start()
+
+    def _reload_in_background(self):
+        try:
+            self.reload()
+        finally:
+            self._compiling = False
+
+    def _modified(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
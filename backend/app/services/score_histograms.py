@@ -0,0 +1,49 @@
+"""
+Where a CV's score stands among the other CVs of its sector.
+
+Scores are counted per sector in the score_histograms table, kept current as
+CVs are saved (see models/score_histogram.py). A percentile reads at most
+101 rows of one sector, however many CVs there are.
+"""
+
+from collections import Counter
+from typing import Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from backend.app.models.cv import CV
+from backend.app.models.score_histogram import ScoreHistogram, add_counts
+
+def score_percentile(db: Session, sector: Optional[str], score: int, min_cvs: int = 1) -> Optional[float]:
+    """Percentile rank (0-100) of a score among the CVs of a sector.
+
+    The share of the sector's CVs scoring lower, with equal scores counting
+    half. None when the sector has fewer than min_cvs scored CVs.
+    """
+    histogram = ScoreHistogram.__table__
+    below, equal, total = db.execute(select(
+        func.sum(case((histogram.c.score < score, histogram.c.count), else_=0)),
+        func.sum(case((histogram.c.score == score, histogram.c.count), else_=0)),
+        func.sum(histogram.c.count)
+    ).where(histogram.c.sector == (sector or ''))).one()
+    if not total or total < min_cvs:
+        return None
+    return round(100 * (below + equal / 2) / total, 1)
+
+def backfill_score_histograms(db: Session) -> int:
+    """Count the scores of CVs analyzed before histograms existed; returns how many were added."""
+    cvs = CV.__table__
+    # Same bucket as CV.analysis_sector or ''
+    bucket = func.coalesce(func.nullif(cvs.c.sector, ''), func.nullif(cvs.c.inferred_sector, ''), '')
+    uncounted = (cvs.c.analysis_score.isnot(None), cvs.c.histogram_sector.is_(None))
+    rows = db.execute(
+        select(bucket, cvs.c.analysis_score, func.count()).where(*uncounted).group_by(bucket, cvs.c.analysis_score)
+    ).all()
+    if not rows:
+        return 0
+
+    add_counts(db, Counter({(sector, score): count for sector, score, count in rows}))
+    db.execute(cvs.update().where(*uncounted).values(
+        histogram_sector=bucket, histogram_score=cvs.c.analysis_score
+    ))
+    db.commit()
+    return sum(count for _, _, count in rows)
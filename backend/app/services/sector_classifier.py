@@ -0,0 +1,167 @@
+"""
+Sector classifier for CVs uploaded without a sector.
+
+A softmax-linear model over hashed bag-of-words features. Texts are split on
+whitespace, each lowercased word is hashed into one of n_features columns, and
+a CV's sector scores are the sums of the weights of the columns it contains.
+Everything after splitting runs as whole-batch NumPy operations, so thousands
+of CVs are classified in one call. Splitting the texts into words dominates:
+see benchmarks/bench_sector_classifier.py for figures.
+"""
+
+import logging
+import string
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stripped from both ends of a word, so "Python," and "python" hash alike
+# while "node.js" stays one word
+_PUNCTUATION = string.punctuation + '«»“”‘’…–—•·'
+
+class _FeatureHashes(dict):
+    """word -> column cache; crc32 is stable across processes, unlike hash().
+
+    Punctuation is stripped here, once per distinct raw word, instead of for
+    every word of every text.
+    """
+
+    def __init__(self, n_features: int, max_size: int = 500_000):
+        super().__init__()
+        self.n_features = n_features
+        self.max_size = max_size
+
+    def __missing__(self, token: str) -> int:
+        if len(self) >= self.max_size:
+            self.clear()
+        column = zlib.crc32(token.strip(_PUNCTUATION).encode('utf-8')) % self.n_features
+        self[token] = column
+        return column
+
+class SectorClassifier:
+    """Hashed bag-of-words + softmax linear weights over a fixed list of sectors."""
+
+    def __init__(self, sectors: Sequence[str], n_features: int = 2 ** 18,
+                 weights: Optional[np.ndarray] = None, bias: Optional[np.ndarray] = None):
+        self.sectors = list(sectors)
+        self.n_features = n_features
+        self.weights = weights if weights is not None else np.zeros((n_features, len(self.sectors)), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.sectors), dtype=np.float32)
+        self._hashes = _FeatureHashes(n_features)
+
+    def vectorize(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse binary bag of words as (rows, cols) of the non-zero entries."""
+        column = self._hashes.__getitem__
+        parts = []
+        for text in texts:
+            # A word counts once per CV however often it is repeated, so each
+            # distinct word of a CV is looked up once
+            words = set(text.lower().split())
+            parts.append(np.fromiter(map(column, words), dtype=np.int64, count=len(words)))
+        lengths = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))
+        cols = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        # Words differing only in punctuation ("Python," and "python") share a column.
+        # Sorting and masking repeats is much faster than np.unique.
+        keys = np.sort(rows * self.n_features + cols)
+        first = np.ones(len(keys), dtype=bool)
+        np.not_equal(keys[1:], keys[:-1], out=first[1:])
+        keys = keys[first]
+        return keys // self.n_features, keys % self.n_features
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Probability of each sector, shape (len(texts), len(sectors))."""
+        rows, cols = self.vectorize(texts)
+        return self._softmax(self._scores(rows, cols, len(texts)))
+
+    def predict(self, texts: Sequence[str], min_confidence: float = 0.0) -> List[Tuple[Optional[str], float]]:
+        """(sector, confidence) per text; sector is None below min_confidence."""
+        if not len(texts):
+            return []
+        proba = self.predict_proba(texts)
+        best = proba.argmax(axis=1)
+        confidence = proba[np.arange(len(texts)), best]
+        return [
+            (self.sectors[label] if score >= min_confidence else None, round(float(score), 4))
+            for label, score in zip(best, confidence)
+        ]
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str], epochs: int = 200,
+            learning_rate: float = 0.5, l2: float = 1e-4) -> 'SectorClassifier':
+        """Train the weights by full-batch gradient descent on the cross-entropy.
+
+        Labels outside self.sectors are ignored.
+        """
+        index = {sector: i for i, sector in enumerate(self.sectors)}
+        pairs = [(text, index[label]) for text, label in zip(texts, labels) if label in index]
+        if not pairs:
+            raise ValueError("No training texts with a known sector")
+
+        rows, cols = self.vectorize([text for text, _ in pairs])
+        targets = np.zeros((len(pairs), len(self.sectors)), dtype=np.float32)
+        targets[np.arange(len(pairs)), [label for _, label in pairs]] = 1.0
+
+        # Only columns that occur in the training set get non-zero weights
+        active, active_cols = np.unique(cols, return_inverse=True)
+        weights = np.zeros((len(active), len(self.sectors)), dtype=np.float32)
+        bias = np.zeros(len(self.sectors), dtype=np.float32)
+        for _ in range(epochs):
+            proba = self._softmax(self._scores(rows, active_cols, len(pairs), weights, bias))
+            error = (proba - targets) / len(pairs)
+            gradient = np.stack([
+                np.bincount(active_cols, weights=error[rows, k], minlength=len(active))
+                for k in range(len(self.sectors))
+            ], axis=1)
+            weights -= learning_rate * (gradient + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+
+        self.weights = np.zeros((self.n_features, len(self.sectors)), dtype=np.float32)
+        self.weights[active] = weights
+        self.bias = bias
+        return self
+
+    @classmethod
+    def from_keywords(cls, sector_keywords: Dict[str, List[str]], texts: Iterable[str] = (),
+                      labels: Iterable[str] = (), **fit_options) -> 'SectorClassifier':
+        """Train on each sector keyword as a one-phrase example, plus labeled CVs."""
+        examples = [(word, sector) for sector, words in sector_keywords.items() for word in words]
+        examples += [(text, label) for text, label in zip(texts, labels) if label in sector_keywords]
+        classifier = cls(list(sector_keywords))
+        return classifier.fit([text for text, _ in examples], [label for _, label in examples], **fit_options)
+
+    def save(self, path: str):
+        """Write the model to an .npz file, storing only the non-zero weight rows."""
+        active = np.flatnonzero(np.any(self.weights != 0, axis=1))
+        np.savez_compressed(
+            path, sectors=np.array(self.sectors), n_features=self.n_features,
+            active=active, weights=self.weights[active], bias=self.bias
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'SectorClassifier':
+        with np.load(path) as data:
+            n_features = int(data['n_features'])
+            sectors = [str(sector) for sector in data['sectors']]
+            weights = np.zeros((n_features, len(sectors)), dtype=np.float32)
+            weights[data['active']] = data['weights']
+            return cls(sectors, n_features, weights, data['bias'].astype(np.float32))
+
+    def _scores(self, rows: np.ndarray, cols: np.ndarray, n_texts: int,
+                weights: Optional[np.ndarray] = None, bias: Optional[np.ndarray] = None) -> np.ndarray:
+        """Linear scores X @ weights + bias for a sparse binary X given as (rows, cols)."""
+        weights = self.weights if weights is None else weights
+        bias = self.bias if bias is None else bias
+        scores = np.empty((n_texts, len(self.sectors)), dtype=np.float64)
+        for k in range(len(self.sectors)):
+            scores[:, k] = np.bincount(rows, weights=weights[cols, k], minlength=n_texts)
+        return scores + bias
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
@@ -0,0 +1,197 @@
+"""
+Entry points for work dispatched to the executor pools.
+
+Each process (the API process and every CPU worker) keeps its own analyzer and
+PDF generator, created on first use, and watches the rules file on its own. Functions here are module-level so they
+can be pickled and sent to worker processes.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.cv_analyzer import CVAnalyzer
+from backend.app.services.doc_store import DocStore
+from backend.app.services.pdf_generator import PDFGenerator
+from backend.app.services.rule_engine import RuleReloader, get_rule_engine
+from backend.app.services.sector_classifier import SectorClassifier
+from config.settings import settings
+
+_analyzer: Optional[CVAnalyzer] = None
+_rule_reloader: Optional[RuleReloader] = None
+_pdf_generator: Optional[PDFGenerator] = None
+_section_cache: Optional[AnalysisCache] = None
+_doc_store: Optional[DocStore] = None
+_sector_classifier: Optional[SectorClassifier] = None
+_lock = threading.Lock()
+
+def get_rule_reloader() -> RuleReloader:
+    """Return this process's watcher of the rules file."""
+    global _rule_reloader
+    if _rule_reloader is None:
+        with _lock:
+            if _rule_reloader is None:
+                _rule_reloader = RuleReloader(settings.rules_path, settings.rules_reload_interval)
+    return _rule_reloader
+
+def get_analyzer() -> CVAnalyzer:
+    """Return this process's CVAnalyzer, on the latest version of the rules.
+
+    When the rules file gets a new version the analyzer is replaced by a copy
+    using it (sharing the loaded models), so callers should not keep the
+    returned analyzer beyond one analysis.
+    """
+    global _analyzer
+    rules = get_rule_reloader().current()
+    if _analyzer is None or _analyzer.rules is not rules:
+        with _lock:
+            if _analyzer is None:
+                _analyzer = CVAnalyzer(model_name=settings.spacy_model,
+                                       rule_engine=rules,
+                                       models=settings.spacy_models,
+                                       min_language_confidence=settings.language_min_confidence,
+                                       chunk_chars=settings.analysis_chunk_chars)
+            elif _analyzer.rules is not rules:
+                _analyzer = _analyzer.with_rules(rules)
+    return _analyzer
+
+def get_pdf_generator() -> PDFGenerator:
+    """Return this process's PDFGenerator."""
+    global _pdf_generator
+    if _pdf_generator is None:
+        with _lock:
+            if _pdf_generator is None:
+                _pdf_generator = PDFGenerator(settings.pdf_storage_path)
+    return _pdf_generator
+
+def get_section_cache() -> AnalysisCache:
+    """Return the cache of per-section analysis features.
+
+    The in-memory tier is per process; the SQLite tier (section_cache_path) is
+    shared, so an edited CV reuses its unchanged sections whichever worker
+    analyzes it. It is capped at section_cache_max_mb, least recently used
+    sections first.
+    """
+    global _section_cache
+    if _section_cache is None:
+        with _lock:
+            if _section_cache is None:
+                _section_cache = AnalysisCache(
+                    settings.section_cache_size,
+                    settings.section_cache_path,
+                    max_db_bytes=settings.section_cache_max_mb * 1024 * 1024
+                )
+    return _section_cache
+
+def get_doc_store() -> Optional[DocStore]:
+    """Return this process's view of the parsed Doc store, or None if disabled."""
+    global _doc_store
+    if _doc_store is None and settings.doc_store_path:
+        with _lock:
+            if _doc_store is None:
+                _doc_store = DocStore(
+                    settings.doc_store_path,
+                    max_entries=settings.doc_store_max_entries,
+                    max_bytes=settings.doc_store_max_mb * 1024 * 1024
+                )
+    return _doc_store
+
+def get_sector_classifier() -> Optional[SectorClassifier]:
+    """Return this process's sector classifier, or None if sector inference is disabled.
+
+    Loads the model at sector_model_path when it exists, otherwise trains one
+    on the rules' sector keywords (a few ms).
+    """
+    global _sector_classifier
+    if _sector_classifier is None and settings.sector_inference:
+        with _lock:
+            if _sector_classifier is None:
+                if settings.sector_model_path and os.path.exists(settings.sector_model_path):
+                    _sector_classifier = SectorClassifier.load(settings.sector_model_path)
+                else:
+                    _sector_classifier = SectorClassifier.from_keywords(
+                        get_rule_engine(settings.rules_path).sector_keywords
+                    )
+    return _sector_classifier
+
+def infer_missing_sectors(cvs: List[Any]) -> List[Any]:
+    """Fill inferred_sector and sector_confidence of CVs saved without a sector.
+
+    CVs classified before are skipped; the rest go through the classifier in
+    one batch and are returned. inferred_sector stays None below
+    sector_min_confidence.
+    """
+    classifier = get_sector_classifier()
+    pending = [cv for cv in cvs if not cv.sector and cv.sector_confidence is None]
+    if classifier is None or not pending:
+        return []
+    predictions = classifier.predict([cv.original_text for cv in pending], settings.sector_min_confidence)
+    for cv, (sector, confidence) in zip(pending, predictions):
+        cv.inferred_sector = sector
+        cv.sector_confidence = confidence
+    return pending
+
+def warm_up_worker():
+    """Process pool initializer: load the NLP model before the first task arrives."""
+    get_analyzer().warm_up()
+
+def analyze_cv_task(cv_text: str, sector: Optional[str] = None,
+                    cv_id: Optional[int] = None, mode: str = 'full') -> Tuple[Dict[str, Any], bool]:
+    """Analyze a CV. Also returns whether the full NLP pipeline was used.
+
+    When cv_id is given and its Doc is in the Doc store, the text is not parsed
+    again; a Doc parsed here is stored for the next analysis. With incremental
+    analysis on, a miss only re-parses the changed sections instead. With
+    analysis_profiling on, the result carries a 'profile' entry for the
+    caller to record and strip.
+    """
+    analyzer = get_analyzer()
+    profile = settings.analysis_profiling
+    if mode != 'full':
+        # Fast mode never uses spaCy, so its results do not depend on the model being installed
+        result = analyzer.analyze_cv(cv_text, sector, profile=profile, mode=mode)
+        return result, mode == 'fast' or analyzer.nlp is not None
+    
+    doc_store = get_doc_store()
+    doc = None
+    nlp = analyzer.nlp_for(analyzer.detect_language(cv_text))
+    # Chunked CVs are never parsed as one Doc, so they are not stored
+    use_store = cv_id is not None and doc_store is not None and nlp and len(cv_text) <= analyzer.chunk_chars
+    if use_store:
+        doc = doc_store.get(cv_id, cv_text, nlp)
+    
+    if doc is None and settings.incremental_analysis:
+        result = analyzer.analyze_incremental(cv_text, sector, get_section_cache(), profile=profile)
+    else:
+        if doc is None and use_store:
+            doc = nlp(cv_text)
+            doc_store.put(cv_id, cv_text, doc, nlp)
+        result = analyzer.analyze_cv(cv_text, sector, doc=doc, profile=profile)
+    return result, analyzer.nlp is not None
+
+def analyze_many_task(texts: List[str], sectors: List[Optional[str]],
+                      cv_ids: Optional[List[int]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """Analyze a chunk of CVs in one nlp.pipe pass. Also returns whether the full NLP pipeline was used."""
+    analyzer = get_analyzer()
+    doc_store = get_doc_store()
+    results = list(analyzer.analyze_many(
+        texts,
+        sectors,
+        batch_size=settings.nlp_batch_size,
+        cv_ids=cv_ids if doc_store is not None else None,
+        doc_store=doc_store
+    ))
+    return results, analyzer.nlp is not None
+
+def analyze_rules_task(cv_text: str, sector: Optional[str] = None) -> Dict[str, Any]:
+    """Run the fast rules stage of a CV analysis (it still tokenizes with spaCy)."""
+    return get_analyzer().analyze_rules(cv_text, sector)
+
+def analyze_nlp_task(cv_text: str, sector: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+    """Run the slow NLP stage of a CV analysis. Also returns whether the full NLP pipeline was used."""
+    analyzer = get_analyzer()
+    return analyzer.analyze_nlp(cv_text, sector), analyzer.nlp is not None
+
+def render_cv_pdf_task(cv_data: Dict[str, Any], user_data: Dict[str, Any]) -> bytes:
+    """Render a CV to PDF in memory and return its bytes."""
+    return get_pdf_generator().render_cv_pdf(cv_data, user_data)
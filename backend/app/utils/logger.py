@@ -138,12 +138,17 @@ class CVMakerLogger:
             **kwargs
         )
     
-    def log_cv_analysis(self, user_id: int, cv_id: int, score: int, **kwargs):
+    def log_cv_analysis(self, user_id: int, cv_id: int, score: int, cache_hit: Optional[bool] = None,
+                        profile: Optional[Dict[str, Any]] = None, **kwargs):
         """Log CV analysis action."""
         details = {
             'cv_id': cv_id,
             'analysis_score': score
         }
+        if cache_hit is not None:
+            details['cache_hit'] = cache_hit
+        if profile:
+            details['profile'] = profile
         
         self.log_user_action(
             action="cv_analysis",
@@ -152,6 +157,50 @@ class CVMakerLogger:
             **kwargs
         )
     
+    def log_cv_batch_analysis(self, user_id: int, cv_ids: list, cache_hits: Optional[int] = None, **kwargs):
+        """Log batch CV analysis action."""
+        details = {
+            'cv_ids': cv_ids,
+            'cv_count': len(cv_ids)
+        }
+        if cache_hits is not None:
+            details['cache_hits'] = cache_hits
+        
+        self.log_user_action(
+            action="cv_batch_analysis",
+            user_id=user_id,
+            details=details,
+            **kwargs
+        )
+    
+    def log_analysis_job(self, user_id: int, cv_id: int, job_id: int, **kwargs):
+        """Log submission of a background analysis job."""
+        details = {
+            'cv_id': cv_id,
+            'job_id': job_id
+        }
+        
+        self.log_user_action(
+            action="cv_analysis_job",
+            user_id=user_id,
+            details=details,
+            **kwargs
+        )
+    
+    def log_cv_match(self, user_id: int, cv_count: int, top_k: int, **kwargs):
+        """Log job description matching action."""
+        details = {
+            'cv_count': cv_count,
+            'top_k': top_k
+        }
+        
+        self.log_user_action(
+            action="cv_match",
+            user_id=user_id,
+            details=details,
+            **kwargs
+        )
+    
     def log_pdf_generation(self, user_id: int, cv_id: int, pdf_filename: str, **kwargs):
         """Log PDF generation action."""
         details = {
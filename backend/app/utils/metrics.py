@@ -0,0 +1,112 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Sequence
+
+# Bucket upper bounds: stage durations in ms and document sizes in tokens
+DURATION_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+class StageTimer:
+    """Collects wall-clock durations (ms) of named stages."""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed
+
+    def as_dict(self) -> Dict[str, float]:
+        """Durations rounded for logging and JSON."""
+        return {name: round(ms, 3) for name, ms in self.durations.items()}
+
+class Histogram:
+    """Running histogram with fixed buckets, like a Prometheus histogram."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None above the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else None
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'mean': round(self.sum / self.count, 3) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': buckets
+        }
+
+class AnalysisMetrics:
+    """Per-stage duration and document size histograms of CV analyses.
+
+    Fed with the 'profile' that CVAnalyzer attaches to results. Counters are
+    per API process.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Histogram] = {}
+        self._tokens = Histogram(TOKEN_BUCKETS)
+        self._lock = threading.Lock()
+
+    def record(self, profile: Optional[Dict[str, Any]]):
+        """Add one analysis profile to the histograms."""
+        if not profile:
+            return
+        with self._lock:
+            for stage, duration_ms in profile.get('stages_ms', {}).items():
+                if stage not in self._stages:
+                    self._stages[stage] = Histogram(DURATION_BUCKETS_MS)
+                self._stages[stage].observe(duration_ms)
+            if profile.get('tokens') is not None:
+                self._tokens.observe(profile['tokens'])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'stages_ms': {stage: histogram.snapshot() for stage, histogram in sorted(self._stages.items())},
+                'tokens': self._tokens.snapshot()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._tokens = Histogram(TOKEN_BUCKETS)
+
+# Global metrics instance
+analysis_metrics = AnalysisMetrics()
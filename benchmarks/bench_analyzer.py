@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for CVAnalyzer on a synthetic CV corpus.
+
+Times analyze_cv, _calculate_score, _extract_keywords, _suggest_improvements
+and streamlit_app.analyze_cv_simple separately, per language and CV size, and
+prints JSON with docs/sec, p50/p95 latency and peak RSS. Each target runs in
+its own process so peak RSS is not inflated by the other targets.
+
+    python benchmarks/bench_analyzer.py --docs 20 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+# Add the project root to Python path
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cv_corpus import LANGUAGES, SIZES, generate_corpus
+
+TARGETS = ('analyze_cv', '_calculate_score', '_extract_keywords', '_suggest_improvements', 'analyze_cv_simple')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def make_runner(target, analyzer, nlp):
+    """Return (prepare, run): prepare(text) builds the input outside the timed section."""
+    if target == 'analyze_cv':
+        return (lambda text: text), (lambda text, sector: analyzer.analyze_cv(text, sector))
+    if target == '_calculate_score':
+        return nlp, (lambda doc, sector: analyzer._calculate_score(doc.text, doc))
+    if target == '_extract_keywords':
+        return nlp, (lambda doc, sector: analyzer._extract_keywords(doc, sector))
+    if target == '_suggest_improvements':
+        return (lambda text: text), (lambda text, sector: analyzer._suggest_improvements(text))
+    if target == 'analyze_cv_simple':
+        from streamlit_app import analyze_cv_simple
+        return (lambda text: text), analyze_cv_simple
+    raise ValueError(f"Unknown target {target}")
+
+
+def run_target(target, docs_per_size, sizes, languages, repeat, seed):
+    """Benchmark one target over the corpus. Runs in a child process."""
+    from backend.app.services.cv_analyzer import CVAnalyzer
+
+    analyzer = CVAnalyzer()
+    nlp = analyzer.nlp
+    if nlp is None:
+        # No trained model installed: analyze_cv falls back to basic analysis and
+        # the helpers that need a Doc get a tokenizer-only one
+        import spacy
+        nlp = spacy.blank('pt')
+        pipeline = None
+    else:
+        pipeline = f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+    try:
+        prepare, run = make_runner(target, analyzer, nlp)
+    except ImportError as e:
+        return {'target': target, 'skipped': f"import failed: {str(e)}"}
+
+    corpus = generate_corpus(docs_per_size, sizes, languages, seed)
+    rows = []
+    for (language, size), docs in corpus.items():
+        inputs = [(prepare(text), sector) for text, sector in docs]
+        run(*inputs[0])  # warm-up
+
+        latencies = []
+        for _ in range(repeat):
+            for item, sector in inputs:
+                start = time.perf_counter()
+                run(item, sector)
+                latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        total = sum(latencies)
+        rows.append({
+            'language': language,
+            'size': size,
+            'docs': len(latencies),
+            'docs_per_sec': round(len(latencies) / total, 2) if total else None,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        })
+
+    return {'target': target, 'model': pipeline, 'results': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=20, help='CVs per language and size')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per target')
+    parser.add_argument('--sizes', nargs='+', default=list(SIZES), choices=list(SIZES))
+    parser.add_argument('--languages', nargs='+', default=list(LANGUAGES), choices=list(LANGUAGES))
+    parser.add_argument('--targets', nargs='+', default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write JSON here instead of stdout')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'docs_per_size': args.docs,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'targets': [],
+    }
+
+    for target in args.targets:
+        # A fresh process per target keeps peak RSS attributable to that target
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(run_target, target, args.docs, tuple(args.sizes),
+                                 tuple(args.languages), args.repeat, args.seed).result()
+        report['targets'].append(result)
+        print(f"{target}: done", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
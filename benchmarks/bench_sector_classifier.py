@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SectorClassifier.predict on 10k CVs.
+
+Compares the previous vectorizer (one column lookup per word) with the
+current one (one lookup per distinct word of a CV) on synthetic CVs of each
+corpus size. Also reports how long splitting the texts alone takes, which
+bounds any vectorizer that works on Python strings.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.services.rule_engine import get_rule_engine
+from backend.app.services.sector_classifier import SectorClassifier
+from cv_corpus import SIZES, generate_cv
+
+N_CVS = 10000
+DISTINCT_CVS = 200
+
+
+def legacy_vectorize(classifier, texts):
+    """Per-word column lookups as done before the per-CV deduplication."""
+    hashes = classifier._hashes
+    lengths = np.empty(len(texts), dtype=np.int64)
+    cols = []
+    for i, text in enumerate(texts):
+        tokens = text.lower().split()
+        cols.extend(map(hashes.__getitem__, tokens))
+        lengths[i] = len(tokens)
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    keys = np.sort(rows * classifier.n_features + np.asarray(cols, dtype=np.int64))
+    first = np.ones(len(keys), dtype=bool)
+    np.not_equal(keys[1:], keys[:-1], out=first[1:])
+    keys = keys[first]
+    return keys // classifier.n_features, keys % classifier.n_features
+
+
+def best_of(function, runs=3):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    classifier = SectorClassifier.from_keywords(get_rule_engine().sector_keywords)
+    print(f"{'size':>8} {'words/CV':>9} {'split (s)':>10} {'legacy (s)':>11} {'vectorize (s)':>14} {'predict (s)':>12}")
+    for size in SIZES:
+        distinct = [generate_cv(language, size, seed=seed)
+                    for seed in range(DISTINCT_CVS // 2) for language in ('pt', 'en')]
+        texts = (distinct * (N_CVS // len(distinct) + 1))[:N_CVS]
+        words = sum(len(text.split()) for text in distinct) / len(distinct)
+
+        rows, cols = classifier.vectorize(texts)
+        legacy_rows, legacy_cols = legacy_vectorize(classifier, texts)
+        assert np.array_equal(rows, legacy_rows) and np.array_equal(cols, legacy_cols)
+
+        split = best_of(lambda: [text.lower().split() for text in texts])
+        legacy = best_of(lambda: legacy_vectorize(classifier, texts))
+        vectorize = best_of(lambda: classifier.vectorize(texts))
+        predict = best_of(lambda: classifier.predict(texts))
+        print(f"{size:>8} {words:>9.0f} {split:>10.2f} {legacy:>11.2f} {vectorize:>14.2f} {predict:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Deterministic synthetic CV corpus for benchmarks.
+
+Generates Portuguese and English CVs at several sizes with contact details,
+the usual sections and sector-specific vocabulary. The same (language, size,
+sector, seed) always gives the same text.
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+# Approximate word counts per size
+SIZES = {
+    'small': 150,
+    'medium': 600,
+    'large': 3000,
+}
+
+LANGUAGES = ('pt', 'en')
+
+SECTOR_VOCABULARY = {
+    'tecnologia': ['Python', 'Java', 'JavaScript', 'React', 'Angular', 'Node.js', 'SQL', 'MongoDB', 'AWS', 'Docker', 'Kubernetes'],
+    'marketing': ['SEO', 'SEM', 'Google Analytics', 'Facebook Ads', 'content marketing', 'social media', 'branding'],
+    'vendas': ['CRM', 'Salesforce', 'pipeline', 'leads', 'conversão', 'negociação', 'B2B', 'B2C'],
+    'recursos_humanos': ['recrutamento', 'seleção', 'treinamento', 'performance', 'cultura organizacional'],
+    'financas': ['Excel', 'Power BI', 'análise financeira', 'orçamento', 'fluxo de caixa', 'investimentos', 'contabilidade'],
+}
+
+TEMPLATES = {
+    'pt': {
+        'names': ['Ana Silva', 'João Santos', 'Maria Costa', 'Pedro Ferreira', 'Rita Almeida'],
+        'headers': {
+            'summary': 'Resumo',
+            'experience': 'Experiência Profissional',
+            'education': 'Educação',
+            'skills': 'Competências',
+            'languages': 'Idiomas',
+        },
+        'verbs': ['Desenvolvi', 'Implementei', 'Geri', 'Liderei', 'Criei', 'Melhorei', 'Aumentei', 'Reduzi', 'Otimizei'],
+        'weak': ['Fui responsável por', 'Ajudei com', 'Participei em', 'Trabalhei em'],
+        'objects': ['sistemas internos', 'a equipa de produto', 'processos de faturação', 'campanhas digitais',
+                    'a relação com clientes', 'projetos de migração', 'relatórios mensais', 'a integração de parceiros'],
+        'results': ['em {n}%', 'durante {n} anos', 'com {n}+ clientes', 'poupando €{n}k', 'em {n} meses'],
+        'companies': ['Tech Solutions Lda', 'Banco Atlântico', 'Lusa Retail', 'Grupo Horizonte', 'Norte Digital'],
+        'degrees': ['Licenciatura em Engenharia Informática', 'Mestrado em Gestão', 'Curso de Marketing Digital'],
+        'spoken': ['Português (nativo)', 'Inglês (fluente)', 'Espanhol (intermédio)'],
+        'summary': 'Profissional com experiência em {sector} e foco em resultados mensuráveis.',
+    },
+    'en': {
+        'names': ['Alice Brown', 'James Smith', 'Emma Johnson', 'Oliver Taylor', 'Sophie Wilson'],
+        'headers': {
+            'summary': 'Summary',
+            'experience': 'Experience',
+            'education': 'Education',
+            'skills': 'Skills',
+            'languages': 'Languages',
+        },
+        'verbs': ['Developed', 'Implemented', 'Managed', 'Led', 'Created', 'Improved', 'Increased', 'Reduced', 'Optimized'],
+        'weak': ['Responsible for', 'Helped with', 'Participated in', 'Worked on'],
+        'objects': ['internal systems', 'the product team', 'billing processes', 'digital campaigns',
+                    'customer relationships', 'migration projects', 'monthly reports', 'partner integrations'],
+        'results': ['by {n}%', 'over {n} years', 'with {n}+ clients', 'saving ${n}k', 'in {n} months'],
+        'companies': ['Acme Corp', 'Northwind Bank', 'Blue Retail', 'Horizon Group', 'Bright Digital'],
+        'degrees': ['BSc in Computer Science', 'MBA', 'Digital Marketing Certificate'],
+        'spoken': ['English (native)', 'Portuguese (fluent)', 'Spanish (intermediate)'],
+        'summary': 'Professional with a background in {sector} and a focus on measurable results.',
+    },
+}
+
+
+def generate_cv(language: str = 'pt', size: str = 'medium', sector: Optional[str] = None, seed: int = 0) -> str:
+    """Build one synthetic CV of roughly SIZES[size] words."""
+    rng = random.Random(f"{language}-{size}-{sector}-{seed}")
+    template = TEMPLATES[language]
+    headers = template['headers']
+    vocabulary = SECTOR_VOCABULARY.get(sector, [])
+    target_words = SIZES[size]
+
+    name = rng.choice(template['names'])
+    lines = [
+        f"Nome: {name}" if language == 'pt' else f"Name: {name}",
+        f"Email: {name.split()[0].lower()}.{seed}@email.com",
+        f"Telefone: +351 9{rng.randint(10000000, 99999999)}" if language == 'pt' else f"Phone: +44 7{rng.randint(100000000, 999999999)}",
+        "",
+        headers['summary'],
+        template['summary'].format(sector=sector or 'gestão'),
+        "",
+        headers['experience'],
+    ]
+
+    # Experience bullets fill most of the requested size
+    words = sum(len(line.split()) for line in lines)
+    while words < target_words * 0.9:
+        if rng.random() < 0.15:
+            lines.append(f"{rng.choice(template['companies'])} ({rng.randint(2010, 2024)})")
+        opener = rng.choice(template['weak']) if rng.random() < 0.2 else rng.choice(template['verbs'])
+        bullet = f"- {opener} {rng.choice(template['objects'])}"
+        if vocabulary and rng.random() < 0.5:
+            bullet += f" com {rng.choice(vocabulary)}" if language == 'pt' else f" using {rng.choice(vocabulary)}"
+        if rng.random() < 0.4:
+            bullet += ' ' + rng.choice(template['results']).format(n=rng.randint(2, 60))
+        lines.append(bullet + '.')
+        words += len(bullet.split())
+
+    lines += ["", headers['education']]
+    lines += rng.sample(template['degrees'], 2)
+    lines += ["", headers['skills']]
+    skills = rng.sample(vocabulary, min(len(vocabulary), 6)) if vocabulary else ['Excel', 'Comunicação']
+    lines.append(', '.join(skills))
+    lines += ["", headers['languages']]
+    lines += template['spoken']
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_corpus(docs_per_size: int = 20, sizes: Tuple[str, ...] = tuple(SIZES),
+                    languages: Tuple[str, ...] = LANGUAGES, seed: int = 0) -> Dict[Tuple[str, str], List[Tuple[str, Optional[str]]]]:
+    """Return {(language, size): [(text, sector), ...]} cycling through the sectors."""
+    sectors = list(SECTOR_VOCABULARY) + [None]
+    corpus = {}
+    for language in languages:
+        for size in sizes:
+            corpus[(language, size)] = [
+                (generate_cv(language, size, sectors[i % len(sectors)], seed + i), sectors[i % len(sectors)])
+                for i in range(docs_per_size)
+            ]
+    return corpus
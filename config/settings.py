@@ -17,12 +17,55 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     
     # File Storage
-    pdf_storage_path: str = "./storage/pdfs"
+    pdf_storage_path: str = "./storage/pdfs"  # Where saved PDFs go; empty disables saving (GET /cv/{id}/pdf still renders)
+    pdf_cache_idle_ttl: int = 24 * 3600  # Seconds a stored PDF no CV points to is kept after its last use
+    pdf_cache_max_unreferenced_mb: int = 100  # Beyond this, the least recently used unreferenced PDFs are evicted early
     log_storage_path: str = "./storage/logs"
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     
     # NLP Configuration
-    spacy_model: str = "pt_core_news_sm"  # Portuguese model
+    spacy_model: str = "pt_core_news_sm"  # Portuguese model, also used when a CV's language is unsure
+    spacy_models: dict = {"en": "en_core_web_sm"}  # Models of other CV languages, loaded on first use
+    language_min_confidence: float = 0.7  # Below this a CV is checked against every lexicon
+    rules_path: Optional[str] = None  # CV rules JSON; defaults to config/cv_rules.json
+    rules_reload_interval: float = 5.0  # Seconds between checks of the rules file for a new version; 0 disables reloading
+    nlp_warm_up: bool = True  # Load the spaCy model in the background at startup
+    nlp_batch_size: int = 32  # Documents per nlp.pipe batch
+    analysis_chunk_chars: int = 20000  # Longer CVs are parsed in chunks of at most this many characters
+    max_batch_cvs: int = 500  # Max CV ids per batch analysis request
+    max_match_results: int = 100  # Max top_k of a job description match
+    match_index_max_users: int = 32  # Users whose CV match index is kept in memory
+    match_index_max_age: float = 300.0  # Seconds before a match index is rebuilt, picking up CV changes made by other API processes
+    analysis_cache_size: int = 1024  # In-process LRU entries
+    analysis_cache_path: Optional[str] = None  # SQLite file for the persistent tier, e.g. ./storage/cache/analysis.db
+    analysis_cache_max_mb: int = 256  # Size of the persistent tier before least recently used entries are evicted
+    incremental_analysis: bool = True  # Re-parse only the CV sections that changed
+    section_cache_size: int = 8192  # Per-section feature entries kept in memory by each process
+    section_cache_path: Optional[str] = "./storage/cache/sections.db"  # SQLite file shared by the CPU workers; None keeps the cache per process
+    section_cache_max_mb: int = 64  # Size of the shared section cache before least recently used sections are evicted
+    doc_store_path: Optional[str] = "./storage/docs"  # Directory for parsed spaCy Docs; None disables the store
+    doc_store_max_entries: int = 5000  # Stored Docs before LRU eviction
+    doc_store_max_mb: int = 512  # Disk budget for stored Docs
+    analysis_profiling: bool = True  # Time each analysis stage and expose histograms at /metrics
+    sector_inference: bool = True  # Guess the sector of CVs saved without one
+    sector_model_path: Optional[str] = None  # .npz from train_sector_classifier.py; None trains on the rules' sector keywords
+    sector_min_confidence: float = 0.6  # Below this the guessed sector is not used
+    score_percentile_min_cvs: int = 10  # Scored CVs a sector needs before analyses report a percentile
+    duplicate_threshold: float = 0.85  # Estimated 3-gram Jaccard similarity above which an upload is a near-duplicate
+    
+    # Executor Configuration
+    io_pool_size: int = 8  # Threads for blocking DB and file work
+    cpu_executor: str = "process"  # "process" or "thread" pool for spaCy and ReportLab
+    cpu_pool_size: int = 2  # Workers in the CPU pool
+    cpu_queue_limit: int = 32  # Max CPU tasks queued or running before requests get 503
+    
+    # Analysis Job Queue
+    analysis_job_workers: int = 2  # Worker threads draining the analysis_jobs table
+    analysis_job_poll_interval: float = 1.0  # Seconds between polls when the queue is empty
+    analysis_job_stale_after: int = 600  # Seconds before a running job is considered crashed and requeued
+    rescore_batch_size: int = 50  # CVs re-analyzed per batch (one bulk UPDATE and checkpoint each) after a rules change
+    rescore_cpu_fraction: float = 0.25  # Share of the elapsed time the re-scoring thread may spend on CPU; 1 disables throttling
+    rescore_stale_after: int = 600  # Seconds without a checkpoint before a re-scoring run is considered interrupted
     
     # API Configuration
     api_v1_prefix: str = "/api/v1"
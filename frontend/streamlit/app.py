@@ -59,6 +59,35 @@ def make_api_request(endpoint, method="GET", data=None, headers=None):
         st.error(f"Erro de conexão: {str(e)}")
         return None
 
+def stream_api_events(endpoint):
+    """Yield (event, data) pairs from a Server-Sent Events endpoint."""
+    url = f"{API_BASE_URL}{endpoint}"
+    headers = {"Accept": "text/event-stream"}
+    
+    if st.session_state.access_token:
+        headers["Authorization"] = f"Bearer {st.session_state.access_token}"
+    
+    try:
+        with requests.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 401:
+                st.session_state.authenticated = False
+                st.session_state.access_token = None
+                st.error("Sessão expirada. Por favor, faça login novamente.")
+                st.rerun()
+            
+            if response.status_code != 200:
+                yield "error", {"detail": response.text}
+                return
+            
+            event = "message"
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    yield event, json.loads(line[len("data:"):].strip())
+    except requests.exceptions.RequestException as e:
+        st.error(f"Erro de conexão: {str(e)}")
+
 def login_user(username, password):
     """Login user and store token."""
     # Send as form data for OAuth2PasswordRequestForm
@@ -334,44 +363,69 @@ Competências:
                 st.error("Por favor, preencha todos os campos!")
 
 def analyze_cv(cv_id):
-    """Analyze CV and show results."""
-    response = make_api_request(f"/cv/{cv_id}/analyze", method="POST")
-    if response and response.status_code == 200:
-        result = response.json()
+    """Analyze CV and show results as each analysis stage arrives."""
+    status_area = st.empty()
+    score_area = st.empty()
+    suggestions_area = st.empty()
+    keywords_area = st.empty()
+    
+    status_area.info("🔍 A analisar o CV...")
+    completed = False
+    
+    for event, data in stream_api_events(f"/cv/{cv_id}/analyze/stream"):
+        if event == "score":
+            # Show score
+            score = data["analysis_score"]
+            score_color = "green" if score >= 70 else "orange" if score >= 50 else "red"
+            score_area.markdown(f"**Pontuação:** :{score_color}[{score}/100]")
         
-        st.success("✅ CV analisado com sucesso!")
+        elif event == "suggestions":
+            # Show suggestions
+            if data["suggestions"]:
+                with suggestions_area.container():
+                    st.subheader("💡 Sugestões de Melhoria")
+                    for i, suggestion in enumerate(data["suggestions"], 1):
+                        priority_icon = "🔴" if suggestion['priority'] == 'high' else "🟡" if suggestion['priority'] == 'medium' else "🔵"
+                        
+                        with st.expander(f"{priority_icon} {i}. {suggestion['title']}"):
+                            st.write(suggestion['description'])
+                            if suggestion.get('examples'):
+                                st.write("**Exemplos:**")
+                                for example in suggestion['examples']:
+                                    st.write(f"• {example}")
+            keywords_area.caption("🔑 A identificar palavras-chave...")
         
-        # Show score
-        score = result["analysis_score"]
-        score_color = "green" if score >= 70 else "orange" if score >= 50 else "red"
-        st.markdown(f"**Pontuação:** :{score_color}[{score}/100]")
+        elif event == "keywords":
+            # Show keywords
+            if data["keywords"]:
+                with keywords_area.container():
+                    st.subheader("🔑 Palavras-chave Identificadas")
+                    st.write(", ".join(data["keywords"][:10]))
+            else:
+                keywords_area.empty()
         
-        # Show suggestions
-        if result["suggestions"]:
-            st.subheader("💡 Sugestões de Melhoria")
-            for i, suggestion in enumerate(result["suggestions"], 1):
-                priority_icon = "🔴" if suggestion['priority'] == 'high' else "🟡" if suggestion['priority'] == 'medium' else "🔵"
-                
-                with st.expander(f"{priority_icon} {i}. {suggestion['title']}"):
-                    st.write(suggestion['description'])
-                    if suggestion.get('examples'):
-                        st.write("**Exemplos:**")
-                        for example in suggestion['examples']:
-                            st.write(f"• {example}")
+        elif event == "done":
+            completed = True
+            status_area.success("✅ CV analisado com sucesso!")
         
-        # Show keywords
-        if result["keywords"]:
-            st.subheader("🔑 Palavras-chave Identificadas")
-            st.write(", ".join(result["keywords"][:10]))
-    else:
-        st.error("Erro ao analisar CV!")
+        elif event == "error":
+            break
+    
+    if not completed:
+        status_area.error("Erro ao analisar CV!")
 
 def generate_pdf(cv_id):
-    """Generate PDF for CV."""
-    response = make_api_request(f"/cv/{cv_id}/generate-pdf", method="POST")
+    """Generate PDF for CV and offer it for download in one request."""
+    response = make_api_request(f"/cv/{cv_id}/pdf")
     if response and response.status_code == 200:
         st.success("✅ PDF gerado com sucesso!")
-        st.info("Pode agora fazer o download do PDF.")
+        st.download_button(
+            label="⬇️ Download PDF",
+            data=response.content,
+            file_name=f"cv_{cv_id}.pdf",
+            mime="application/pdf",
+            key=f"generated_{cv_id}"
+        )
     else:
         st.error("Erro ao gerar PDF!")
 
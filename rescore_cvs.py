@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from backend.app.core.database import SessionLocal, create_tables
+from backend.app.services.rescoring import CVRescorer
+from config.settings import settings
+
+def rescore_cvs(cpu_fraction=None):
+    """Bring every analyzed CV up to the current rules version, resuming an interrupted run."""
+    create_tables()
+    rescorer = CVRescorer(
+        SessionLocal,
+        batch_size=settings.rescore_batch_size,
+        cpu_fraction=cpu_fraction or settings.rescore_cpu_fraction,
+        stale_after=settings.rescore_stale_after,
+        nlp_batch_size=settings.nlp_batch_size
+    )
+
+    run_id, claimed = rescorer.claim()
+    if run_id is None:
+        print("Todos os CVs já estão analisados com a versão atual das regras")
+        return
+    if not claimed:
+        print(f"A execução {run_id} está a decorrer noutro processo")
+        return
+
+    rescorer.run(run_id)
+    db = SessionLocal()
+    try:
+        progress = rescorer.status(db)
+    finally:
+        db.close()
+    print(f"Execução {run_id} ({progress['status']}): {progress['rescored']} CVs reanalisados "
+          f"com as regras {progress['rules_version']}")
+
+if __name__ == "__main__":
+    rescore_cvs(float(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -11,7 +11,6 @@ import datetime
 import os
 import sys
 import json
-import re
 from pathlib import Path
 import tempfile
 import io
@@ -20,6 +19,9 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 
+from backend.app.services.language_detector import get_language_detector
+from backend.app.services.rule_engine import get_rule_engine
+
 # Configuração da página
 st.set_page_config(
     page_title="CV Maker Inteligente",
@@ -162,120 +164,14 @@ def get_user_data(username):
 
 # Análise de CV simplificada
 def analyze_cv_simple(text, sector=None):
-    """Análise simplificada de CV."""
-    score = 50  # Score base
-    suggestions = []
-    keywords = []
-    
-    # Verificações básicas
-    if len(text) < 100:
-        suggestions.append({
-            'title': 'CV muito curto',
-            'description': 'O seu CV parece muito curto. Adicione mais detalhes sobre a sua experiência.',
-            'priority': 'high'
-        })
-        score -= 20
-    
-    # Verificar contactos
-    if '@' in text:
-        score += 10
-        keywords.append('email')
-    else:
-        suggestions.append({
-            'title': 'Adicionar email',
-            'description': 'Inclua o seu endereço de email para contacto.',
-            'priority': 'high'
-        })
-    
-    # Verificar telefone
-    if re.search(r'\+?\d{9,}', text):
-        score += 10
-        keywords.append('telefone')
-    else:
-        suggestions.append({
-            'title': 'Adicionar telefone',
-            'description': 'Inclua o seu número de telefone.',
-            'priority': 'medium'
-        })
-    
-    # Verificar experiência
-    exp_words = ['experiência', 'trabalho', 'empresa', 'função', 'cargo', 'responsabilidades']
-    if any(word in text.lower() for word in exp_words):
-        score += 15
-        keywords.extend(['experiência', 'trabalho'])
-    else:
-        suggestions.append({
-            'title': 'Adicionar experiência profissional',
-            'description': 'Inclua detalhes sobre a sua experiência de trabalho.',
-            'priority': 'high'
-        })
-    
-    # Verificar educação
-    edu_words = ['educação', 'formação', 'curso', 'universidade', 'licenciatura', 'mestrado']
-    if any(word in text.lower() for word in edu_words):
-        score += 15
-        keywords.extend(['educação', 'formação'])
-    else:
-        suggestions.append({
-            'title': 'Adicionar formação académica',
-            'description': 'Inclua informações sobre a sua educação e formação.',
-            'priority': 'medium'
-        })
-    
-    # Verificar competências
-    skill_words = ['competências', 'skills', 'habilidades', 'conhecimentos']
-    if any(word in text.lower() for word in skill_words):
-        score += 10
-        keywords.extend(['competências', 'skills'])
-    else:
-        suggestions.append({
-            'title': 'Adicionar competências',
-            'description': 'Liste as suas competências técnicas e pessoais.',
-            'priority': 'medium'
-        })
-    
-    # Verificar verbos de ação
-    action_verbs = ['desenvolvi', 'implementei', 'geri', 'liderei', 'criei', 'melhorei', 'aumentei']
-    if any(verb in text.lower() for verb in action_verbs):
-        score += 10
-        keywords.append('verbos de ação')
-    else:
-        suggestions.append({
-            'title': 'Usar verbos de ação',
-            'description': 'Use verbos de ação para descrever as suas conquistas (ex: desenvolvi, implementei, geri).',
-            'priority': 'medium'
-        })
-    
-    # Verificar quantificação
-    if re.search(r'\d+%|\d+\s*(anos?|meses?)', text):
-        score += 10
-        keywords.append('quantificação')
-    else:
-        suggestions.append({
-            'title': 'Quantificar resultados',
-            'description': 'Inclua números e percentagens para quantificar os seus resultados.',
-            'priority': 'medium'
-        })
-    
-    # Ajustar score por setor
-    if sector:
-        keywords.append(f'setor_{sector}')
-        if sector == 'tecnologia':
-            tech_words = ['python', 'javascript', 'sql', 'git', 'api', 'web', 'mobile']
-            if any(word in text.lower() for word in tech_words):
-                score += 5
-        elif sector == 'marketing':
-            marketing_words = ['campanha', 'digital', 'social media', 'analytics', 'roi']
-            if any(word in text.lower() for word in marketing_words):
-                score += 5
-    
-    # Garantir que o score está entre 0 e 100
-    score = max(0, min(100, score))
+    """Análise simplificada de CV, com as mesmas regras do backend."""
+    engine = get_rule_engine()
+    result = engine.analyze(text, sector, language=get_language_detector().language(text))
     
     return {
-        'score': score,
-        'suggestions': suggestions,
-        'keywords': keywords[:10]  # Limitar a 10 keywords
+        'score': result['analysis_score'],
+        'suggestions': result['suggestions'],
+        'keywords': engine.sector_keywords_found(text, sector)[:10]  # Limitar a 10 keywords
     }
 
 def save_cv(user_id, title, original_text, analysis_result, sector=None):
@@ -0,0 +1,31 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models import Base, User
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory of a temporary database with one user (id 1, "tester")."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = TestingSession()
+    db.add(User(username="tester", email="tester@email.com", password_hash="x"))
+    db.commit()
+    db.close()
+    yield TestingSession
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    """Session on the temporary database."""
+    session = session_factory()
+    yield session
+    session.close()
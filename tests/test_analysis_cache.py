@@ -0,0 +1,69 @@
+import pytest
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services.analysis_cache import AnalysisCache
+
+class TestAnalysisCache:
+    """Test cases for the analysis result cache."""
+
+    def test_key_depends_on_text_sector_and_version(self):
+        """Test cache key composition."""
+        key = AnalysisCache.make_key("Desenvolvi APIs", "tecnologia", "1")
+
+        assert key == AnalysisCache.make_key("Desenvolvi APIs\r\n", "tecnologia", "1")
+        assert key != AnalysisCache.make_key("Desenvolvi APIs", "marketing", "1")
+        assert key != AnalysisCache.make_key("Desenvolvi APIs", "tecnologia", "2")
+        assert key != AnalysisCache.make_key("Implementei APIs", "tecnologia", "1")
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = AnalysisCache(max_entries=2)
+        cache.set("a", {'analysis_score': 1})
+        cache.set("b", {'analysis_score': 2})
+        cache.get("a")
+        cache.set("c", {'analysis_score': 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {'analysis_score': 1}
+        assert cache.get("c") == {'analysis_score': 3}
+        assert cache.hits == 3
+        assert cache.misses == 1
+
+    def test_cached_results_are_copies(self):
+        """Test that callers cannot mutate cached entries."""
+        cache = AnalysisCache()
+        cache.set("a", {'keywords': ['python']})
+        cache.get("a")['keywords'].append('java')
+
+        assert cache.get("a") == {'keywords': ['python']}
+
+    def test_persistent_tier(self, tmp_path):
+        """Test that entries survive a new cache instance via SQLite."""
+        db_path = str(tmp_path / "cache" / "analysis.db")
+        AnalysisCache(db_path=db_path).set("a", {'analysis_score': 80})
+
+        cache = AnalysisCache(db_path=db_path)
+        assert cache.get("a") == {'analysis_score': 80}
+        assert cache.get("missing") is None
+
+    def test_persistent_tier_evicts_least_recently_used(self, tmp_path):
+        """Test that the SQLite tier stays under its byte cap, keeping recently read entries."""
+        db_path = str(tmp_path / "analysis.db")
+        result = {'analyzed_text': 'x' * 80}
+        size = len(json.dumps(result))
+        cache = AnalysisCache(max_entries=1, db_path=db_path, max_db_bytes=3 * size)
+        for key in ("a", "b", "c"):
+            cache.set(key, result)
+        cache.get("a")
+        cache.set("d", result)
+
+        reopened = AnalysisCache(db_path=db_path)
+        assert [key for key in "abcd" if reopened.get(key)] == ["a", "d"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
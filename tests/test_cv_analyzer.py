@@ -1,11 +1,14 @@
 import pytest
+import spacy
 import sys
 import os
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.app.services.cv_analyzer import CVAnalyzer
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.cv_analyzer import CVAnalyzer, MODE_FIELDS
+from backend.app.services.cv_sections import split_chunks, split_sections
 
 class TestCVAnalyzer:
     """Test cases for CV Analyzer service."""
@@ -49,6 +52,139 @@ class TestCVAnalyzer:
         count = self.analyzer._count_weak_words(text_with_weak_words)
         assert count > 0
     
+    def test_single_pass_term_matching(self):
+        """Test that the compiled matcher counts every verb and weak phrase."""
+        text = "Desenvolvi e desenvolvi APIs. Fui responsável por vendas e ajudei a equipa. Led and managed teams."
+        term_counts = self.analyzer._match_terms(text)
+
+        assert term_counts['desenvolvi'] == 2
+        assert term_counts['responsável por'] == 1
+        assert self.analyzer._count_action_verbs(text, term_counts) == 4
+        assert self.analyzer._count_weak_words(text, term_counts) == 2
+        # Word boundaries still apply ("led" must not match inside "called")
+        assert self.analyzer._count_action_verbs("I called the client.") == 0
+
+    def test_analyze_many_preserves_order(self):
+        """Test batch analysis matches single analysis, in input order."""
+        texts = [
+            "Desenvolvi aplicações web. Email: ana@email.com",
+            "Trabalhei numa empresa.",
+            "Implementei APIs e aumentei vendas em 20%. Geri equipa de 5 pessoas."
+        ]
+        sectors = ["tecnologia", None, "vendas"]
+        
+        batch_results = list(self.analyzer.analyze_many(texts, sectors, batch_size=2))
+        
+        assert len(batch_results) == len(texts)
+        for text, sector, result in zip(texts, sectors, batch_results):
+            assert result == self.analyzer.analyze_cv(text, sector)
+    
+    def test_staged_analysis_matches_full_analysis(self):
+        """Test that the fast and NLP stages combine into the full result."""
+        cv_text = "Desenvolvi APIs em Python. Fui responsável por vendas e aumentei receitas em 20%."
+        
+        result = self.analyzer.analyze_rules(cv_text, "tecnologia")
+        result.update(self.analyzer.analyze_nlp(cv_text, "tecnologia"))
+        
+        assert result == self.analyzer.analyze_cv(cv_text, "tecnologia")
+    
+    def test_split_sections_round_trip(self):
+        """Test that sections split at headers and join back to the original text."""
+        cv_text = "Nome: Ana\nEmail: ana@email.com\n\nExperiência\n- Desenvolvi APIs\n\nCompetências\nPython, SQL\n"
+        sections = split_sections(cv_text)
+
+        assert [section for section, _ in sections] == ['outros', 'experiencia', 'competencias']
+        assert ''.join(text for _, text in sections) == cv_text
+
+    def test_incremental_analysis_reparses_changed_sections(self):
+        """Test that only edited sections are re-parsed and the result equals analyze_cv's."""
+        self.analyzer.nlp = spacy.blank("pt")
+        self.analyzer.nlp.add_pipe("sentencizer")
+        cv_text = (
+            "Nome: Ana\nEmail: ana@email.com\n\n"
+            "Experiência\n- Desenvolvi APIs e aumentei vendas em 20%.\n\n"
+            "Competências\nPython, SQL\n"
+        )
+        edited_text = cv_text.replace("Python, SQL", "Python, SQL, Docker")
+        section_cache = AnalysisCache()
+
+        self.analyzer.analyze_incremental(cv_text, "tecnologia", section_cache)
+        parsed_before = section_cache.misses
+        result = self.analyzer.analyze_incremental(edited_text, "tecnologia", section_cache)
+
+        assert section_cache.misses - parsed_before == 1
+        # Sections ending mid-sentence ("Python, SQL, Docker") continue it in the next one
+        assert result == self.analyzer.analyze_cv(edited_text, "tecnologia")
+        example = open(os.path.join(os.path.dirname(__file__), '..', 'docs', 'exemplo_cv.md'), encoding='utf-8').read()
+        assert self.analyzer.analyze_incremental(example, None, AnalysisCache()) == self.analyzer.analyze_cv(example)
+
+    def test_incremental_analysis_uses_the_cv_language_model(self, monkeypatch):
+        """Test that an English CV is parsed with the English pipeline without loading the default one."""
+        english = spacy.blank("en")
+        english.add_pipe("sentencizer")
+        registry = self.analyzer.model_registry
+        registry.set("en", english)
+        loaded = []
+        monkeypatch.setattr(registry, "_load", loaded.append)
+        cv_text = (
+            "EXPERIENCE\nI developed web applications in Python and led a team of five engineers.\n\n"
+            "EDUCATION\nBachelor degree in Computer Science from the University of Lisbon."
+        )
+
+        result = self.analyzer.analyze_incremental(cv_text, None, AnalysisCache())
+
+        assert loaded == []
+        assert result == self.analyzer.analyze_cv(cv_text)
+
+    def test_chunked_analysis_matches_whole_text(self):
+        """Test that long CVs parsed in chunks give the same result as one Doc."""
+        self.analyzer.nlp = spacy.blank("pt")
+        self.analyzer.nlp.add_pipe("sentencizer")
+        cv_text = (
+            "Nome: Ana\nEmail: ana@email.com\n\n"
+            "Experiência\n- Desenvolvi APIs e aumentei vendas em 20%.\n- Fui responsável por Python e Docker\n\n"
+            "Competências\nPython, SQL, Docker (AWS.)  Liderei equipas sem ponto final\n"
+        ) * 5
+        expected = {mode: self.analyzer.analyze_cv(cv_text, "tecnologia", mode=mode) for mode in MODE_FIELDS}
+
+        self.analyzer.chunk_chars = 40
+        chunks = list(split_chunks(cv_text, 40))
+        assert ''.join(chunks) == cv_text
+        assert all(len(chunk) <= 40 and chunk[-1].isspace() for chunk in chunks[:-1])
+        for mode, result in expected.items():
+            assert self.analyzer.analyze_cv(cv_text, "tecnologia", mode=mode) == result
+        assert list(self.analyzer.analyze_many([cv_text, "Desenvolvi APIs."], ["tecnologia", None]))[0] == expected['full']
+
+    def test_profile_reports_stages_and_tokens(self):
+        """Test that profiling adds stage durations without changing the result."""
+        self.analyzer.nlp = spacy.blank("pt")
+        self.analyzer.nlp.add_pipe("sentencizer")
+        cv_text = "Desenvolvi APIs em Python. Aumentei vendas em 20%."
+
+        result = self.analyzer.analyze_cv(cv_text, "tecnologia", profile=True)
+        profile = result.pop('profile')
+
+        assert set(profile['stages_ms']) == {'language', 'parse', 'features', 'rewrite', 'suggestions', 'score', 'keywords'}
+        assert profile['tokens'] == result['word_count']
+        assert result == self.analyzer.analyze_cv(cv_text, "tecnologia")
+
+    def test_analysis_modes_fill_declared_fields(self):
+        """Test that each mode returns exactly its declared fields and fast mode skips spaCy."""
+        self.analyzer.nlp = spacy.blank("pt")
+        self.analyzer.nlp.add_pipe("sentencizer")
+        cv_text = "Desenvolvi APIs em Python e Docker. Aumentei vendas em 20%. Email: ana@email.com"
+
+        full = self.analyzer.analyze_cv(cv_text, "tecnologia", mode="full")
+        for mode, fields in MODE_FIELDS.items():
+            result = self.analyzer.analyze_cv(cv_text, "tecnologia", mode=mode)
+            assert set(result) == set(fields) | {'rules_version'}
+            assert result['suggestions'] == full['suggestions']
+
+        self.analyzer.nlp = None
+        assert self.analyzer.analyze_cv(cv_text, "tecnologia", mode="fast")['analysis_score'] == full['analysis_score']
+        with pytest.raises(ValueError):
+            self.analyzer.analyze_cv(cv_text, mode="deep")
+
     def test_sector_specific_analysis(self):
         """Test sector-specific analysis."""
         tech_cv = """
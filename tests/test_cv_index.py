@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services.cv_index import CVMatchIndex, CVMatchIndexes, stop_words
+
+CVS = {
+    1: "Desenvolvi APIs em Python e SQL. Docker e AWS em produção.",
+    2: "Geri campanhas de SEO e Google Analytics para e-commerce.",
+    3: "Contabilidade, Excel e análise financeira.",
+    4: "Programador Java e Python.",
+}
+
+class TestCVMatchIndex:
+    """Test cases for the TF-IDF job description match index."""
+
+    def test_ranks_cvs_with_matched_terms(self):
+        """Test top-k ranking, scores and matched terms."""
+        index = CVMatchIndex()
+        index.add_many((cv_id, text, None) for cv_id, text in CVS.items())
+
+        matches = index.match("Procuramos especialista em SQL, AWS e Docker, com Python", k=2)
+
+        assert [match['cv_id'] for match in matches] == [1, 4]
+        assert {'python', 'sql', 'aws', 'docker'} <= set(matches[0]['matched_terms'])
+        assert 0 < matches[1]['score'] < matches[0]['score'] <= 1
+        assert index.match("Sem termos conhecidos") == []
+
+    def test_incremental_updates_match_a_rebuild(self):
+        """Test that adds, replacements and removals give the same scores as a fresh index."""
+        index = CVMatchIndex(min_delta_entries=1)
+        index.add_many((cv_id, text, None) for cv_id, text in CVS.items())
+        index.add(3, "Analista de SEO", ["seo", "marketing"])
+        index.remove(4)
+        index.add(5, "Python e Django")
+
+        rebuilt = CVMatchIndex()
+        rebuilt.add_many([(1, CVS[1], None), (2, CVS[2], None), (3, "Analista de SEO", ["seo", "marketing"]),
+                          (5, "Python e Django", None)])
+        rebuilt.compact()
+
+        for query in ("SEO e marketing digital", "Python com Django"):
+            assert index.match(query) == rebuilt.match(query)
+        assert len(index) == 4
+
+    def test_repeated_updates_reuse_slots(self):
+        """Test that replacing a CV many times does not grow the index."""
+        index = CVMatchIndex(min_delta_entries=1)
+        index.add_many((cv_id, text, None) for cv_id, text in CVS.items())
+        for version in range(200):
+            index.add(1, f"Python e SQL versão {version}")
+        index.remove(2)
+        index.compact()
+
+        assert index._n_slots == len(index) == 3
+        assert len(index._slot_cv_ids) <= 16
+        assert sorted(index._slots.values()) == [0, 1, 2]
+        rebuilt = CVMatchIndex()
+        rebuilt.add_many([(1, "Python e SQL versão 199", None), (3, CVS[3], None), (4, CVS[4], None)])
+        for query in ("Python e SQL versão 199", "Java", "Excel"):
+            assert index.match(query) == rebuilt.match(query)
+
+    def test_stop_words_are_not_indexed(self):
+        """Test that function words get no weight and are never reported as matched."""
+        index = CVMatchIndex(stop_words=stop_words(['pt', 'en']))
+        index.add_many((cv_id, text, None) for cv_id, text in CVS.items())
+
+        matches = index.match("Procuramos especialista em SQL, com Python e Java, de preferência")
+
+        assert [match['cv_id'] for match in matches] == [4, 1]
+        assert not {'em', 'com', 'e', 'de'} & set(index.vocabulary)
+        assert {'python', 'java'} == set(matches[0]['matched_terms'])
+
+    def test_old_indexes_are_rebuilt(self):
+        """Test that changes made by another process show up once the index is older than max_age."""
+        indexes = CVMatchIndexes(max_age=60)
+        documents = [(1, CVS[1], None)]
+        index = indexes.get(1, lambda: list(documents))
+        documents.append((2, CVS[2], None))
+
+        assert indexes.get(1, lambda: list(documents)) is index
+        index.built_at -= 61
+        rebuilt = indexes.get(1, lambda: list(documents))
+        assert rebuilt is not index and len(rebuilt) == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+import pytest
+import spacy
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services import tasks
+from backend.app.services.cv_analyzer import CVAnalyzer
+from backend.app.services.doc_store import DocStore
+from config.settings import settings
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank("pt")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+class TestDocStore:
+    """Test cases for the parsed Doc store."""
+
+    def test_round_trip_and_text_change(self, tmp_path, nlp):
+        """Test that a stored Doc loads back and an edited text misses."""
+        store = DocStore(str(tmp_path))
+        text = "Desenvolvi APIs. Geri equipas."
+        store.put(1, text, nlp(text), nlp)
+
+        doc = store.get(1, text, nlp)
+        assert doc.text == text
+        assert len(list(doc.sents)) == 2
+        assert store.get(1, text + " Liderei projetos.", nlp) is None
+
+        # Storing the edited text replaces the old Doc
+        store.put(1, text + " Liderei projetos.", nlp(text + " Liderei projetos."), nlp)
+        assert len(os.listdir(tmp_path)) == 1
+
+    def test_lru_eviction_and_reload(self, tmp_path, nlp):
+        """Test that the least recently used Doc is evicted and the index survives a restart."""
+        store = DocStore(str(tmp_path), max_entries=2)
+        for cv_id in (1, 2):
+            store.put(cv_id, f"CV {cv_id}", nlp(f"CV {cv_id}"), nlp)
+        store.get(1, "CV 1", nlp)
+        store.put(3, "CV 3", nlp("CV 3"), nlp)
+
+        assert store.get(2, "CV 2", nlp) is None
+        reopened = DocStore(str(tmp_path), max_entries=2)
+        assert reopened.get(1, "CV 1", nlp) is not None
+        assert reopened.get(3, "CV 3", nlp) is not None
+
+    def test_parse_many_only_parses_missing_docs(self, tmp_path, nlp):
+        """Test that bulk analysis reuses stored Docs and matches a fresh analysis."""
+        analyzer = CVAnalyzer()
+        analyzer.nlp = nlp
+        store = DocStore(str(tmp_path))
+        texts = ["Desenvolvi APIs em Python.", "Trabalhei numa empresa."]
+
+        analyzer.parse_many(texts[:1], [1], store)
+        results = list(analyzer.analyze_many(texts, cv_ids=[1, 2], doc_store=store))
+
+        assert store.hits == 1
+        assert results == [analyzer.analyze_cv(text) for text in texts]
+
+    def test_stores_of_other_processes_share_deletes_and_caps(self, tmp_path, nlp):
+        """Test that a CV's Docs are deleted and the caps applied whichever store wrote them."""
+        worker = DocStore(str(tmp_path), max_entries=3, rescan_interval=0)
+        api = DocStore(str(tmp_path), max_entries=3, rescan_interval=0)
+        worker.put(1, "CV 1", nlp("CV 1"), nlp)
+        worker.put(2, "CV 2", nlp("CV 2"), nlp)
+
+        api.delete_cv(1)
+        assert sorted(os.listdir(tmp_path)) == [DocStore.make_key(2, "CV 2", nlp) + DocStore.SUFFIX]
+
+        for cv_id in (3, 4, 5):
+            api.put(cv_id, f"CV {cv_id}", nlp(f"CV {cv_id}"), nlp)
+        assert len(os.listdir(tmp_path)) == 3
+        assert worker.get(2, "CV 2", nlp) is None
+
+    def test_single_analysis_stores_its_doc(self, tmp_path, nlp, monkeypatch):
+        """Test that a CV parsed by analyze_cv_task is not parsed again on re-analysis."""
+        analyzer = CVAnalyzer()
+        analyzer.nlp = nlp
+        monkeypatch.setattr(tasks, "get_analyzer", lambda: analyzer)
+        monkeypatch.setattr(tasks, "_doc_store", DocStore(str(tmp_path)))
+        monkeypatch.setattr(settings, "incremental_analysis", False)
+        monkeypatch.setattr(settings, "analysis_profiling", False)
+        text = "Desenvolvi APIs em Python. Geri uma equipa."
+
+        first, _ = tasks.analyze_cv_task(text, None, cv_id=1)
+        second, _ = tasks.analyze_cv_task(text, None, cv_id=1)
+
+        assert tasks.get_doc_store().hits == 1
+        assert first == second == analyzer.analyze_cv(text)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
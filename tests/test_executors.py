@@ -0,0 +1,254 @@
+import pytest
+import asyncio
+import sys
+import os
+import time
+import json
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+from backend.app.main import app
+from backend.app.api import cv as cv_api
+from backend.app.api.auth import get_current_user
+from backend.app.core import executors
+from backend.app.core.database import get_db
+from backend.app.models import User, CV
+from backend.app.services import tasks
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.near_duplicates import NearDuplicateIndex
+from config.settings import settings
+
+CPU_SECONDS = 0.05
+
+def burn_cpu(seconds):
+    """Pure-Python loop that holds the GIL for the given CPU time."""
+    end = time.process_time() + seconds
+    spins = 0
+    while time.process_time() < end:
+        spins += 1
+    return spins
+
+def cpu_analyze_cv_task(cv_text, sector=None, cv_id=None, mode='full'):
+    """Real analysis plus CPU-bound work; records the process it ran in."""
+    burn_cpu(CPU_SECONDS)
+    result, _ = tasks.analyze_cv_task(cv_text, sector, cv_id, mode)
+    result['analyzed_text'] = str(os.getpid())
+    return result, False
+
+def cpu_analyze_many_task(texts, sectors, cv_ids=None):
+    """Real batch analysis plus CPU-bound work; records the process it ran in."""
+    burn_cpu(CPU_SECONDS)
+    results, _ = tasks.analyze_many_task(texts, sectors, cv_ids)
+    for result in results:
+        result['analyzed_text'] = str(os.getpid())
+    return results, False
+
+def rules_task_pid(cv_text, sector=None):
+    """Real rules stage; records the process it ran in."""
+    result = tasks.analyze_rules_task(cv_text, sector)
+    result['analyzed_text'] = str(os.getpid())
+    return result
+
+def nlp_task_pid(cv_text, sector=None):
+    """Real NLP stage; records the process it ran in."""
+    result, used_nlp = tasks.analyze_nlp_task(cv_text, sector)
+    result['keywords'] = [str(os.getpid())]
+    return result, used_nlp
+
+@pytest.fixture
+def api(session_factory, monkeypatch):
+    """App wired to the temporary database with a logged-in user and 20 CVs, on a process pool."""
+    db = session_factory()
+    user = db.query(User).one()
+    cv_ids = []
+    for i in range(20):
+        cv = CV(user_id=user.id, title=f"CV {i}", original_text=f"Desenvolvi o projeto {i}.")
+        db.add(cv)
+        db.commit()
+        cv_ids.append(cv.id)
+    db.refresh(user)
+    db.close()
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    monkeypatch.setattr(cv_api, "analyze_cv_task", cpu_analyze_cv_task)
+    monkeypatch.setattr(cv_api, "analyze_many_task", cpu_analyze_many_task)
+    monkeypatch.setattr(settings, "doc_store_path", "")
+    monkeypatch.setattr(settings, "incremental_analysis", False)
+    monkeypatch.setattr(settings, "io_pool_size", 2)
+    monkeypatch.setattr(settings, "cpu_executor", "process")
+    monkeypatch.setattr(settings, "cpu_pool_size", 4)
+    monkeypatch.setattr(settings, "cpu_queue_limit", 32)
+    executors.shutdown_executors()
+
+    yield cv_ids, session_factory
+
+    executors.shutdown_executors()
+    app.dependency_overrides.clear()
+
+def analyzing_pids(session_factory):
+    """Ids of the processes that analyzed the CVs."""
+    db = session_factory()
+    try:
+        return {int(cv.analyzed_text) for cv in db.query(CV).all()}
+    finally:
+        db.close()
+
+class TestExecutors:
+    """Test cases for running blocking work off the event loop."""
+
+    def test_health_stays_responsive_during_analyses(self, api):
+        """Test /health latency while 20 CPU-bound analyses run in worker processes."""
+        cv_ids, session_factory = api
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                analyses = [
+                    asyncio.create_task(client.post(f"/api/v1/cv/{cv_id}/analyze"))
+                    for cv_id in cv_ids
+                ]
+                await asyncio.sleep(0.05)
+
+                health_latencies = []
+                while not all(task.done() for task in analyses):
+                    start = time.perf_counter()
+                    response = await client.get("/health")
+                    health_latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200
+                    await asyncio.sleep(0.05)
+
+                responses = await asyncio.gather(*analyses)
+                return health_latencies, responses
+
+        start = time.perf_counter()
+        health_latencies, responses = asyncio.run(scenario())
+        elapsed = time.perf_counter() - start
+
+        assert all(r.status_code == 200 for r in responses)
+        # 20 analyses on 4 workers take several rounds; /health answers throughout
+        assert elapsed >= 20 * CPU_SECONDS / settings.cpu_pool_size
+        assert len(health_latencies) >= 5
+        # Run in the API process, the analyses would block the loop for 20 * CPU_SECONDS at a time
+        assert sorted(health_latencies)[len(health_latencies) // 2] < 0.05
+        assert max(health_latencies) < 20 * CPU_SECONDS / 2
+        assert os.getpid() not in analyzing_pids(session_factory)
+
+    def test_batch_analysis_runs_in_worker_processes(self, api, monkeypatch):
+        """Test that a batch is split across the CPU workers instead of parsed in the API process."""
+        cv_ids, session_factory = api
+        monkeypatch.setattr(settings, "nlp_batch_size", 5)
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/api/v1/cv/analyze-batch", json={"cv_ids": cv_ids})
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 200
+        assert len(response.json()["data"]["results"]) == 20
+        pids = analyzing_pids(session_factory)
+        assert os.getpid() not in pids and len(pids) > 1
+
+    def test_stream_stages_run_in_worker_processes(self, api, monkeypatch):
+        """Test that neither streamed stage tokenizes or parses in the API process."""
+        cv_ids, _ = api
+        monkeypatch.setattr(cv_api, "analysis_cache", AnalysisCache(max_entries=16))
+        monkeypatch.setattr(cv_api, "analyze_rules_task", rules_task_pid)
+        monkeypatch.setattr(cv_api, "analyze_nlp_task", nlp_task_pid)
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get(f"/api/v1/cv/{cv_ids[0]}/analyze/stream")
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 200
+        events = {}
+        for block in response.text.strip().split("\n\n"):
+            event, data = block.split("\n")
+            events[event[len("event: "):]] = json.loads(data[len("data: "):])
+        assert list(events) == ["score", "suggestions", "keywords", "done"]
+        assert int(events["suggestions"]["analyzed_text"]) != os.getpid()
+        assert int(events["keywords"]["keywords"][0]) != os.getpid()
+
+    def test_sector_inference_runs_off_the_event_loop(self, api, monkeypatch):
+        """Test that the analyze endpoints classify CVs in an executor thread."""
+        cv_ids, _ = api
+        threads = []
+
+        def infer_missing_sectors(cvs):
+            threads.append(threading.current_thread())
+            return tasks.infer_missing_sectors(cvs)
+
+        monkeypatch.setattr(cv_api, "infer_missing_sectors", infer_missing_sectors)
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                responses = [
+                    await client.post(f"/api/v1/cv/{cv_ids[0]}/analyze"),
+                    await client.post("/api/v1/cv/analyze-batch", json={"cv_ids": cv_ids[:2]}),
+                    await client.get(f"/api/v1/cv/{cv_ids[1]}/analyze/stream")
+                ]
+                return responses, threading.current_thread()
+
+        responses, loop_thread = asyncio.run(scenario())
+        assert all(r.status_code == 200 for r in responses)
+        assert len(threads) == 3 and loop_thread not in threads
+
+    def test_upload_loads_duplicates_off_the_event_loop(self, api, monkeypatch):
+        """Test that the first upload classifies the CV and loads the duplicate index in executor threads."""
+        threads = []
+        original_load_signatures = cv_api.load_signatures
+
+        def infer_missing_sectors(cvs):
+            threads.append(threading.current_thread())
+            return tasks.infer_missing_sectors(cvs)
+
+        def load_signatures(db):
+            threads.append(threading.current_thread())
+            return original_load_signatures(db)
+
+        monkeypatch.setattr(cv_api, "infer_missing_sectors", infer_missing_sectors)
+        monkeypatch.setattr(cv_api, "load_signatures", load_signatures)
+        monkeypatch.setattr(cv_api, "duplicate_index", NearDuplicateIndex())
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/v1/cv/upload", json={
+                    "title": "CV novo", "original_text": "Desenvolvi o projeto 3."
+                })
+                return response, threading.current_thread()
+
+        response, loop_thread = asyncio.run(scenario())
+        assert response.status_code == 200
+        assert response.json()["data"]["duplicate_of"] is not None
+        assert len(threads) == 2 and loop_thread not in threads
+
+    def test_cpu_queue_limit(self, api, monkeypatch):
+        """Test that work beyond the queue limit is rejected."""
+        monkeypatch.setattr(settings, "cpu_queue_limit", 1)
+
+        async def scenario():
+            first = asyncio.create_task(executors.run_cpu(burn_cpu, CPU_SECONDS))
+            await asyncio.sleep(0.01)
+            with pytest.raises(executors.ExecutorBusyError):
+                await executors.run_cpu(burn_cpu, 0)
+            await first
+
+        asyncio.run(scenario())
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.core import executors
+from backend.app.models import CV, AnalysisJob
+from backend.app.services.analysis_cache import AnalysisCache
+from backend.app.services.job_queue import AnalysisJobQueue
+from config.settings import settings
+
+@pytest.fixture
+def session_factory(session_factory, monkeypatch):
+    """The temporary database with one CV."""
+    db = session_factory()
+    db.add(CV(user_id=1, title="CV", original_text="Desenvolvi APIs e aumentei vendas em 20%."))
+    db.commit()
+    db.close()
+
+    monkeypatch.setattr(settings, "cpu_executor", "thread")
+    executors.shutdown_executors()
+    yield session_factory
+    executors.shutdown_executors()
+
+def wait_for_status(session_factory, job_id, statuses, timeout=5.0):
+    """Poll a job until it reaches one of the given statuses."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        db = session_factory()
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        db.close()
+        if job.status in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} stuck in status {job.status}")
+
+class TestAnalysisJobQueue:
+    """Test cases for the background analysis job queue."""
+
+    def test_job_runs_and_updates_cv(self, session_factory):
+        """Test that a submitted job completes and writes back to the CV."""
+        queue = AnalysisJobQueue(session_factory, AnalysisCache(), workers=1, poll_interval=0.05)
+        db = session_factory()
+        job = queue.submit(db, user_id=1, cv_id=1)
+        assert job.status == "queued"
+
+        queue.start()
+        try:
+            job = wait_for_status(session_factory, job.id, {"done", "failed"})
+        finally:
+            queue.stop()
+            db.close()
+
+        assert job.status == "done"
+        assert job.attempts == 1
+        db = session_factory()
+        cv = db.query(CV).filter(CV.id == 1).first()
+        assert cv.analysis_score == job.result['analysis_score']
+        db.close()
+
+    def test_missing_cv_fails_job(self, session_factory):
+        """Test that a job for another user's CV fails instead of running."""
+        queue = AnalysisJobQueue(session_factory, AnalysisCache(), workers=1, poll_interval=0.05)
+        db = session_factory()
+        job = queue.submit(db, user_id=2, cv_id=1)
+        db.close()
+
+        queue.start()
+        try:
+            job = wait_for_status(session_factory, job.id, {"done", "failed"})
+        finally:
+            queue.stop()
+
+        assert job.status == "failed"
+        assert job.error_message == "CV not found"
+
+    def test_interrupted_jobs_are_requeued(self, session_factory):
+        """Test that jobs left running by a crashed worker are picked up again."""
+        db = session_factory()
+        started = datetime.utcnow() - timedelta(hours=1)
+        db.add(AnalysisJob(user_id=1, cv_id=1, status="running", attempts=1, started_at=started))
+        db.add(AnalysisJob(user_id=1, cv_id=1, status="running", attempts=3, started_at=started))
+        db.commit()
+        db.close()
+
+        queue = AnalysisJobQueue(session_factory, AnalysisCache(), workers=1, poll_interval=0.05, stale_after=60)
+        queue.start()
+        try:
+            retried = wait_for_status(session_factory, 1, {"done"})
+            abandoned = wait_for_status(session_factory, 2, {"failed"})
+        finally:
+            queue.stop()
+
+        assert retried.attempts == 2
+        assert abandoned.attempts == 3
+
+if __name__ == "__main__":
+    pytest.main([__file__])
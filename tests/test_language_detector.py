@@ -0,0 +1,53 @@
+import pytest
+import spacy
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services.cv_analyzer import CVAnalyzer
+from backend.app.services.language_detector import LanguageDetector
+
+def blank_pipeline(language):
+    nlp = spacy.blank(language)
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+PT_CV = "Experiência\nDesenvolvi APIs em Python e liderei uma equipa de cinco pessoas.\nFui responsável pelas vendas na região norte."
+EN_CV = "Experience\nI developed REST APIs in Python and led a team of five people.\nI was responsible for sales in the northern region."
+
+class TestLanguageDetector:
+    """Test cases for language detection and per-language routing."""
+
+    def test_detects_language_and_mixed_text(self):
+        """Test detection with confidence, and that mixed or language-free texts are unsure."""
+        detector = LanguageDetector.from_file()
+
+        assert detector.detect(PT_CV) == ('pt', 1.0)
+        assert detector.detect(EN_CV) == ('en', 1.0)
+        language, confidence = detector.detect(PT_CV + "\n" + EN_CV)
+        assert confidence < 0.7
+        assert detector.detect("Python, SQL, Docker") == (None, 0.0)
+
+    def test_routes_lexicon_and_model_by_language(self):
+        """Test that each CV gets its language's lexicons and spaCy pipeline."""
+        analyzer = CVAnalyzer(model_name="missing_pt_model", fallback_model="missing_en_model")
+        analyzer.model_registry.set('pt', blank_pipeline('pt'))
+        analyzer.model_registry.set('en', blank_pipeline('en'))
+
+        assert analyzer.nlp_for(analyzer.detect_language(EN_CV)).lang == 'en'
+        assert analyzer.nlp_for(analyzer.detect_language(PT_CV)).lang == 'pt'
+        assert analyzer.nlp_for(None).lang == 'pt'
+
+        # "developed" is an English action verb, so it does not count in a Portuguese CV
+        text = PT_CV + " Developed."
+        assert analyzer._count_action_verbs(text, language='pt') == analyzer._count_action_verbs(PT_CV, language='pt')
+        assert analyzer._count_action_verbs(text) == analyzer._count_action_verbs(PT_CV) + 1
+
+        results = list(analyzer.analyze_many([PT_CV, EN_CV, PT_CV]))
+        assert results == [analyzer.analyze_cv(text) for text in (PT_CV, EN_CV, PT_CV)]
+        assert results[1]['word_count'] == len(spacy.blank('en')(EN_CV))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
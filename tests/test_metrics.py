@@ -0,0 +1,39 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.utils.metrics import AnalysisMetrics, Histogram
+
+class TestAnalysisMetrics:
+    """Test cases for the analysis stage histograms."""
+
+    def test_histogram_buckets_and_quantiles(self):
+        """Test cumulative buckets and bucket-based quantiles."""
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 5, 5, 50, 500):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 5
+        assert snapshot['buckets'] == {'1': 1, '10': 3, '100': 4, '+Inf': 5}
+        assert snapshot['p50'] == 10
+        assert snapshot['p95'] is None  # above the largest bucket
+
+    def test_record_profiles_per_stage(self):
+        """Test that analysis profiles are aggregated per stage."""
+        metrics = AnalysisMetrics()
+        metrics.record({'stages_ms': {'parse': 12.0, 'score': 0.2}, 'tokens': 300})
+        metrics.record({'stages_ms': {'parse': 30.0}, 'tokens': 800})
+        metrics.record(None)
+
+        snapshot = metrics.snapshot()
+        assert snapshot['stages_ms']['parse']['count'] == 2
+        assert snapshot['stages_ms']['parse']['sum'] == 42.0
+        assert snapshot['stages_ms']['score']['count'] == 1
+        assert snapshot['tokens']['count'] == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
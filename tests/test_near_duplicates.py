@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services.cv_sections import changed_sections
+from backend.app.services.near_duplicates import MinHasher, NearDuplicateIndex, similarity, from_bytes
+
+CV_TEXT = """Objetivo
+Procuro uma posição como engenheiro de software numa equipa que valorize qualidade e testes automáticos.
+
+Experiência
+Desenvolvi APIs REST em Python e FastAPI para uma plataforma de pagamentos com milhões de utilizadores.
+Liderei a migração da base de dados para PostgreSQL e reduzi o tempo de resposta em metade.
+Implementei pipelines de integração contínua com Docker e GitHub Actions.
+
+Competências
+Python, SQL, Docker, AWS, Git, testes unitários e revisão de código.
+"""
+
+def shingles(text, size=3):
+    words = text.lower().split()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def jaccard(text, other):
+    first, second = shingles(text), shingles(other)
+    return len(first & second) / len(first | second)
+
+class TestNearDuplicates:
+    """Test cases for MinHash signatures and the LSH duplicate index."""
+
+    def test_signature_estimates_jaccard(self):
+        """Test that signature similarity tracks the 3-gram Jaccard similarity."""
+        hasher = MinHasher()
+        edited = CV_TEXT.replace("metade", "40%")
+        signature = hasher.signature(CV_TEXT)
+
+        assert signature.dtype.itemsize * len(signature) == 512
+        assert (from_bytes(signature.tobytes()) == signature).all()
+        assert abs(similarity(signature, hasher.signature(edited)) - jaccard(CV_TEXT, edited)) < 0.1
+        assert similarity(signature, hasher.signature("Cozinheiro com experiência em pastelaria")) < 0.2
+
+    def test_query_and_clusters(self):
+        """Test that near-duplicates are found per owner and grouped into clusters."""
+        hasher = MinHasher()
+        index = NearDuplicateIndex()
+        index.add(1, 10, hasher.signature(CV_TEXT))
+        index.add(2, 10, hasher.signature(CV_TEXT + "Idiomas\nInglês fluente.\n"))
+        index.add(3, 20, hasher.signature(CV_TEXT))
+        index.add(4, 10, hasher.signature("Contabilista com domínio de Excel e análise financeira."))
+
+        matches = index.query(hasher.signature(CV_TEXT), 0.8, owner=10, exclude=1)
+        assert [cv_id for cv_id, _ in matches] == [2]
+        assert [cv_id for cv_id, _ in index.query(hasher.signature(CV_TEXT), 0.8)] == [1, 3, 2]
+
+        clusters = index.clusters(0.8)
+        assert [cluster['cv_ids'] for cluster in clusters] == [[1, 2, 3]]
+        assert 0.8 <= clusters[0]['min_similarity'] < 1
+
+        index.remove(2)
+        assert index.clusters(0.8) == [{'cv_ids': [1, 3], 'min_similarity': 1.0}]
+
+    def test_changed_sections(self):
+        """Test the section diff reported for near-duplicate uploads."""
+        edited = CV_TEXT.replace("metade", "40%") + "Idiomas\nInglês fluente.\n"
+        assert changed_sections(CV_TEXT, edited) == ['experiencia', 'idiomas']
+        assert changed_sections(CV_TEXT, CV_TEXT) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,95 @@
+import pytest
+import sys
+import os
+import threading
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.models import CV, PDFBlob
+from backend.app.services.pdf_cache import PDFCache
+from backend.app.services.pdf_generator import PDFGenerator
+
+@pytest.fixture
+def cache(tmp_path):
+    """PDF cache over a temporary storage directory."""
+    return PDFCache(PDFGenerator(storage_path=str(tmp_path / 'pdfs')), idle_ttl=3600, max_unreferenced_bytes=700)
+
+def refcounts(db):
+    return {blob.filename: blob.refcount for blob in db.query(PDFBlob).all()}
+
+class TestPDFCache:
+    """Test cases for the content-addressed PDF store."""
+
+    def test_shared_pdf_is_counted_and_evicted_once_unreferenced(self, db, cache):
+        """Test that CVs sharing a PDF count as references and that only unreferenced idle files go."""
+        assert cache.get(db, 'a.pdf') is None
+        cache.put(db, 'a.pdf', b'%PDF a')
+        assert cache.get(db, 'a.pdf') == b'%PDF a'
+
+        cvs = [CV(user_id=1, original_text="CV", pdf_path='a.pdf') for _ in range(2)]
+        db.add_all(cvs)
+        db.commit()
+        assert refcounts(db) == {'a.pdf': 2}
+
+        cvs[0].pdf_path = None
+        db.delete(cvs[1])
+        db.commit()
+        assert refcounts(db) == {'a.pdf': 0}
+        assert cache.evict(db) == 0
+
+        db.query(PDFBlob).update({PDFBlob.last_used_at: datetime.utcnow() - timedelta(hours=2)})
+        db.commit()
+        assert cache.evict(db) == 1
+        assert refcounts(db) == {} and cache.get(db, 'a.pdf') is None
+
+    def test_concurrent_first_stores_of_the_same_pdf(self, db, session_factory, cache):
+        """Test that simultaneous first renders of one content each store it without a conflict."""
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def store():
+            session = session_factory()
+            try:
+                barrier.wait()
+                cache.put(session, 'a.pdf', b'%PDF a')
+            except Exception as e:
+                errors.append(e)
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=store) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert refcounts(db) == {'a.pdf': 0}
+        assert cache.get(db, 'a.pdf') == b'%PDF a'
+
+    def test_size_cap_evicts_least_recently_used_first(self, db, cache):
+        """Test that unreferenced files over the cap go oldest first, referenced ones never."""
+        for name in ('kept.pdf', 'old.pdf', 'new.pdf'):
+            cache.put(db, name, b'x' * 400)
+            if name == 'kept.pdf':
+                db.add(CV(user_id=1, original_text="CV", pdf_path=name))
+                db.commit()
+        assert sorted(os.listdir(cache.generator.storage_path)) == ['kept.pdf', 'new.pdf']
+
+    def test_sync_adopts_existing_files_and_recounts(self, db, cache):
+        """Test that PDFs saved before the store are registered with their real reference counts."""
+        for name in ('cv_tester_1.pdf', 'cv_tester_2.pdf'):
+            with open(cache.generator.get_pdf_path(name), 'wb') as f:
+                f.write(b'%PDF')
+        db.add(CV(user_id=1, original_text="CV", pdf_path='cv_tester_2.pdf'))
+        db.commit()
+        db.query(PDFBlob).delete()
+        db.commit()
+
+        assert cache.sync(db) == 2
+        assert cache.sync(db) == 0
+        assert refcounts(db) == {'cv_tester_1.pdf': 0, 'cv_tester_2.pdf': 1}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from reportlab import rl_config
+from backend.app.services import pdf_generator
+from backend.app.services.pdf_generator import PDFGenerator
+
+CV_DATA = {
+    'title': 'Programador Python',
+    'original_text': "EXPERIÊNCIA\nDesenvolvi APIs em Python.\n\nEDUCAÇÃO\nLicenciatura em Informática",
+    'analyzed_text': None
+}
+USER_DATA = {'username': 'tester', 'email': 'tester@email.com', 'full_name': 'Tester'}
+
+class TestPDFGenerator:
+    """Test cases for in-memory and content-addressed PDF generation."""
+
+    def test_render_does_not_touch_disk(self, tmp_path):
+        """Test that a CV renders to PDF bytes with storage disabled."""
+        generator = PDFGenerator(storage_path=None)
+        pdf = generator.render_cv_pdf(CV_DATA, USER_DATA)
+        assert pdf.startswith(b'%PDF') and pdf.rstrip().endswith(b'%%EOF')
+        with pytest.raises(RuntimeError):
+            generator.generate_cv_pdf(CV_DATA, USER_DATA)
+
+    def test_generate_saves_each_content_once(self, tmp_path, monkeypatch):
+        """Test that the saved file is named after what it renders and not rendered again."""
+        generator = PDFGenerator(storage_path=str(tmp_path / 'pdfs'))
+        filename = generator.generate_cv_pdf(CV_DATA, USER_DATA)
+        with open(generator.get_pdf_path(filename), 'rb') as f:
+            assert f.read().startswith(b'%PDF')
+
+        monkeypatch.setattr(generator, 'render_cv_pdf', None)
+        assert generator.generate_cv_pdf({**CV_DATA, 'title': 'Outro'}, {**USER_DATA, 'username': 'outro'}) == filename
+        assert os.listdir(generator.storage_path) == [filename]
+        assert generator.cv_pdf_filename({**CV_DATA, 'original_text': 'Outro'}, USER_DATA) != filename
+        assert generator.cv_pdf_filename(CV_DATA, {**USER_DATA, 'email': 'outro@email.com'}) != filename
+        monkeypatch.setattr(pdf_generator, 'CV_TEMPLATE_VERSION', 'next')
+        assert generator.cv_pdf_filename(CV_DATA, USER_DATA) != filename
+
+    def test_render_depends_only_on_the_hashed_content(self, monkeypatch):
+        """Test that a PDF rendered later is the same, so serving a stored one is not stale."""
+        monkeypatch.setattr(rl_config, 'invariant', 1)
+        generator = PDFGenerator(storage_path=None)
+        pdf = generator.render_cv_pdf(CV_DATA, USER_DATA)
+
+        class Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2030, 1, 1, 12, 30)
+
+        monkeypatch.setattr(pdf_generator, 'datetime', Later)
+        assert generator.render_cv_pdf(CV_DATA, USER_DATA) == pdf
+
+if __name__ == "__main__":
+    pytest.main([__file__])
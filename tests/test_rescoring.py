@@ -0,0 +1,99 @@
+import pytest
+import sys
+import os
+from collections import Counter
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.models import CV, RescoringRun, ScoreHistogram
+from backend.app.services import tasks
+from backend.app.services.rescoring import CVRescorer
+from config.settings import settings
+
+TEXT = "Desenvolvi APIs em Python e aumentei vendas em {}%. Fui responsável por uma equipa."
+
+@pytest.fixture
+def session_factory(session_factory, monkeypatch):
+    """The temporary database with six CVs analyzed with old rules, one current and one never analyzed."""
+    monkeypatch.setattr(settings, "doc_store_path", "")
+
+    db = session_factory()
+    for i in range(6):
+        db.add(CV(user_id=1, original_text=TEXT.format(i), sector="tecnologia", analysis_score=10,
+                  analysis_mode="fast" if i == 2 else "full", rules_version="old"))
+    db.add(CV(user_id=1, original_text=TEXT.format(7), analysis_score=10, rules_version=tasks.get_analyzer().rules_version))
+    db.add(CV(user_id=1, original_text=TEXT.format(8)))
+    db.commit()
+    db.close()
+    yield session_factory
+
+def histogram_matches_cvs(db):
+    counts = {(row.sector, row.score): row.count for row in db.query(ScoreHistogram).all() if row.count}
+    scored = Counter((cv.analysis_sector or '', cv.analysis_score) for cv in db.query(CV).all() if cv.analysis_score is not None)
+    return counts == dict(scored)
+
+class TestCVRescorer:
+    """Test cases for re-scoring CVs after a rules change."""
+
+    def test_run_rescores_stale_cvs_in_throttled_batches(self, session_factory):
+        """Test that only stale CVs are re-analyzed, in their own mode, with checkpoints and pauses."""
+        rescorer = CVRescorer(session_factory, batch_size=4, cpu_fraction=0.1)
+        pauses = []
+        rescorer._stop.wait = pauses.append
+        run_id, claimed = rescorer.claim()
+        rescorer.run(run_id)
+
+        db = session_factory()
+        version = tasks.get_analyzer().rules_version
+        cvs = db.query(CV).order_by(CV.id).all()
+        assert [cv.rules_version for cv in cvs] == [version] * 7 + [None]
+        assert cvs[0].analysis_score > 10 and cvs[0].keywords is not None
+        assert cvs[2].analysis_mode == "fast" and cvs[2].keywords is None
+        assert cvs[6].analysis_score == 10 and cvs[7].analysis_score is None
+        assert histogram_matches_cvs(db)
+
+        run = db.get(RescoringRun, run_id)
+        assert claimed and (run.status, run.rescored, run.last_cv_id) == ("done", 6, cvs[5].id)
+        assert len(pauses) == 2 and sum(pauses) > 0
+        assert rescorer.claim() == (None, False)
+        db.close()
+
+    def test_interrupted_run_resumes_from_its_checkpoint(self, session_factory):
+        """Test that a released run continues after last_cv_id and that a CV saved mid-batch is not overwritten."""
+        db = session_factory()
+        run = RescoringRun(rules_version=tasks.get_analyzer().rules_version, last_cv_id=3)
+        db.add(run)
+        db.commit()
+        # Released by a shutdown mid-run
+        run.updated_at = None
+        db.commit()
+        db.close()
+
+        rescorer = CVRescorer(session_factory, batch_size=10, cpu_fraction=1.0)
+        analyze = rescorer._analyze
+
+        def analyze_while_user_edits(analyzer, rows):
+            # A live analysis saves CV 5 while the batch is being analyzed
+            live = session_factory()
+            cv = live.get(CV, 5)
+            if cv.rules_version == "old":
+                cv.analysis_score, cv.rules_version = 55, analyzer.rules_version
+                live.commit()
+            live.close()
+            return analyze(analyzer, rows)
+
+        rescorer._analyze = analyze_while_user_edits
+        assert rescorer.claim(resume_only=True) == (1, True)
+        rescorer.run(1)
+
+        db = session_factory()
+        cvs = db.query(CV).order_by(CV.id).all()
+        assert [cv.rules_version for cv in cvs[:3]] == ["old"] * 3
+        assert cvs[4].analysis_score == 55
+        assert db.get(RescoringRun, 1).rescored == 2
+        assert histogram_matches_cvs(db)
+        db.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__])
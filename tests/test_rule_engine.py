@@ -0,0 +1,99 @@
+import pytest
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services.cv_analyzer import CVAnalyzer
+from backend.app.services.rule_engine import DEFAULT_RULES_PATH, RuleEngine, RuleReloader, get_rule_engine
+
+SAMPLE_CV = """
+João Silva
+Email: joao@email.com
+Telefone: +351 912345678
+
+Experiência
+Desenvolvi APIs em Python e SQL, reduzindo custos em 30%.
+Responsável por uma equipa de 5 pessoas durante 3 anos.
+"""
+
+class TestRuleEngine:
+    """Test cases for the shared CV rule engine."""
+
+    def test_fast_mode_uses_the_shared_rules(self):
+        """Test that the analyzer's fast mode is the rule engine's analysis."""
+        engine = get_rule_engine()
+        analyzer = CVAnalyzer(rule_engine=engine)
+
+        assert analyzer.rules_version == engine.version
+        result = analyzer.analyze_cv(SAMPLE_CV, 'tecnologia', mode='fast')
+        assert result.pop('rules_version') == engine.version
+        assert result == engine.analyze(SAMPLE_CV, 'tecnologia')
+        assert engine.sector_keywords_found(SAMPLE_CV, 'tecnologia') == ['python', 'sql']
+        assert 'geri' in engine.rewrite(SAMPLE_CV)
+
+    def test_sector_keywords_match_whole_tokens(self):
+        """Test that keywords match whole tokens and phrases span line breaks."""
+        engine = get_rule_engine()
+        text = "Numa semana lancei campanhas com Google\nAnalytics, SEO e Node.js."
+
+        matches = engine.match_sector_keywords(text)
+        assert matches['marketing'] == ['seo', 'google analytics']
+        assert matches['tecnologia'] == ['node.js']
+        assert engine.sector_keywords_found("Programador JavaScript", 'tecnologia') == ['javascript']
+
+    def test_rules_file_drives_score_and_suggestions(self):
+        """Test that editing the rules changes the score and suggestions."""
+        with open(DEFAULT_RULES_PATH, encoding='utf-8') as f:
+            rules = json.load(f)
+        baseline = RuleEngine(rules).analyze(SAMPLE_CV)
+
+        rules['scoring']['base'] = 40
+        rules['suggestions'] = [rule for rule in rules['suggestions'] if rule['type'] != 'length']
+        edited = RuleEngine(rules).analyze(SAMPLE_CV)
+
+        assert edited['analysis_score'] == baseline['analysis_score'] - 10
+        assert 'length' in [s['type'] for s in baseline['suggestions']]
+        assert 'length' not in [s['type'] for s in edited['suggestions']]
+
+    def test_rewrite_replaces_whole_phrases_in_one_pass(self):
+        """Test that weak phrases are rewritten once, ignoring case, and only as whole words."""
+        with open(DEFAULT_RULES_PATH, encoding='utf-8') as f:
+            rules = json.load(f)
+        rules['replacements'] = {'trabalhei em': 'desenvolvi', 'desenvolvi': 'criei', 'ajudei com': 'colaborei em'}
+        engine = RuleEngine(rules)
+
+        text = "Trabalhei em Lisboa; retrabalhei em casa. Desenvolvi e AJUDEI COM testes."
+        assert engine.rewrite(text) == "desenvolvi Lisboa; retrabalhei em casa. criei e colaborei em testes."
+
+    def test_reloader_swaps_in_new_versions_only(self, tmp_path):
+        """Test that a new rules version is swapped in and stamped, while bad or unversioned edits are ignored."""
+        with open(DEFAULT_RULES_PATH, encoding='utf-8') as f:
+            rules = json.load(f)
+        path = tmp_path / 'rules.json'
+        path.write_text(json.dumps(rules), encoding='utf-8')
+        reloader = RuleReloader(str(path), check_interval=0)
+        analyzer = CVAnalyzer(rule_engine=reloader.current())
+        before = analyzer.analyze_cv(SAMPLE_CV, mode='fast')
+
+        rules['scoring']['base'] = 40
+        path.write_text(json.dumps(rules), encoding='utf-8')
+        assert not reloader.reload()
+        path.write_text('{"version": "broken"', encoding='utf-8')
+        assert not reloader.reload()
+        assert reloader.current() is analyzer.rules
+
+        rules['version'] = 'next'
+        path.write_text(json.dumps(rules), encoding='utf-8')
+        assert reloader.reload()
+        assert get_rule_engine(str(path)) is reloader.current()
+        after = analyzer.with_rules(reloader.current()).analyze_cv(SAMPLE_CV, mode='fast')
+
+        assert (before['rules_version'], after['rules_version']) == (analyzer.rules_version, 'next')
+        assert after['analysis_score'] == before['analysis_score'] - 10
+        assert analyzer.analyze_cv(SAMPLE_CV, mode='fast') == before
+
+if __name__ == "__main__":
+    pytest.main([__file__])
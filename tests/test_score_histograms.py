@@ -0,0 +1,48 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.models import CV, ScoreHistogram
+from backend.app.services.score_histograms import backfill_score_histograms, score_percentile
+
+def histogram(db):
+    return {(row.sector, row.score): row.count for row in db.query(ScoreHistogram).all() if row.count}
+
+class TestScoreHistograms:
+    """Test cases for per-sector score histograms and percentiles."""
+
+    def test_histogram_follows_scores_sectors_and_deletes(self, db):
+        """Test that re-analyses, sector changes and deletions move each CV's count."""
+        cvs = [CV(user_id=1, original_text="CV", sector="tecnologia", analysis_score=score) for score in (40, 60, 60, 80)]
+        db.add_all(cvs + [CV(user_id=1, original_text="Sem análise"), CV(user_id=1, original_text="CV", analysis_score=70)])
+        db.commit()
+        assert histogram(db) == {('tecnologia', 40): 1, ('tecnologia', 60): 2, ('tecnologia', 80): 1, ('', 70): 1}
+        assert score_percentile(db, 'tecnologia', 60) == 50.0
+        assert score_percentile(db, 'tecnologia', 90) == 100.0
+        assert score_percentile(db, 'tecnologia', 60, min_cvs=5) is None
+        assert score_percentile(db, 'marketing', 60) is None
+
+        cvs[0].analysis_score = 90
+        cvs[1].sector = 'marketing'
+        db.delete(cvs[3])
+        db.commit()
+        assert histogram(db) == {('tecnologia', 60): 1, ('tecnologia', 90): 1, ('marketing', 60): 1, ('', 70): 1}
+
+    def test_backfill_counts_scores_saved_before_histograms(self, db):
+        """Test that scored CVs not yet counted are added once."""
+        db.add_all([CV(user_id=1, original_text="CV", sector="tecnologia", analysis_score=50),
+                    CV(user_id=1, original_text="CV", inferred_sector="vendas", analysis_score=70)])
+        db.commit()
+        db.query(ScoreHistogram).delete()
+        db.query(CV).update({CV.histogram_sector: None, CV.histogram_score: None})
+        db.commit()
+
+        assert backfill_score_histograms(db) == 2
+        assert backfill_score_histograms(db) == 0
+        assert histogram(db) == {('tecnologia', 50): 1, ('vendas', 70): 1}
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.services.rule_engine import get_rule_engine
+from backend.app.services.sector_classifier import SectorClassifier
+
+@pytest.fixture(scope="module")
+def classifier():
+    return SectorClassifier.from_keywords(get_rule_engine().sector_keywords)
+
+class TestSectorClassifier:
+    """Test cases for the hashed bag-of-words sector classifier."""
+
+    def test_predicts_sector_with_confidence(self, classifier):
+        """Test batch predictions, confidences and the confidence threshold."""
+        texts = [
+            "Desenvolvi APIs em Python e SQL, com deploy em Docker e AWS.",
+            "Geri campanhas de SEO, branding e social media.",
+            "Gosto de ler e de caminhar."
+        ]
+        predictions = classifier.predict(texts, min_confidence=0.6)
+
+        assert predictions[0][0] == "tecnologia"
+        assert predictions[1][0] == "marketing"
+        assert predictions[2][0] is None
+        assert all(0 <= confidence <= 1 for _, confidence in predictions)
+        assert np.allclose(classifier.predict_proba(texts).sum(axis=1), 1)
+
+    def test_labeled_cvs_and_save_load(self, tmp_path):
+        """Test training on labeled CVs and that a saved model predicts the same."""
+        sector_keywords = get_rule_engine().sector_keywords
+        texts = ["Contratei e integrei novos colaboradores"] * 3
+        classifier = SectorClassifier.from_keywords(sector_keywords, texts, ["recursos_humanos"] * 3)
+        assert classifier.predict(["Integrei colaboradores"])[0][0] == "recursos_humanos"
+
+        path = str(tmp_path / "model.npz")
+        classifier.save(path)
+        assert SectorClassifier.load(path).predict(texts) == classifier.predict(texts)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
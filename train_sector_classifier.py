@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+from backend.app.core.database import SessionLocal, create_tables
+from backend.app.models.cv import CV
+from backend.app.services.rule_engine import get_rule_engine
+from backend.app.services.sector_classifier import SectorClassifier
+from config.settings import settings
+
+def train_sector_classifier(output_path=None):
+    """Train the sector classifier on the rules' keywords and the CVs that have a sector."""
+    output_path = output_path or settings.sector_model_path or "./storage/models/sector_classifier.npz"
+    create_tables()
+
+    db = SessionLocal()
+    try:
+        labeled = db.query(CV.original_text, CV.sector).filter(CV.sector.isnot(None)).all()
+    finally:
+        db.close()
+
+    sector_keywords = get_rule_engine(settings.rules_path).sector_keywords
+    texts = [text for text, sector in labeled if sector in sector_keywords]
+    labels = [sector for text, sector in labeled if sector in sector_keywords]
+    classifier = SectorClassifier.from_keywords(sector_keywords, texts, labels)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    classifier.save(output_path)
+    print(f"Modelo treinado com {len(texts)} CVs etiquetados e guardado em {output_path}")
+    if output_path != settings.sector_model_path:
+        print(f"Defina SECTOR_MODEL_PATH={output_path} para o usar")
+
+if __name__ == "__main__":
+    train_sector_classifier(sys.argv[1] if len(sys.argv) > 1 else None)